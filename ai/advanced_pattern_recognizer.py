@@ -4,76 +4,125 @@
 Advanced Pattern Recognizer
 """
 
-import torch
-import transformers
-from transformers import AutoModelForSequenceClassification, AutoTokenizer
-import re
-from typing import Dict, List, Any
+import asyncio
+from typing import Awaitable, Dict, List, Any, Optional
 import logging
+from core.model_registry import model_registry
+from core.analysis_workers import extract_topics
+from core.contact_extractor import contact_extractor
+from core.metrics import record_error, timed
+from core.entity_normalizer import dedupe_contacts
+from ai.batch_inference import MicroBatchInferenceQueue
+from ai.text_chunker import SlidingWindowChunker, merge_entities, merge_sentiment
+from config.settings import Settings
+from core.result_cache import TwoTierCache, content_key
+
+# يُرفع عند تغيير منطق التحليل حتى لا تُستخدم نتائج مخزنة قديمة
+ANALYSIS_VERSION = "1"
 
 class AdvancedPatternRecognizer:
-    def __init__(self):
+    def __init__(self, cache: Optional[TwoTierCache] = None):
         self.logger = logging.getLogger(__name__)
         self.setup_deep_learning_models()
+        self.analysis_cache = cache or TwoTierCache(
+            path=Settings.NLP_CACHE_PATH,
+            namespace="text_patterns",
+            max_memory_entries=Settings.NLP_CACHE_MEMORY_ENTRIES
+        )
     
     def setup_deep_learning_models(self):
         """تهيئة نماذج التعلم العميق"""
-        self.logger.info("🧠 تحميل نماذج التعلم العميق...")
+        # نموذجا المشاعر والكيانات يُحمّلان عند أول استخدام من السجل المشترك
+        self.model_registry = model_registry
         
-        try:
-            # نموذج تحليل المشاعر
-            self.sentiment_analyzer = transformers.pipeline(
-                "sentiment-analysis",
-                model="cardiffnlp/twitter-roberta-base-sentiment-latest"
-            )
-            
-            # نموذج التعرف على الكيانات المسماة
-            self.ner_analyzer = transformers.pipeline(
-                "ner",
-                model="dslim/bert-base-NER",
-                aggregation_strategy="simple"
-            )
-            
-            self.logger.info("✅ تم تحميل النماذج بنجاح")
-            
-        except Exception as e:
-            self.logger.error(f"❌ فشل تحميل النماذج: {e}")
+        # طوابير الدفعات الصغيرة تجمع النصوص من المستدعين المتزامنين
+        self.sentiment_queue = MicroBatchInferenceQueue(
+            "sentiment", call_kwargs={'truncation': True}
+        )
+        self.ner_queue = MicroBatchInferenceQueue("ner")
+        
+        # النصوص الطويلة تُقسم بنوافذ منزلقة حسب مقسم رموز كل نموذج (في خيط النموذج نفسه)
+        self.sentiment_chunker = SlidingWindowChunker(self.tokenizer_loader("sentiment"))
+        self.ner_chunker = SlidingWindowChunker(self.tokenizer_loader("ner"))
+    
+    def tokenizer_loader(self, model_name: str):
+        """دالة تعيد مقسم رموز النموذج عند الحاجة"""
+        return lambda: getattr(self.model_registry.get(model_name), 'tokenizer', None)
+    
+    @property
+    def sentiment_analyzer(self):
+        """نموذج تحليل المشاعر"""
+        return self.model_registry.get("sentiment")
+    
+    @property
+    def ner_analyzer(self):
+        """نموذج التعرف على الكيانات المسماة"""
+        return self.model_registry.get("ner")
     
+    def analysis_cache_key(self, text_data: str) -> str:
+        """مفتاح الذاكرة المؤقتة: بصمة النص وإصدارات النماذج وإعدادات التقسيم"""
+        return content_key(
+            text_data,
+            ANALYSIS_VERSION,
+            self.model_registry.get_version("sentiment"),
+            self.model_registry.get_version("ner"),
+            self.ner_chunker.max_tokens,
+            self.ner_chunker.stride
+        )
+    
+    @timed('nlp')
     async def analyze_text_patterns(self, text_data: str) -> Dict[str, Any]:
         """تحليل أنماط النص"""
+        cache_key = self.analysis_cache_key(text_data)
+        cached = await self.analysis_cache.aget(cache_key)
+        if cached is not None:
+            return cached
+        
         analysis_results = {}
         
+        # مشاعر المستند تُحسب مرة واحدة ويشترك فيها التحليل الدلالي وتحليل المشاعر
+        sentiment = asyncio.ensure_future(self.document_sentiment(text_data))
         try:
             # تحليل متعدد الأبعاد
-            analyses = [
-                self.semantic_analysis(text_data),
+            analyses = await asyncio.gather(
+                self.semantic_analysis(text_data, sentiment),
                 self.entity_recognition(text_data),
-                self.sentiment_analysis(text_data),
+                self.sentiment_analysis(text_data, sentiment),
                 self.behavioral_pattern_analysis(text_data)
-            ]
+            )
             
             # تنفيذ التحليلات
             for analysis in analyses:
                 analysis_results.update(analysis)
             
+            # تخزين النتائج الكاملة فقط (فشل نموذج يعني عدم التخزين)
+            if analysis_results.get('sentiment') and 'named_entities' in analysis_results:
+                await self.analysis_cache.aset(cache_key, analysis_results)
+            
             self.logger.info("✅ اكتمل تحليل الأنماط")
             
         except Exception as e:
             self.logger.error(f"❌ فشل تحليل الأنماط: {e}")
+            record_error('nlp', 'analyze_text_patterns')
+            
+        finally:
+            if not sentiment.done():
+                sentiment.cancel()
             
         return analysis_results
     
-    def semantic_analysis(self, text: str) -> Dict[str, Any]:
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """إحصائيات إصابة الذاكرة المؤقتة"""
+        return self.analysis_cache.get_stats()
+    
+    @timed('nlp')
+    async def semantic_analysis(self, text: str, sentiment: Optional[Awaitable[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """التحليل الدلالي"""
         semantic_insights = {}
         
         try:
-            # استخدام النموذج للتحليل الدلالي
-            if len(text) > 512:
-                text = text[:512]  # تقليل النص للنموذج
-            
-            sentiment_result = self.sentiment_analyzer(text)
-            semantic_insights['sentiment'] = sentiment_result[0]
+            # استخدام النموذج للتحليل الدلالي على كامل النص
+            semantic_insights['sentiment'] = await (sentiment or self.document_sentiment(text))
             
             # تحليل الموضوعات
             topics = self.extract_topics(text)
@@ -81,16 +130,20 @@ class AdvancedPatternRecognizer:
             
         except Exception as e:
             self.logger.warning(f"التحليل الدلالي فشل: {e}")
+            record_error('nlp', 'semantic_analysis')
             
         return semantic_insights
     
-    def entity_recognition(self, text: str) -> Dict[str, Any]:
+    @timed('nlp')
+    async def entity_recognition(self, text: str) -> Dict[str, Any]:
         """التعرف على الكيانات"""
         entities_data = {}
         
         try:
             # التعرف على الكيانات المسماة
-            ner_results = self.ner_analyzer(text)
+            chunks = await self.ner_queue.run_in_worker(self.ner_chunker.chunk, text)
+            chunk_entities = await self.ner_queue.submit_many([chunk.text for chunk in chunks])
+            ner_results = merge_entities(chunks, chunk_entities)
             
             entities_data['named_entities'] = {
                 'persons': [ent for ent in ner_results if ent['entity_group'] == 'PER'],
@@ -104,9 +157,46 @@ class AdvancedPatternRecognizer:
             
         except Exception as e:
             self.logger.warning(f"التعرف على الكيانات فشل: {e}")
+            record_error('nlp', 'entity_recognition')
             
         return entities_data
     
+    @timed('nlp')
+    async def sentiment_analysis(self, text: str, sentiment: Optional[Awaitable[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """تحليل المشاعر للنص"""
+        sentiment_data = {}
+        
+        try:
+            # نتيجة المستند المشتركة مع التحليل الدلالي إن مُررت
+            result = await (sentiment or self.document_sentiment(text))
+            sentiment_data['sentiment_label'] = result['label']
+            sentiment_data['sentiment_score'] = result['score']
+            
+        except Exception as e:
+            self.logger.warning(f"تحليل المشاعر فشل: {e}")
+            record_error('nlp', 'sentiment_analysis')
+            
+        return sentiment_data
+    
+    async def document_sentiment(self, text: str) -> Dict[str, Any]:
+        """مشاعر المستند كاملاً: نوافذ في دفعة واحدة ثم دمج مرجح"""
+        chunks = await self.sentiment_queue.run_in_worker(self.sentiment_chunker.chunk, text)
+        chunk_results = await self.sentiment_queue.submit_many([chunk.text for chunk in chunks])
+        return merge_sentiment(chunks, chunk_results)
+    
+    async def behavioral_pattern_analysis(self, text: str) -> Dict[str, Any]:
+        """تحليل الأنماط السلوكية في النص"""
+        words = text.split()
+        return {
+            'behavioral_patterns': {
+                'word_count': len(words),
+                'mentions': sum(1 for word in words if word.startswith('@')),
+                'hashtags': sum(1 for word in words if word.startswith('#')),
+                'links': sum(1 for word in words if word.startswith(('http://', 'https://'))),
+                'exclamations': text.count('!')
+            }
+        }
+    
     def extract_contacts_from_entities(self, entities: List[Dict]) -> Dict[str, List[str]]:
         """استخراج جهات الاتصال من الكيانات"""
         contacts = {
@@ -118,18 +208,23 @@ class AdvancedPatternRecognizer:
         try:
             for entity in entities:
                 entity_word = entity['word']
+                contact_kind = contact_extractor.classify(entity_word)
                 
                 # التحقق من الإيميلات
-                if re.match(r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}$', entity_word):
+                if contact_kind == 'email':
                     contacts['emails'].append(entity_word)
                 
                 # التحقق من الهواتف
-                elif re.match(r'^\+\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}$', entity_word):
+                elif contact_kind == 'phone':
                     contacts['phones'].append(entity_word)
                 
                 # التحقق من وسائل التواصل
                 elif any(platform in entity_word.lower() for platform in ['facebook', 'twitter', 'instagram', 'linkedin']):
                     contacts['social_media'].append(entity_word)
+            
+            # الكيان نفسه قد يتكرر في عدة نوافذ أو بصيغ مختلفة
+            contacts['emails'] = dedupe_contacts('email', contacts['emails'])
+            contacts['phones'] = dedupe_contacts('phone', contacts['phones'])
                     
         except Exception as e:
             self.logger.warning(f"استخراج الجهات من الكيانات فشل: {e}")
@@ -141,18 +236,8 @@ class AdvancedPatternRecognizer:
         topics = []
         
         try:
-            # كلمات مفتاحية شائعة
-            keywords = {
-                'technology': ['computer', 'software', 'programming', 'tech'],
-                'business': ['company', 'work', 'job', 'business'],
-                'education': ['school', 'university', 'study', 'learn'],
-                'personal': ['family', 'friend', 'home', 'life']
-            }
-            
-            text_lower = text.lower()
-            for topic, words in keywords.items():
-                if any(word in text_lower for word in words):
-                    topics.append(topic)
+            # كلمات مفتاحية شائعة (أنماط مجمعة مسبقاً)
+            topics = extract_topics(text)
             
         except Exception as e:
             self.logger.warning(f"استخراج الموضوعات فشل: {e}")
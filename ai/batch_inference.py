@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+خدمة الاستدلال بالدفعات الصغيرة
+Micro-batching Inference Service
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from config.settings import Settings
+from core.metrics import QUEUE_DEPTH, scan_metrics, track
+from core.model_registry import model_registry, lazy_import
+
+class MicroBatchInferenceQueue:
+    """طابور يجمع النصوص من المستدعين المتزامنين ويمررها للنموذج كدفعات
+
+    كل مستدعٍ ينتظر Future خاصاً به؛ الجامع ينتظر حتى يكتمل حجم الدفعة
+    أو تنقضي مهلة max_wait_ms، ثم يرتب النصوص حسب الطول لتقليل الحشو
+    وينفذ الدفعة في خيط عامل واحد تحت torch.inference_mode.
+    """
+    def __init__(self,
+                 model_name: str,
+                 batch_size: Optional[int] = None,
+                 max_wait_ms: Optional[float] = None,
+                 registry=model_registry,
+                 call_kwargs: Optional[Dict[str, Any]] = None):
+        self.logger = logging.getLogger(__name__)
+        self.model_name = model_name
+        self.batch_size = batch_size or Settings.INFERENCE_BATCH_SIZE
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else Settings.INFERENCE_MAX_WAIT_MS) / 1000
+        self.registry = registry
+        self.call_kwargs = call_kwargs or {}
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"inference-{model_name}"
+        )
+        self.queue: Optional[asyncio.Queue] = None
+        self.collector: Optional[asyncio.Task] = None
+        self.stats = {'docs': 0, 'batches': 0, 'inference_seconds': 0.0}
+
+    async def submit(self, text: str) -> Any:
+        """إرسال نص وانتظار نتيجته
+
+        زمن الانتظار (الطابور والدفعة) يُسجل في أزمنة مسح المستدعي، لأن
+        الجامع مشترك بين المسوح ولا ينتمي لأي منها.
+        """
+        self.ensure_collector()
+        recorder = scan_metrics.get()
+        start = time.perf_counter()
+        failed = True
+        future = asyncio.get_running_loop().create_future()
+        try:
+            await self.queue.put((text, future))
+            QUEUE_DEPTH.set(self.queue.qsize(), f"inference:{self.model_name}")
+            result = await future
+            failed = False
+            return result
+        finally:
+            if recorder is not None:
+                recorder.record('inference', self.model_name, time.perf_counter() - start, failed)
+
+    async def submit_many(self, texts: List[str]) -> List[Any]:
+        """إرسال عدة نصوص دفعة واحدة"""
+        return await asyncio.gather(*(self.submit(text) for text in texts))
+
+    async def run_in_worker(self, func, *args) -> Any:
+        """تنفيذ دالة في خيط النموذج (مثل التقسيم بمقسم رموزه) دون حجب حلقة الأحداث"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    def ensure_collector(self):
+        """تشغيل مهمة الجمع داخل حلقة الأحداث الحالية"""
+        loop = asyncio.get_running_loop()
+        if self.collector is None or self.collector.done() or self.collector.get_loop() is not loop:
+            self.queue = asyncio.Queue()
+            # سياق فارغ: الجامع لا يرث ContextVars المسح الذي شغّله أولاً (أزمنته وأحداثه)
+            self.collector = contextvars.Context().run(loop.create_task, self.collect_batches())
+
+    async def collect_batches(self):
+        """جمع الطلبات في دفعات وتنفيذها"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            QUEUE_DEPTH.set(self.queue.qsize(), f"inference:{self.model_name}")
+            await self.run_batch(batch, loop)
+
+    async def run_batch(self, batch: List[Tuple[str, asyncio.Future]], loop: asyncio.AbstractEventLoop):
+        """تنفيذ دفعة واحدة وحل Futures المستدعين"""
+        # النصوص المتطابقة تُحسب مرة واحدة، والترتيب حسب الطول يقلل الحشو
+        unique_texts = sorted({text for text, _ in batch}, key=len)
+        try:
+            start = time.perf_counter()
+            with track('inference', self.model_name):
+                outputs = await loop.run_in_executor(self.executor, self.infer, unique_texts)
+            self.stats['inference_seconds'] += time.perf_counter() - start
+            self.stats['docs'] += len(batch)
+            self.stats['batches'] += 1
+            by_text = dict(zip(unique_texts, outputs))
+            for text, future in batch:
+                if not future.done():
+                    future.set_result(by_text[text])
+        except Exception as e:
+            self.logger.warning(f"فشل استدلال الدفعة ({self.model_name}): {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    def infer(self, texts: List[str]) -> List[Any]:
+        """تمرير دفعة مرتبة عبر النموذج (يعمل في الخيط العامل)"""
+        pipeline = self.registry.get(self.model_name)
+        if pipeline is None:
+            raise RuntimeError(f"النموذج غير متوفر: {self.model_name}")
+
+        torch = lazy_import("torch")
+        with torch.inference_mode():
+            outputs = pipeline(texts, batch_size=len(texts), **self.call_kwargs)
+        return list(outputs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """إحصائيات الإنتاجية"""
+        seconds = self.stats['inference_seconds']
+        return {
+            **self.stats,
+            'avg_batch_size': self.stats['docs'] / self.stats['batches'] if self.stats['batches'] else 0.0,
+            'docs_per_sec': self.stats['docs'] / seconds if seconds else 0.0
+        }
+
+    def close(self):
+        """إيقاف الجامع والخيط العامل"""
+        if self.collector is not None:
+            self.collector.cancel()
+        self.executor.shutdown(wait=False)
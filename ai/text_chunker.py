@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+مقسم النصوص الطويلة
+Sliding Window Text Chunker
+
+يقسم النص إلى نوافذ متداخلة حسب عدد الرموز (tokens) للنموذج،
+ثم يدمج نتائج كل نافذة في إزاحات المستند الأصلي.
+"""
+
+import re
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from config.settings import Settings
+
+_WHITESPACE_TOKENS = re.compile(r'\S+')
+
+class TextChunk(NamedTuple):
+    """نافذة نصية مع إزاحتها في المستند"""
+    text: str
+    start: int
+    end: int
+
+class SlidingWindowChunker:
+    """مقسم بنوافذ منزلقة يعتمد على مقسم رموز النموذج"""
+    def __init__(self,
+                 tokenizer_loader: Optional[Callable[[], Any]] = None,
+                 max_tokens: Optional[int] = None,
+                 stride: Optional[int] = None,
+                 special_tokens: int = 2):
+        self.tokenizer_loader = tokenizer_loader
+        self.max_tokens = max_tokens or Settings.CHUNK_MAX_TOKENS
+        self.stride = Settings.CHUNK_STRIDE if stride is None else stride
+        # مساحة رموز البداية والنهاية التي يضيفها النموذج
+        self.window = self.max_tokens - special_tokens
+        if not 0 <= self.stride < self.window:
+            raise ValueError("يجب أن يكون التداخل أصغر من حجم النافذة")
+
+    def token_offsets(self, text: str, tokenizer: Any = None) -> List[Tuple[int, int]]:
+        """إزاحات الرموز في النص (مقسم النموذج أو المسافات كبديل)"""
+        if tokenizer is not None:
+            encoding = tokenizer(
+                text,
+                add_special_tokens=False,
+                return_offsets_mapping=True,
+                truncation=False,
+                verbose=False
+            )
+            return [tuple(offset) for offset in encoding['offset_mapping'] if offset[1] > offset[0]]
+        return [match.span() for match in _WHITESPACE_TOKENS.finditer(text)]
+
+    def chunk(self, text: str) -> List[TextChunk]:
+        """تقسيم النص إلى نوافذ متداخلة
+
+        يبني النموذج ويقسم النص كاملاً، لذلك يُستدعى خارج حلقة الأحداث.
+        """
+        tokenizer = self.tokenizer_loader() if self.tokenizer_loader else None
+        offsets = self.token_offsets(text, tokenizer)
+        if len(offsets) <= self.window:
+            return [TextChunk(text, 0, len(text))]
+
+        chunks = []
+        step = self.window - self.stride
+        for first in range(0, len(offsets), step):
+            last = min(first + self.window, len(offsets)) - 1
+            start, end = offsets[first][0], offsets[last][1]
+            chunks.append(self.fit(TextChunk(text[start:end], start, end), tokenizer))
+            if last == len(offsets) - 1:
+                break
+        return chunks
+
+    def fit(self, chunk: TextChunk, tokenizer: Any) -> TextChunk:
+        """قص النافذة إذا أنتج تقسيمها منفردة رموزاً أكثر من النافذة
+
+        حدود النافذة قد تُقسم بشكل مختلف عن المستند كاملاً؛ الجزء المقصوص
+        يقع في منطقة التداخل مع النافذة التالية.
+        """
+        if tokenizer is None:
+            return chunk
+        offsets = self.token_offsets(chunk.text, tokenizer)
+        if len(offsets) <= self.window:
+            return chunk
+        end = offsets[self.window - 1][1]
+        return TextChunk(chunk.text[:end], chunk.start, chunk.start + end)
+
+def merge_entities(chunks: List[TextChunk], chunk_entities: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """دمج كيانات النوافذ بإزاحات المستند مع حذف تكرار مناطق التداخل
+
+    عند تداخل كيانين يُحتفظ بالأعلى ثقة.
+    """
+    entities = []
+    for chunk, found in zip(chunks, chunk_entities):
+        for entity in found:
+            entity = dict(entity)
+            entity['start'] = entity['start'] + chunk.start
+            entity['end'] = entity['end'] + chunk.start
+            entities.append(entity)
+
+    entities.sort(key=lambda entity: (entity['start'], -entity['score']))
+    merged = []
+    for entity in entities:
+        if merged and entity['start'] < merged[-1]['end']:
+            if entity['score'] > merged[-1]['score']:
+                merged[-1] = entity
+            continue
+        merged.append(entity)
+    return merged
+
+def merge_sentiment(chunks: List[TextChunk], chunk_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """دمج مشاعر النوافذ بتصويت مرجح بطول النافذة ودرجة الثقة
+
+    الدرجة الناتجة هي متوسط ثقة النموذج في التصنيف الفائز مرجحاً بالطول،
+    لذلك تساوي درجة النموذج نفسها عندما يكون النص نافذة واحدة.
+    """
+    votes = defaultdict(float)
+    lengths = defaultdict(int)
+    for chunk, result in zip(chunks, chunk_results):
+        length = chunk.end - chunk.start
+        votes[result['label']] += length * result['score']
+        lengths[result['label']] += length
+
+    if not votes:
+        return {}
+    label = max(votes, key=votes.get)
+    return {
+        'label': label,
+        'score': votes[label] / lengths[label] if lengths[label] else 0.0,
+        'chunks': len(chunks)
+    }
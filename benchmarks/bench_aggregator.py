@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+قياس ذاكرة مجمع النتائج
+Results Aggregator Memory Benchmark
+
+يقارن ذروة الذاكرة للمجمع القديم (قاموس بكل النتائج) بالمجمع المتدفق:
+    python -m benchmarks.bench_aggregator --results 1000000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from core.batch_scoring import score_results
+from core.quantum_parallel_processor import ResultsAggregator
+
+# حجم دفعة التقييم كما في المعالج المتوازي
+BATCH_SIZE = 512
+
+class LegacyAggregator:
+    """نسخة من المجمع السابق للمقارنة"""
+    def __init__(self):
+        self.results = {}
+
+    def add_result(self, result):
+        task_id = f"task_{len(self.results)}"
+        self.results[task_id] = {
+            'data': result,
+            'timestamp': datetime.now(),
+            'processed': False
+        }
+
+def synthetic_result(i: int) -> dict:
+    """نتيجة مهمة اصطناعية"""
+    return {
+        'emails': [f"user{i}@example.com"] if i % 3 == 0 else [],
+        'records': [f"10.0.{i % 256}.{i % 251}"],
+        'confidence': (i % 100) / 100
+    }
+
+def add_streaming(aggregator: ResultsAggregator, count: int):
+    """المجمع المتدفق: تقييم على دفعات كما في parallel_execution"""
+    for start in range(0, count, BATCH_SIZE):
+        batch = [synthetic_result(i) for i in range(start, min(start + BATCH_SIZE, count))]
+        aggregator.add_batch(score_results(batch), batch)
+    aggregator.get_final_results()
+
+def add_legacy(aggregator: LegacyAggregator, count: int):
+    """المجمع السابق: قاموس بكل النتائج"""
+    for i in range(count):
+        aggregator.add_result(synthetic_result(i))
+
+def measure(add, aggregator, count: int) -> dict:
+    """إضافة النتائج وقياس ذروة الذاكرة والزمن"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    add(aggregator, count)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"elapsed_s": elapsed, "peak_mb": peak / 2 ** 20, "results_per_s": count / elapsed}
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس ذاكرة مجمع النتائج")
+    parser.add_argument("--results", type=int, default=1000000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as spill_dir:
+        streaming = ResultsAggregator(spill_dir=spill_dir)
+        streaming_report = measure(add_streaming, streaming, args.results)
+        streaming.close()
+        streaming_report["spill_mb"] = os.path.getsize(streaming.spill_path) / 2 ** 20
+
+    legacy_report = measure(add_legacy, LegacyAggregator(), args.results)
+
+    print(json.dumps({
+        "results": args.results,
+        "legacy": legacy_report,
+        "streaming": streaming_report
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+قياس نقاط الاستئناف
+Scan Checkpoints Benchmark
+
+يحفظ نتائج استطلاع لعدد كبير من الأهداف ثم يقيس زمن تحميلها عند
+إعادة التشغيل (قراءة مجمعة مقابل قراءة كل هدف على حدة):
+    python -m benchmarks.bench_checkpoints --targets 100000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from core.checkpoints import ScanCheckpoints
+from core.result_cache import TwoTierCache
+
+PHASE = "advanced_reconnaissance"
+FINGERPRINT = ("advanced_dns_recon", "whois_analysis")
+
+def synthetic_result(i: int) -> dict:
+    """نتيجة استطلاع اصطناعية"""
+    return {
+        'advanced_dns_recon': {'A': [f"10.0.{i % 256}.{i % 200}"]},
+        'whois_analysis': {'registrar': 'Example Registrar'}
+    }
+
+def open_checkpoints(path: str) -> ScanCheckpoints:
+    """مخزن نقاط استئناف جديد (محاكاة إعادة تشغيل العملية)"""
+    cache = TwoTierCache(path=path, namespace="scan_checkpoints", max_memory_entries=1000, ttl=3600)
+    return ScanCheckpoints(cache=cache)
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس نقاط الاستئناف")
+    parser.add_argument("--targets", type=int, default=100000)
+    parser.add_argument("--completed", type=float, default=0.7, help="نسبة الأهداف المكتملة قبل التوقف")
+    args = parser.parse_args()
+
+    targets = [f"t{i}.example" for i in range(args.targets)]
+    completed = int(args.targets * args.completed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "checkpoints.db")
+
+        checkpoints = open_checkpoints(path)
+        start = time.perf_counter()
+        for i in range(completed):
+            checkpoints.save(PHASE, targets[i], synthetic_result(i), FINGERPRINT)
+        save_s = time.perf_counter() - start
+        checkpoints.close()
+
+        checkpoints = open_checkpoints(path)
+        start = time.perf_counter()
+        resumed = checkpoints.load(PHASE, targets, FINGERPRINT)
+        load_s = time.perf_counter() - start
+        checkpoints.close()
+
+        checkpoints = open_checkpoints(path)
+        start = time.perf_counter()
+        found = sum(1 for target in targets if checkpoints.cache.get(checkpoints.key(PHASE, target, FINGERPRINT)) is not None)
+        per_key_s = time.perf_counter() - start
+        checkpoints.close()
+
+    print(json.dumps({
+        "targets": args.targets,
+        "checkpointed": completed,
+        "save_us_per_target": save_s / completed * 1e6,
+        "resume_load_s": load_s,
+        "per_key_load_s": per_key_s,
+        "resumed": len(resumed),
+        "remaining": args.targets - len(resumed),
+        "per_key_found": found
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
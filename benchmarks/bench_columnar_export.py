@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+قياس التصدير العمودي
+Columnar Export Benchmark
+
+يصدّر نتائج اصطناعية لعدد كبير من الأهداف ثم يستعلم عنها بقارئ
+الذاكرة المُسقطة، ويقارن ذلك بتحميل ملف NDJSON كاملاً:
+    python -m benchmarks.bench_columnar_export --targets 200000
+    python -m benchmarks.bench_columnar_export --flatten-only
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from storage.columnar_export import export_records, flatten_result, read_table
+
+def synthetic_records(count: int):
+    """نتائج استطلاع اصطناعية (الهدف، المرحلة، النتيجة)"""
+    for i in range(count):
+        yield f"t{i}.example", "advanced_reconnaissance", {
+            'advanced_dns_recon': {
+                'A': [f"10.0.{i % 256}.{i % 200}"],
+                'MX': [f"mx{i % 50}.example."],
+                'TXT': ["v=spf1 -all"]
+            },
+            'whois_analysis': {'registrar': 'Example Registrar'},
+            'subdomain_enumeration': [f"www.t{i}.example", f"mail.t{i}.example"],
+            'hidden_contacts': {'emails': [f"info@t{i}.example"], 'phones': ["+15550100"]}
+        }
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس التصدير العمودي")
+    parser.add_argument("--targets", type=int, default=200000)
+    parser.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    parser.add_argument("--flatten-only", action="store_true", help="قياس التفكيك فقط (دون pyarrow)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = sum(1 for target, phase, result in synthetic_records(args.targets)
+               for _ in flatten_result("bench", target, phase, result))
+    flatten_s = time.perf_counter() - start
+    report = {"targets": args.targets, "rows": rows, "flatten_rows_per_s": rows / flatten_s}
+    if args.flatten_only:
+        print(json.dumps(report, indent=2))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        ndjson_path = os.path.join(directory, "results.ndjson")
+        with open(ndjson_path, "w", encoding="utf-8") as f:
+            for target, phase, result in synthetic_records(args.targets):
+                f.write(json.dumps({'target': target, 'phase': phase, 'result': result}) + "\n")
+
+        start = time.perf_counter()
+        tables = export_records(synthetic_records(args.targets), directory, "bench", args.format)
+        report["export_s"] = time.perf_counter() - start
+
+        # الاستعلام: سجلات MX لكل الأهداف
+        start = time.perf_counter()
+        mx_rows = read_table(
+            directory, "dns_records", columns=["target", "value"], filters=[("record_type", "=", "MX")]
+        ).num_rows if args.format == "parquet" else sum(
+            1 for value in read_table(directory, "dns_records").column("record_type").to_pylist() if value == "MX"
+        )
+        report["columnar_query_s"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ndjson_mx = 0
+        with open(ndjson_path, encoding="utf-8") as f:
+            for line in f:
+                ndjson_mx += len(json.loads(line)['result']['advanced_dns_recon'].get('MX', []))
+        report["ndjson_query_s"] = time.perf_counter() - start
+
+        report.update({
+            "mx_rows": mx_rows,
+            "ndjson_mx_rows": ndjson_mx,
+            "ndjson_mb": os.path.getsize(ndjson_path) / 2 ** 20,
+            "columnar_mb": sum(os.path.getsize(table['path']) for table in tables.values()) / 2 ** 20,
+            "tables": {name: table['rows'] for name, table in tables.items()}
+        })
+
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
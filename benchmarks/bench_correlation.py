@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+قياس فهرس الربط بين الأهداف
+Correlation Index Benchmark
+
+يفهرس عشرة ملايين كيان (افتراضياً) لأهداف اصطناعية، بعضها مشترك بين
+الأهداف فيولد روابط، ويقيس معدل الفهرسة والذاكرة:
+    python -m benchmarks.bench_correlation --entities 10000000
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from core.correlation_index import CorrelationIndex
+
+ENTITIES_PER_TARGET = 10
+SHARED_PER_TARGET = 2
+
+def target_entities(i: int, shared_pool: int):
+    """كيانات هدف واحد: ثمانية فريدة واثنان من مجموعة مشتركة"""
+    return [
+        ('email', f"user{i}@t{i}.example"),
+        ('email', f"Admin@T{i}.example"),
+        ('phone', f"+1 555 {i:07d}"),
+        ('ip', f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"),
+        ('domain', f"www.t{i}.example."),
+        ('domain', f"mail.t{i}.example"),
+        ('ns', f"ns1.t{i}.example."),
+        ('name', f"Person {i}"),
+        ('mx', f"10 mx{(i * 7919) % shared_pool}.shared.example."),
+        ('ip', f"192.0.{(i * 104729) % shared_pool >> 8 & 255}.{(i * 104729) % shared_pool & 255}"),
+    ]
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس فهرس الربط بين الأهداف")
+    parser.add_argument("--entities", type=int, default=10000000)
+    parser.add_argument("--trace-memory", action="store_true", help="قياس الذاكرة (أبطأ)")
+    args = parser.parse_args()
+
+    targets = args.entities // ENTITIES_PER_TARGET
+    shared_pool = max(targets // 10, 1)
+    index = CorrelationIndex(max_fanout=100)
+    link_events = 0
+
+    def on_link(link):
+        nonlocal link_events
+        link_events += 1
+
+    index.add_listener(on_link)
+
+    if args.trace_memory:
+        tracemalloc.start()
+    latencies = []
+    start = time.perf_counter()
+    for i in range(targets):
+        entities = target_entities(i, shared_pool)
+        if i % 1000 == 0:
+            began = time.perf_counter()
+            index.add_entities(f"t{i}.example", entities)
+            latencies.append((time.perf_counter() - began) * 1e6)
+        else:
+            index.add_entities(f"t{i}.example", entities)
+    elapsed = time.perf_counter() - start
+
+    report = {
+        "entities": targets * ENTITIES_PER_TARGET,
+        "targets": targets,
+        "elapsed_s": elapsed,
+        "entities_per_s": targets * ENTITIES_PER_TARGET / elapsed,
+        "us_per_result_p50": sorted(latencies)[len(latencies) // 2],
+        "link_events": link_events,
+        "stats": index.get_stats()
+    }
+    if args.trace_memory:
+        report["peak_mb"] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
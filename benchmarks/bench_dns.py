@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+قياس أداء محلل DNS
+DNS Resolver Benchmark
+
+يقارن الحل المتسلسل القديم بالمحلل غير المتزامن على خادم محلي:
+    python -m benchmarks.bench_dns --names 10000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import dns.resolver
+
+from benchmarks.stub_dns import StubDNSServer
+from core.async_dns import AsyncDNSResolver, DNSCache, DNS_RECORD_TYPES
+
+def blocking_baseline(names, port: int) -> float:
+    """الطريقة القديمة: ستة استعلامات متسلسلة لكل هدف"""
+    resolver = dns.resolver.Resolver(configure=False)
+    resolver.nameservers = ["127.0.0.1"]
+    resolver.port = port
+    start = time.perf_counter()
+    for name in names:
+        for record_type in DNS_RECORD_TYPES:
+            try:
+                resolver.resolve(name, record_type)
+            except Exception:
+                continue
+    return time.perf_counter() - start
+
+async def async_run(names, port: int, concurrency: int):
+    """المحلل الجديد: بارد ثم دافئ من الذاكرة المؤقتة"""
+    resolver = AsyncDNSResolver(
+        concurrency=concurrency,
+        nameservers=["127.0.0.1"],
+        port=port,
+        cache=DNSCache(max_entries=len(names) * len(DNS_RECORD_TYPES))
+    )
+    start = time.perf_counter()
+    await resolver.resolve_many(names, DNS_RECORD_TYPES)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await resolver.resolve_many(names, DNS_RECORD_TYPES)
+    warm = time.perf_counter() - start
+    return cold, warm, resolver.get_stats()
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس أداء محلل DNS")
+    parser.add_argument("--names", type=int, default=10000)
+    parser.add_argument("--baseline-names", type=int, default=500,
+                        help="عدد الأسماء للطريقة المتسلسلة (تُستقرأ للعدد الكامل)")
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    # عُشر الأسماء غير موجودة لقياس التخزين السلبي
+    names = [
+        f"{'nx' if i % 10 == 0 else 'host'}{i}.bench.test"
+        for i in range(args.names)
+    ]
+
+    with StubDNSServer() as server:
+        baseline = blocking_baseline(names[:args.baseline_names], server.port)
+        cold, warm, stats = asyncio.run(async_run(names, server.port, args.concurrency))
+
+    queries = args.names * len(DNS_RECORD_TYPES)
+    extrapolated = baseline * args.names / args.baseline_names
+    print(json.dumps({
+        "names": args.names,
+        "queries": queries,
+        "blocking_extrapolated_s": extrapolated,
+        "async_cold_s": cold,
+        "async_warm_s": warm,
+        "cold_qps": queries / cold,
+        "warm_qps": queries / warm,
+        "speedup_vs_blocking": extrapolated / cold,
+        "cache": stats
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
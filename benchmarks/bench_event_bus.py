@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+قياس توزيع أحداث التحقيقات
+Event Bus Fan-out Benchmark
+
+ينشر أحداثاً إلى مئات المشتركين بينهم مستهلكون بطيئون، ويقيس زمن
+النشر للتأكد من أن المشترك البطيء لا يبطئ المسح:
+    python -m benchmarks.bench_event_bus --subscribers 500 --events 10000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from core.event_bus import EventBus
+
+async def run(subscribers: int, slow: int, events: int) -> dict:
+    """تنفيذ القياس"""
+    bus = EventBus(max_queue=256)
+    received = [0] * subscribers
+
+    async def consume(index: int, delay: float):
+        async for _ in bus.subscribe("bench"):
+            received[index] += 1
+            if delay:
+                await asyncio.sleep(delay)
+
+    consumers = [
+        asyncio.ensure_future(consume(index, 0.01 if index < slow else 0))
+        for index in range(subscribers)
+    ]
+    await asyncio.sleep(0)
+
+    publish_s = 0.0
+    worst_publish_ms = 0.0
+    for i in range(events):
+        start = time.perf_counter()
+        bus.publish("bench", "target_completed", {"target": f"t{i}.example"})
+        elapsed = time.perf_counter() - start
+        publish_s += elapsed
+        worst_publish_ms = max(worst_publish_ms, elapsed * 1000)
+        # المسح يعطي المستهلكين فرصة للعمل بين النتائج
+        await asyncio.sleep(0)
+
+    bus.publish("bench", "investigation_completed")
+    await asyncio.gather(*consumers)
+
+    fast_received = received[slow:]
+    return {
+        "subscribers": subscribers,
+        "slow_subscribers": slow,
+        "events": events,
+        "publish_us_avg": publish_s / events * 1e6,
+        "publish_ms_worst": worst_publish_ms,
+        "fast_received_min": min(fast_received) if fast_received else 0,
+        "stats": bus.get_stats()
+    }
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس توزيع أحداث التحقيقات")
+    parser.add_argument("--subscribers", type=int, default=500)
+    parser.add_argument("--slow", type=int, default=50)
+    parser.add_argument("--events", type=int, default=10000)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.subscribers, args.slow, args.events)), indent=2))
+
+if __name__ == "__main__":
+    main()
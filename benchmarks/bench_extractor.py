@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+قياس سرعة مستخرج جهات الاتصال
+Contact Extractor Throughput Benchmark
+
+يقارن الأنماط المتفرقة القديمة بالمستخرج الموحد (ميغابايت/ثانية):
+    python -m benchmarks.bench_extractor --total-mb 4096
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+
+from core.contact_extractor import contact_extractor
+
+# الأنماط كما كانت منسوخة في الوحدات
+LEGACY_PATTERNS = [
+    r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',
+    r'\b\d{2}[-.]?\d{3}[-.]?\d{4}\b',
+    r'\+\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}\b',
+    r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+]
+
+WORDS = ["hello", "contact", "me", "at", "the", "office", "call", "tomorrow",
+         "regards", "team", "meeting", "2024", "project", "phone"]
+
+def synthetic_block(size_bytes: int, seed: int = 11) -> str:
+    """كتلة نصية اصطناعية بحجم محدد مع جهات اتصال متفرقة"""
+    rng = random.Random(seed)
+    parts, size, i = [], 0, 0
+    while size < size_bytes:
+        i += 1
+        if i % 50 == 0:
+            token = f"user{i}@mail{i % 7}.com"
+        elif i % 73 == 0:
+            token = f"+{i % 999} 55 {i % 1000:03d} {i % 10000:04d}"
+        elif i % 91 == 0:
+            token = f"555-{i % 1000:03d}-{i % 10000:04d}"
+        else:
+            token = rng.choice(WORDS)
+        parts.append(token)
+        size += len(token) + 1
+    return " ".join(parts)
+
+def split_documents(block: str, doc_size: int):
+    """تقسيم الكتلة إلى وثائق"""
+    return [block[i:i + doc_size] for i in range(0, len(block), doc_size)]
+
+def legacy_scan(documents, repeats: int) -> int:
+    """المسح القديم: findall لكل نمط على حدة"""
+    found = 0
+    for _ in range(repeats):
+        for doc in documents:
+            for pattern in LEGACY_PATTERNS:
+                found += len(re.findall(pattern, doc))
+    return found
+
+def unified_scan(documents, repeats: int) -> int:
+    """المسح الموحد بمرور واحد"""
+    found = 0
+    for _ in range(repeats):
+        for doc in documents:
+            for _ in contact_extractor.finditer(doc):
+                found += 1
+    return found
+
+def timed(label: str, func, documents, repeats: int, total_mb: float) -> dict:
+    """تشغيل مسح وقياس الإنتاجية"""
+    start = time.perf_counter()
+    found = func(documents, repeats)
+    elapsed = time.perf_counter() - start
+    return {"variant": label, "elapsed_s": elapsed, "mb_per_s": total_mb / elapsed, "matches": found}
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس سرعة مستخرج جهات الاتصال")
+    parser.add_argument("--total-mb", type=int, default=4096, help="حجم المجموعة الكلي")
+    parser.add_argument("--block-mb", type=int, default=64, help="حجم الكتلة المكررة")
+    parser.add_argument("--doc-kb", type=int, default=64)
+    args = parser.parse_args()
+
+    block = synthetic_block(args.block_mb * 2 ** 20)
+    repeats = max(1, args.total_mb // args.block_mb)
+    total_mb = repeats * len(block) / 2 ** 20
+
+    str_docs = split_documents(block, args.doc_kb * 1024)
+    encoded = block.encode("ascii")
+    bytes_docs = [encoded[i:i + args.doc_kb * 1024] for i in range(0, len(encoded), args.doc_kb * 1024)]
+    view = memoryview(encoded)
+    view_docs = [view[i:i + args.doc_kb * 1024] for i in range(0, len(view), args.doc_kb * 1024)]
+
+    report = [
+        timed("legacy_str", legacy_scan, str_docs, repeats, total_mb),
+        timed("unified_str", unified_scan, str_docs, repeats, total_mb),
+        timed("unified_bytes", unified_scan, bytes_docs, repeats, total_mb),
+        timed("unified_memoryview", unified_scan, view_docs, repeats, total_mb)
+    ]
+    print(json.dumps({"total_mb": total_mb, "results": report}, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+قياس محرك رسم العلاقات
+Relationship Graph Benchmark
+
+يبني رسماً اصطناعياً بمجتمعات (مليون حافة افتراضياً) ويقيس تحليل CSR
+(الكثافة، المركزية البينية التقريبية، انتشار التسميات) والذاكرة، ويقارن
+مع networkx على رسم أصغر:
+    python -m benchmarks.bench_graph --edges 1000000 --networkx-edges 100000
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+import numpy as np
+
+from core.relationship_graph import RelationshipGraph
+
+def build_graph(edges: int, community_size: int, seed: int, networkx_max_edges: int) -> RelationshipGraph:
+    """رسم بمجتمعات: 90% من الحواف داخل المجتمع و10% بين المجتمعات"""
+    rng = np.random.default_rng(seed)
+    nodes = max(edges // 5, 2)
+    sources = rng.integers(0, nodes, size=edges)
+    inside = rng.random(edges) < 0.9
+    community_start = sources - sources % community_size
+    targets = np.where(
+        inside,
+        np.minimum(community_start + rng.integers(0, community_size, size=edges), nodes - 1),
+        rng.integers(0, nodes, size=edges)
+    )
+    graph = RelationshipGraph(networkx_max_edges=networkx_max_edges)
+    for source, target in zip(sources.tolist(), targets.tolist()):
+        graph.add_edge(f"t{source}", f"t{target}")
+    return graph
+
+def measure(graph: RelationshipGraph, trace_memory: bool):
+    """زمن التحليل وذروة الذاكرة"""
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    analysis = graph.analyze(top=5)
+    elapsed = time.perf_counter() - start
+    report = {
+        "backend": analysis['backend'],
+        "nodes": analysis['nodes'],
+        "edges": analysis['edges'],
+        "analyze_s": elapsed,
+        "network_density": analysis['network_density'],
+        "community_count": analysis['community_count'],
+        "largest_communities": [community['members'] for community in analysis['communities']],
+        "key_connectors": analysis['key_connectors'][:3]
+    }
+    if trace_memory:
+        report["peak_mb"] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    return report
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس محرك رسم العلاقات")
+    parser.add_argument("--edges", type=int, default=1000000)
+    parser.add_argument("--networkx-edges", type=int, default=100000)
+    parser.add_argument("--community-size", type=int, default=50)
+    parser.add_argument("--trace-memory", action="store_true", help="قياس الذاكرة (أبطأ)")
+    args = parser.parse_args()
+
+    report = {}
+    start = time.perf_counter()
+    large = build_graph(args.edges, args.community_size, 0, networkx_max_edges=0)
+    report["build_s"] = time.perf_counter() - start
+    report["csr"] = measure(large, args.trace_memory)
+    del large
+
+    if args.networkx_edges:
+        small = build_graph(args.networkx_edges, args.community_size, 1, networkx_max_edges=0)
+        report["csr_small"] = measure(small, args.trace_memory)
+        small.networkx_max_edges = args.networkx_edges
+        report["networkx_small"] = measure(small, args.trace_memory)
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
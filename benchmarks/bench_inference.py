@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+قياس إنتاجية الاستدلال
+Inference Throughput Benchmark
+
+يقارن الاستدعاء نصاً بنص بطابور الدفعات الصغيرة على المعالج (CPU):
+    python -m benchmarks.bench_inference --docs 2000 --callers 64
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from ai.batch_inference import MicroBatchInferenceQueue
+from core.model_registry import model_registry, lazy_import
+
+SENTENCES = [
+    "Great meeting with the team today at the office.",
+    "I am so tired of this software breaking every week!",
+    "Visiting family at home for the holidays, feeling grateful.",
+    "The university announced new programming courses for next year.",
+    "Worst customer service ever, never again.",
+    "Just started a new job at a tech company in the city."
+]
+
+def corpus(size: int, seed: int = 3):
+    """نصوص اصطناعية بأطوال متفاوتة"""
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(SENTENCES, k=rng.randint(1, 6))) for _ in range(size)]
+
+def sequential(model_name: str, texts) -> float:
+    """الطريقة القديمة: استدعاء النموذج لكل نص على حدة"""
+    pipeline = model_registry.get(model_name)
+    torch = lazy_import("torch")
+    start = time.perf_counter()
+    with torch.inference_mode():
+        for text in texts:
+            pipeline(text, truncation=True)
+    return time.perf_counter() - start
+
+async def batched(model_name: str, texts, callers: int, batch_size: int, max_wait_ms: float):
+    """مستدعون متزامنون يرسلون عبر طابور الدفعات"""
+    queue = MicroBatchInferenceQueue(
+        model_name, batch_size=batch_size, max_wait_ms=max_wait_ms,
+        call_kwargs={'truncation': True}
+    )
+    iterator = iter(texts)
+
+    async def caller():
+        for text in iterator:
+            await queue.submit(text)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(callers)))
+    elapsed = time.perf_counter() - start
+    stats = queue.get_stats()
+    queue.close()
+    return elapsed, stats
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس إنتاجية الاستدلال")
+    parser.add_argument("--model", default="sentiment")
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--callers", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=10)
+    args = parser.parse_args()
+
+    texts = corpus(args.docs)
+    model_registry.get(args.model)  # استبعاد زمن التحميل من القياس
+
+    sequential_time = sequential(args.model, texts)
+    batched_time, stats = asyncio.run(
+        batched(args.model, texts, args.callers, args.batch_size, args.max_wait_ms)
+    )
+
+    print(json.dumps({
+        "model": args.model,
+        "docs": args.docs,
+        "sequential_docs_per_s": args.docs / sequential_time,
+        "batched_docs_per_s": args.docs / batched_time,
+        "speedup": sequential_time / batched_time,
+        "queue_stats": stats
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
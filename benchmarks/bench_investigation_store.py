@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+قياس حمل مخزن التحقيقات
+Investigation Store Load Benchmark
+
+يملأ المخزن بمليون تحقيق ثم يقيس زمن عرض أحدث 50 تحقيقاً:
+    python -m benchmarks.bench_investigation_store --rows 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from storage.investigation_store import InvestigationStore, new_investigation_id
+
+STATUSES = ["completed", "completed", "completed", "failed", "pending", "running"]
+
+async def populate(store: InvestigationStore, rows: int, batch: int = 10000):
+    """إدخال التحقيقات على دفعات"""
+    base = datetime.now() - timedelta(days=365)
+    for offset in range(0, rows, batch):
+        investigations, targets = [], []
+        for i in range(offset, min(offset + batch, rows)):
+            investigation_id = new_investigation_id()
+            target = f"target{i % 50000}.example"
+            investigations.append((
+                investigation_id, STATUSES[i % len(STATUSES)], json.dumps([target]),
+                "comprehensive", "deep", (base + timedelta(seconds=i * 30)).isoformat()
+            ))
+            targets.append((target, investigation_id))
+        await store.db.executemany(
+            "INSERT INTO investigations (id, status, targets, scan_type, depth, created_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            investigations
+        )
+        await store.db.executemany(
+            "INSERT INTO investigation_targets (target, investigation_id) VALUES (?, ?)",
+            targets
+        )
+        await store.db.commit()
+
+async def timed(samples: int, call) -> dict:
+    """زمن الاستعلام بالمللي ثانية"""
+    latencies = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        await call()
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    }
+
+async def run(rows: int, samples: int) -> dict:
+    """تنفيذ القياس"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = InvestigationStore(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        await store.connect()
+
+        start = time.perf_counter()
+        await populate(store, rows)
+        populate_s = time.perf_counter() - start
+
+        first_page = await store.list_investigations(limit=50)
+        deep_cursor = first_page['next_cursor']
+        for _ in range(100):
+            deep_cursor = (await store.list_investigations(limit=50, cursor=deep_cursor))['next_cursor']
+
+        report = {
+            "rows": rows,
+            "populate_s": populate_s,
+            "latest_50": await timed(samples, lambda: store.list_investigations(limit=50)),
+            "page_100_deep": await timed(samples, lambda: store.list_investigations(limit=50, cursor=deep_cursor)),
+            "latest_50_by_status": await timed(samples, lambda: store.list_investigations(limit=50, status="failed")),
+            "latest_50_by_target": await timed(samples, lambda: store.list_investigations(limit=50, target="target42.example")),
+            "claim_next": await timed(samples, store.claim_next),
+            "create": await timed(samples, lambda: store.create(new_investigation_id(), ["new.example"], "comprehensive", "deep"))
+        }
+        await store.close()
+        return report
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس حمل مخزن التحقيقات")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.rows, args.samples)), indent=2))
+
+if __name__ == "__main__":
+    main()
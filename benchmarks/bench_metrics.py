@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+قياس كلفة مقاييس الأداء
+Metrics Overhead Benchmark
+
+يقيس الكلفة المضافة لكل عملية مقيسة بـ track (مع وبدون مسح جارٍ)
+ولكل تقنية غير متزامنة بـ timed، وزمن عرض /metrics:
+    python -m benchmarks.bench_metrics --operations 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from core.metrics import ScanMetrics, metrics, scan_metrics, timed, track
+
+def per_call_us(loop_func, operations: int) -> float:
+    """متوسط زمن الاستدعاء بالميكروثانية"""
+    start = time.perf_counter()
+    loop_func(operations)
+    return (time.perf_counter() - start) / operations * 1e6
+
+def bare(operations: int):
+    for _ in range(operations):
+        pass
+
+def tracked(operations: int):
+    for _ in range(operations):
+        with track('bench', 'operation'):
+            pass
+
+async def technique():
+    return None
+
+async def run_techniques(func, operations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(operations):
+        await func()
+    return (time.perf_counter() - start) / operations * 1e6
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس كلفة مقاييس الأداء")
+    parser.add_argument("--operations", type=int, default=1000000)
+    args = parser.parse_args()
+
+    baseline = per_call_us(bare, args.operations)
+    without_scan = per_call_us(tracked, args.operations)
+    token = scan_metrics.set(ScanMetrics())
+    with_scan = per_call_us(tracked, args.operations)
+    scan_metrics.reset(token)
+
+    plain_async = asyncio.run(run_techniques(technique, args.operations // 10))
+    timed_async = asyncio.run(run_techniques(timed('bench', 'technique')(technique), args.operations // 10))
+
+    start = time.perf_counter()
+    exposition = metrics.render_prometheus()
+    render_ms = (time.perf_counter() - start) * 1000
+
+    print(json.dumps({
+        "operations": args.operations,
+        "track_overhead_us": without_scan - baseline,
+        "track_overhead_in_scan_us": with_scan - baseline,
+        "timed_async_overhead_us": timed_async - plain_async,
+        "render_ms": render_ms,
+        "exposition_bytes": len(exposition)
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
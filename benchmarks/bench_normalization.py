@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+قياس تطبيع الكيانات وإزالة المكرر
+Entity Normalization Benchmark
+
+يمرر خمسين مليون جهة اتصال خام (افتراضياً) بصيغ مختلفة لنفس الكيانات
+(هواتف بفواصل ودون رمز دولة، إيميلات بأحرف كبيرة ووسم "+"، نطاقات دولية)
+عبر مرحلة التطبيع، ويقارن ذاكرة فهرس البصمات مع مجموعة نصوص عادية:
+    python -m benchmarks.bench_normalization --raw 50000000 --unique-ratio 0.2
+"""
+
+import argparse
+import json
+import resource
+import time
+
+from benchmarks.corpora import raw_contacts
+from core.entity_normalizer import EntityDeduplicator, canonicalize
+
+def peak_rss_mb() -> float:
+    """ذروة الذاكرة المقيمة للعملية"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس تطبيع الكيانات وإزالة المكرر")
+    parser.add_argument("--raw", type=int, default=50000000)
+    parser.add_argument("--unique-ratio", type=float, default=0.2)
+    parser.add_argument("--batch-size", type=int, default=65536)
+    parser.add_argument("--baseline", action="store_true",
+                        help="مقارنة مع set من النصوص الموحدة (يُشغّل في عملية منفصلة لقياس الذاكرة)")
+    args = parser.parse_args()
+    unique = max(int(args.raw * args.unique_ratio), 1)
+    start_rss = peak_rss_mb()
+
+    start = time.perf_counter()
+    if args.baseline:
+        seen = set()
+        for kind, value in raw_contacts(args.raw, unique):
+            canonical = canonicalize(kind, value)
+            if canonical is not None:
+                seen.add((kind, canonical))
+        stats = {'unique': len(seen)}
+    else:
+        deduplicator = EntityDeduplicator(batch_size=args.batch_size)
+        for _ in deduplicator.dedupe_stream(raw_contacts(args.raw, unique)):
+            pass
+        stats = deduplicator.get_stats()
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "mode": "set_of_strings" if args.baseline else "canonical_keys",
+        "raw": args.raw,
+        "elapsed_s": elapsed,
+        "raw_per_s": args.raw / elapsed,
+        "peak_rss_growth_mb": peak_rss_mb() - start_rss,
+        "stats": stats
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
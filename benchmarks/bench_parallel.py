@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+قياس أداء المعالج المتوازي
+Parallel Processor Benchmark
+
+يقيس الإنتاجية وزمن الاستجابة وتأخر حلقة الأحداث:
+    python -m benchmarks.bench_parallel --sizes 10000 100000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+
+from core.quantum_parallel_processor import QuantumParallelProcessor
+
+def percentile(samples, fraction: float) -> float:
+    """قيمة مئينية من عينة مرتبة"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def sleep_task(i: int):
+    """مهمة I/O غير متزامنة"""
+    await asyncio.sleep(0)
+    return {'task': i, 'email': f'user{i}@example.com'}
+
+def sync_task(i: int):
+    """مهمة متزامنة تُنفذ في مجمع الخيوط"""
+    return {'task': i, 'phone': str(i)}
+
+async def loop_lag_monitor(stop: asyncio.Event, samples: list, interval: float = 0.005):
+    """قياس تأخر حلقة الأحداث أثناء التنفيذ"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - start - interval)
+
+async def run_stream(size: int, kind: str, workers: int) -> dict:
+    """قياس execute_stream مباشرة"""
+    processor = QuantumParallelProcessor(max_workers=workers)
+    enqueued = [0.0] * size
+    latencies = []
+
+    def tasks():
+        for i in range(size):
+            enqueued[i] = time.perf_counter()
+            if kind == "async":
+                yield sleep_task(i)
+            else:
+                yield lambda i=i: sync_task(i)
+
+    stop = asyncio.Event()
+    lag = []
+    monitor = asyncio.ensure_future(loop_lag_monitor(stop, lag))
+
+    start = time.perf_counter()
+    async for index, _ in processor.execute_stream(tasks()):
+        latencies.append(time.perf_counter() - enqueued[index])
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await monitor
+    return {
+        "tasks": size,
+        "kind": kind,
+        "elapsed_s": elapsed,
+        "tasks_per_s": size / elapsed,
+        "latency_p50_ms": percentile(latencies, 0.50) * 1000,
+        "latency_p99_ms": percentile(latencies, 0.99) * 1000,
+        "loop_lag_max_ms": max(lag, default=0.0) * 1000,
+        "loop_lag_mean_ms": (statistics.mean(lag) if lag else 0.0) * 1000
+    }
+
+async def run_full(size: int, workers: int) -> dict:
+    """قياس parallel_execution مع المعالجة الفورية والتجميع"""
+    processor = QuantumParallelProcessor(max_workers=workers)
+    tasks = [sleep_task(i) for i in range(size)]
+    start = time.perf_counter()
+    await processor.parallel_execution(tasks)
+    elapsed = time.perf_counter() - start
+    return {"tasks": size, "elapsed_s": elapsed, "tasks_per_s": size / elapsed}
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس أداء المعالج المتوازي")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--workers", type=int, default=50)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    report = {"stream": [], "parallel_execution": []}
+    for size in args.sizes:
+        for kind in ("async", "sync"):
+            report["stream"].append(asyncio.run(run_stream(size, kind, args.workers)))
+        report["parallel_execution"].append(asyncio.run(run_full(size, args.workers)))
+
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
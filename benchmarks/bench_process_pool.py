@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+قياس توسع مجمع العمليات
+Process Pool Scaling Benchmark
+
+يحلل مجموعة وثائق اصطناعية بعدد متزايد من العمليات ويقارنها بالخيوط:
+    python -m benchmarks.bench_process_pool --docs 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+
+from core.analysis_workers import analyze_document
+from core.quantum_parallel_processor import QuantumParallelProcessor, cpu_task
+
+WORDS = [
+    "company", "software", "family", "university", "the", "a", "meeting",
+    "project", "holiday", "friend", "report", "tech", "home", "study", "call"
+]
+
+def synthetic_corpus(size: int, seed: int = 7):
+    """توليد وثائق اصطناعية حتمية تحتوي جهات اتصال"""
+    rng = random.Random(seed)
+    for i in range(size):
+        words = rng.choices(WORDS, k=40)
+        if i % 3 == 0:
+            words.insert(rng.randrange(len(words)), f"user{i}@example.com")
+        if i % 4 == 0:
+            words.insert(rng.randrange(len(words)), f"555-{i % 1000:03d}-{i % 10000:04d}")
+        yield " ".join(words)
+
+async def run(docs: int, backend: str, workers: int, chunk_size: int) -> float:
+    """تحليل المجموعة كاملة وإرجاع الزمن"""
+    processor = QuantumParallelProcessor(
+        max_workers=max(workers, 4),
+        backend=backend,
+        process_workers=workers,
+        chunk_size=chunk_size
+    )
+    tasks = (cpu_task(analyze_document, doc) for doc in synthetic_corpus(docs))
+    start = time.perf_counter()
+    async for _ in processor.execute_stream(tasks):
+        pass
+    elapsed = time.perf_counter() - start
+    processor.shutdown()
+    return elapsed
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس توسع مجمع العمليات")
+    parser.add_argument("--docs", type=int, default=1000000)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--max-processes", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    counts, n = [], 1
+    while n <= args.max_processes:
+        counts.append(n)
+        n *= 2
+    if counts[-1] != args.max_processes:
+        counts.append(args.max_processes)
+
+    thread_time = asyncio.run(run(args.docs, "thread", 8, args.chunk_size))
+    report = {
+        "docs": args.docs,
+        "thread_backend": {"elapsed_s": thread_time, "docs_per_s": args.docs / thread_time},
+        "process_backend": []
+    }
+    for workers in counts:
+        elapsed = asyncio.run(run(args.docs, "auto", workers, args.chunk_size))
+        report["process_backend"].append({
+            "processes": workers,
+            "elapsed_s": elapsed,
+            "docs_per_s": args.docs / elapsed,
+            "speedup_vs_threads": thread_time / elapsed
+        })
+
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
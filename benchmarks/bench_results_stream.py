@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+قياس بث النتائج
+Results Streaming Benchmark
+
+يقارن زمن أول بايت وذروة الذاكرة بين بناء JSON واحد للنتائج كاملة
+وبث NDJSON المضغوط سجلاً بعد سجل:
+    python -m benchmarks.bench_results_stream --targets 100000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from web.backend.streaming import encode_stream, ndjson_lines
+
+def synthetic_result(i: int) -> dict:
+    """نتيجة استطلاع اصطناعية لهدف واحد"""
+    return {
+        'advanced_dns_recon': {'A': [f"10.0.{i % 256}.{i % 200}"], 'MX': [f"mx{i}.example"]},
+        'whois_analysis': {'registrar': 'Example Registrar', 'created': '2020-01-01'},
+        'subdomain_enumeration': [f"www.t{i}.example", f"mail.t{i}.example"]
+    }
+
+async def stored_records(count: int):
+    """محاكاة قراءة السجلات المخزنة دفعة بعد دفعة"""
+    for i in range(count):
+        yield f"t{i}.example", "advanced_reconnaissance", json.dumps(synthetic_result(i))
+
+async def measure_stream(count: int, encoding) -> dict:
+    """بث NDJSON"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    first_byte = None
+    total = 0
+    async for chunk in encode_stream(ndjson_lines(stored_records(count)), encoding):
+        if first_byte is None:
+            first_byte = time.perf_counter() - start
+        total += len(chunk)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ttfb_ms": first_byte * 1000, "elapsed_s": elapsed, "peak_mb": peak / 2 ** 20, "bytes": total}
+
+def measure_legacy(count: int) -> dict:
+    """الطريقة السابقة: قاموس واحد ثم json.dumps"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = {
+        'phases': {'advanced_reconnaissance': {f"t{i}.example": synthetic_result(i) for i in range(count)}}
+    }
+    body = json.dumps({'results': results}, indent=2).encode('utf-8')
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ttfb_ms": elapsed * 1000, "elapsed_s": elapsed, "peak_mb": peak / 2 ** 20, "bytes": len(body)}
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس بث النتائج")
+    parser.add_argument("--targets", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(json.dumps({
+        "targets": args.targets,
+        "legacy_json": measure_legacy(args.targets),
+        "ndjson": asyncio.run(measure_stream(args.targets, None)),
+        "ndjson_gzip": asyncio.run(measure_stream(args.targets, "gzip"))
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+قياس تقييم النتائج
+Result Scoring Benchmark
+
+يقارن التقييم السابق لكل نتيجة بالتقييم على دفعات (score_results)
+مع التحقق من تطابق القيم:
+    python -m benchmarks.bench_scoring --results 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+
+import numpy as np
+
+from core.batch_scoring import score_results
+
+def synthetic_result(i: int):
+    """نتيجة مهمة اصطناعية بأشكال مختلفة"""
+    kind = i % 5
+    if kind == 0:
+        return {'emails': [f"user{i}@example.com"], 'confidence': 0.9, 'source': 'surface'}
+    if kind == 1:
+        return {'records': [f"10.0.0.{i % 256}"], 'notes': '', 'confidence': 0.6}
+    if kind == 2:
+        return {'error': 'timeout', 'target': f"t{i}.example"}
+    if kind == 3:
+        return [f"item{i}", "Mobile: +1 555 0100"]
+    return None
+
+class LegacyScorer:
+    """نسخة من التحليل السريع السابق لكل نتيجة للمقارنة"""
+    async def quick_analyze_result(self, result):
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'data_size': len(str(result)) if result else 0,
+            'has_contacts': self.check_for_contacts(result),
+            'confidence_score': self.calculate_confidence(result)
+        }
+
+    def check_for_contacts(self, result):
+        if not result:
+            return False
+        result_str = str(result).lower()
+        return any(indicator in result_str for indicator in ['@', 'phone', 'email', 'contact', 'mobile'])
+
+    def calculate_confidence(self, result):
+        if not result:
+            return 0.0
+        factors = [self.data_completeness(result), self.data_consistency(result), self.source_reliability(result)]
+        return sum(factors) / len(factors)
+
+    def data_completeness(self, result) -> float:
+        if isinstance(result, dict):
+            return sum(1 for value in result.values() if value) / len(result) if result else 0.0
+        return 1.0
+
+    def data_consistency(self, result) -> float:
+        return 0.5 if isinstance(result, dict) and 'error' in result else 1.0
+
+    def source_reliability(self, result) -> float:
+        if isinstance(result, dict) and isinstance(result.get('confidence'), (int, float)):
+            return float(result['confidence'])
+        return 0.5
+
+async def per_item(scorer: LegacyScorer, results) -> list:
+    """المسار السابق: تحليل سريع لكل نتيجة"""
+    return [await scorer.quick_analyze_result(result) for result in results]
+
+def batched(results, batch_size: int):
+    """المسار الجديد: تقييم على دفعات"""
+    return [score_results(results[start:start + batch_size]) for start in range(0, len(results), batch_size)]
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس تقييم النتائج")
+    parser.add_argument("--results", type=int, default=1000000)
+    parser.add_argument("--batch-size", type=int, default=512)
+    args = parser.parse_args()
+
+    results = [synthetic_result(i) for i in range(args.results)]
+
+    start = time.perf_counter()
+    analyses = asyncio.run(per_item(LegacyScorer(), results))
+    per_item_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batches = batched(results, args.batch_size)
+    batch_s = time.perf_counter() - start
+
+    confidence = np.concatenate([scores.confidence for scores in batches])
+    has_contacts = np.concatenate([scores.has_contacts for scores in batches])
+    data_size = np.concatenate([scores.data_size for scores in batches])
+    matches = (
+        np.allclose(confidence, [a['confidence_score'] for a in analyses])
+        and has_contacts.tolist() == [a['has_contacts'] for a in analyses]
+        and data_size.tolist() == [a['data_size'] for a in analyses]
+    )
+
+    print(json.dumps({
+        "results": args.results,
+        "per_item_s": per_item_s,
+        "batch_s": batch_s,
+        "speedup": per_item_s / batch_s,
+        "per_item_results_per_s": args.results / per_item_s,
+        "batch_results_per_s": args.results / batch_s,
+        "outputs_match": bool(matches)
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+قياس زمن بدء التشغيل
+Startup Time Benchmark
+
+يقارن التحميل الكسول للنماذج بالتحميل المسبق:
+    python -m benchmarks.bench_startup --runs 5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# يُنفّذ داخل مفسر جديد حتى يشمل القياس زمن الاستيراد
+CHILD_SCRIPT = """
+import asyncio, json, sys, time
+t0 = time.perf_counter()
+from core.advanced_engine import QuantumOSINTEngine
+from core.model_registry import model_registry
+t_import = time.perf_counter()
+if sys.argv[1] == "eager":
+    model_registry.warm_up(["dialog_rpt", "beit_large", "voice_recognizer"], background=False)
+engine = QuantumOSINTEngine(warm_up_models=False)
+engine.recon_techniques = ["advanced_dns_recon"]
+t_init = time.perf_counter()
+asyncio.run(engine.comprehensive_scan(["localhost"], phases=["advanced_reconnaissance"]))
+t_scan = time.perf_counter()
+print(json.dumps({
+    "import_s": t_import - t0,
+    "init_s": t_init - t_import,
+    "dns_scan_s": t_scan - t_init,
+    "total_s": t_scan - t0
+}))
+"""
+
+def run_once(mode: str) -> dict:
+    """تشغيل قياس واحد في عملية منفصلة"""
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, mode],
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس زمن بدء التشغيل")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", default=["lazy", "eager"])
+    args = parser.parse_args()
+
+    report = {}
+    for mode in args.modes:
+        samples = [run_once(mode) for _ in range(args.runs)]
+        report[mode] = {
+            key: statistics.median(sample[key] for sample in samples)
+            for key in samples[0]
+        }
+
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
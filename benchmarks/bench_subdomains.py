@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+قياس أداء تعداد النطاقات الفرعية
+Subdomain Enumeration Benchmark
+
+يعدد منطقة عادية ومنطقة ذات سجل شامل على خادم DNS محلي بقائمة كلمات
+اصطناعية تُولّد كتدفق، ويقيس الأسماء في الثانية ودقة النتائج ونمو
+الذاكرة المقيمة بين قائمتين بحجمين مختلفين:
+    python -m benchmarks.bench_subdomains --words 100000 --concurrency 256
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, Iterator
+
+from benchmarks.stub_dns import StubDNSServer
+from core.async_dns import BulkResolver
+from core.profiler import resident_memory
+from core.subdomain_enumerator import SubdomainEnumerator
+
+def words(count: int) -> Iterator[str]:
+    """كلمات اصطناعية فريدة دون تخزين القائمة"""
+    for i in range(count):
+        yield f"host{i}"
+
+async def enumerate_zone(enumerator: SubdomainEnumerator, zone: str, count: int) -> Dict[str, Any]:
+    """تعداد منطقة واحدة وقياس الزمن والذاكرة"""
+    memory = resident_memory()
+    start = time.perf_counter()
+    found = [name async for name, _ in enumerator.enumerate(zone, words(count))]
+    elapsed = time.perf_counter() - start
+    return {
+        "zone": zone,
+        "words": count,
+        "elapsed_s": elapsed,
+        "names_per_s": count / elapsed,
+        "found": len(found),
+        "rss_growth_mb": (resident_memory() - memory) / (1 << 20)
+    }
+
+async def run(server: StubDNSServer, args) -> Dict[str, Any]:
+    enumerator = SubdomainEnumerator(
+        resolver=BulkResolver(nameservers=[server.host], port=server.port),
+        initial_concurrency=args.concurrency,
+        max_concurrency=args.max_concurrency
+    )
+    zone = f"corp.{server.zone}"
+    wildcard_zone = f"wild.{server.zone}"
+    server.wildcard_zones.add(wildcard_zone)
+
+    # قائمة صغيرة أولاً لتسخين الحلقة والمقابس، ثم الكاملة لمقارنة الذاكرة
+    small = await enumerate_zone(enumerator, zone, max(args.words // 10, 1))
+    full = await enumerate_zone(enumerator, zone, args.words)
+    expected = sum(1 for word in words(args.words) if server.name_exists(f"{word}.{zone}"))
+
+    filtered_before = enumerator.stats['wildcard_filtered']
+    wildcard = await enumerate_zone(enumerator, wildcard_zone, args.wildcard_words)
+    return {
+        "small": small,
+        "full": {**full, "expected": expected},
+        "wildcard": {**wildcard, "filtered": enumerator.stats['wildcard_filtered'] - filtered_before},
+        "server_queries": server.queries,
+        "enumerator_stats": enumerator.get_stats()
+    }
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس أداء تعداد النطاقات الفرعية")
+    parser.add_argument("--words", type=int, default=100000)
+    parser.add_argument("--wildcard-words", type=int, default=10000)
+    parser.add_argument("--ratio", type=float, default=0.05, help="نسبة الأسماء الموجودة")
+    parser.add_argument("--concurrency", type=int, default=64, help="حد التزامن الابتدائي")
+    parser.add_argument("--max-concurrency", type=int, default=1024)
+    args = parser.parse_args()
+
+    with StubDNSServer(subdomain_ratio=args.ratio) as server:
+        print(json.dumps(asyncio.run(run(server, args)), indent=2))
+
+if __name__ == "__main__":
+    main()
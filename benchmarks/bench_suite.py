@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+حزمة القياس دون اتصال
+Offline Benchmark Suite
+
+تشغّل مراحل المسح الأساسية على خوادم DNS وWHOIS محلية ونماذج حتمية
+وبيانات اصطناعية بحجم قابل للضبط، وتكتب النتائج بصيغة JSON لمقارنتها
+بين التشغيلات:
+    python -m benchmarks.bench_suite --targets 500 --tasks 20000 --docs 500 --output bench.json
+    python -m benchmarks.bench_suite --scenarios scan nlp
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List
+
+from benchmarks.corpora import posts, raw_contacts
+from benchmarks.offline import OfflineBackends
+
+SCENARIOS = ("scan", "parallel", "nlp", "api")
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """قيمة مئينية من عينة"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+async def bounded(calls: List[Callable[[], Awaitable[Any]]], concurrency: int) -> List[float]:
+    """تنفيذ استدعاءات بحد تزامن وإرجاع زمن كل منها"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def run(call):
+        async with semaphore:
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(run(call) for call in calls))
+    return latencies
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    """ملخص الأزمنة بالمللي ثانية"""
+    return {
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000
+    }
+
+async def bench_scan(backends: OfflineBackends, count: int) -> Dict[str, Any]:
+    """comprehensive_scan على أهداف المنطقة المحلية"""
+    engine = backends.engine()
+    targets = backends.targets(count)
+    dns_queries = backends.dns.queries
+
+    start = time.perf_counter()
+    results = await engine.comprehensive_scan(targets, resume=False)
+    elapsed = time.perf_counter() - start
+
+    phase_metrics = results.get('metrics', {}).get('phase', {})
+    return {
+        "targets": count,
+        "elapsed_s": elapsed,
+        "targets_per_s": count / elapsed,
+        "phases": list(results.get('phases', {})),
+        "errors": results.get('errors', {}),
+        "techniques": engine.recon_techniques,
+        "phase_seconds": {name: entry['total_seconds'] for name, entry in phase_metrics.items()},
+        "dns_queries": backends.dns.queries - dns_queries
+    }
+
+async def contact_task(kind: str, value: str) -> Dict[str, Any]:
+    """مهمة I/O اصطناعية تعيد جهة اتصال"""
+    await asyncio.sleep(0)
+    return {'source': 'bench', f"{kind}s": [value]}
+
+async def bench_parallel(count: int) -> Dict[str, Any]:
+    """QuantumParallelProcessor.parallel_execution على مهام جهات اتصال"""
+    from core.quantum_parallel_processor import QuantumParallelProcessor
+    processor = QuantumParallelProcessor()
+    tasks = [contact_task(kind, value) for kind, value in raw_contacts(count, max(count // 4, 1))]
+
+    start = time.perf_counter()
+    await processor.parallel_execution(tasks)
+    elapsed = time.perf_counter() - start
+    return {"tasks": count, "elapsed_s": elapsed, "tasks_per_s": count / elapsed}
+
+async def bench_nlp(backends: OfflineBackends, count: int, concurrency: int) -> Dict[str, Any]:
+    """analyze_text_patterns بالنماذج الحتمية: تمريرة باردة ثم دافئة من الذاكرة المؤقتة"""
+    from ai.advanced_pattern_recognizer import AdvancedPatternRecognizer
+    from core.result_cache import TwoTierCache
+    recognizer = AdvancedPatternRecognizer(cache=TwoTierCache(
+        path=os.path.join(backends.directory.name, 'nlp_bench.db'),
+        namespace="bench"
+    ))
+    documents = list(posts(count))
+    report: Dict[str, Any] = {"docs": count, "concurrency": concurrency}
+    try:
+        for run in ("cold", "warm"):
+            start = time.perf_counter()
+            latencies = await bounded(
+                [lambda text=text: recognizer.analyze_text_patterns(text) for text in documents],
+                concurrency
+            )
+            elapsed = time.perf_counter() - start
+            report[run] = {"elapsed_s": elapsed, "docs_per_s": count / elapsed, **latency_summary(latencies)}
+        report["cache"] = recognizer.get_cache_stats()
+        report["sentiment_queue"] = recognizer.sentiment_queue.get_stats()
+        report["ner_queue"] = recognizer.ner_queue.get_stats()
+    finally:
+        recognizer.sentiment_queue.close()
+        recognizer.ner_queue.close()
+    return report
+
+async def bench_api(backends: OfflineBackends, investigations: int, targets_per_investigation: int,
+                    concurrency: int) -> Dict[str, Any]:
+    """واجهة الويب عبر HTTP: إنشاء التحقيقات وانتظار اكتمالها وقراءة نتائجها"""
+    import aiohttp
+    import uvicorn
+    # الاستيراد بعد توجيه الإعدادات حتى يُفتح المخزن في المجلد المؤقت
+    from web.backend import app as app_module
+    app_module.job_engine.engine_factory = backends.engine
+
+    server = uvicorn.Server(uvicorn.Config(
+        app_module.app, host="127.0.0.1", port=0, log_level="warning", lifespan="on"
+    ))
+    serving = asyncio.ensure_future(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+
+    targets = backends.targets(investigations * targets_per_investigation)
+    batches = [
+        targets[offset:offset + targets_per_investigation]
+        for offset in range(0, len(targets), targets_per_investigation)
+    ]
+    investigation_ids: List[str] = []
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            async def create(batch):
+                async with session.post(f"{base_url}/investigations", json={'targets': batch}) as response:
+                    investigation_ids.append((await response.json())['investigation_id'])
+
+            start = time.perf_counter()
+            create_latencies = await bounded([lambda batch=batch: create(batch) for batch in batches], concurrency)
+
+            # انتظار انتهاء جميع التحقيقات
+            statuses: Dict[str, str] = {}
+
+            async def poll(investigation_id):
+                async with session.get(f"{base_url}/investigations/{investigation_id}") as response:
+                    statuses[investigation_id] = (await response.json())['status']
+
+            pending = list(investigation_ids)
+            while pending:
+                await bounded([lambda investigation_id=investigation_id: poll(investigation_id)
+                               for investigation_id in pending], concurrency)
+                pending = [
+                    investigation_id for investigation_id in pending
+                    if statuses[investigation_id] not in ('completed', 'failed')
+                ]
+                if pending:
+                    await asyncio.sleep(0.05)
+            completion = time.perf_counter() - start
+
+            result_lines = Counter()
+
+            async def results(investigation_id):
+                async with session.get(f"{base_url}/investigations/{investigation_id}/results") as response:
+                    async for _ in response.content:
+                        result_lines[investigation_id] += 1
+
+            results_latencies = await bounded(
+                [lambda investigation_id=investigation_id: results(investigation_id)
+                 for investigation_id in investigation_ids],
+                concurrency
+            )
+
+            async def list_latest():
+                async with session.get(f"{base_url}/investigations", params={'limit': 50}) as response:
+                    await response.read()
+
+            list_latencies = await bounded([list_latest] * 50, 1)
+    finally:
+        server.should_exit = True
+        await serving
+
+    return {
+        "investigations": investigations,
+        "targets_per_investigation": targets_per_investigation,
+        "create": latency_summary(create_latencies),
+        "completion_s": completion,
+        "investigations_per_s": investigations / completion,
+        "statuses": dict(Counter(statuses.values())),
+        "results": {**latency_summary(results_latencies), "lines": sum(result_lines.values())},
+        "list_latest_50": latency_summary(list_latencies)
+    }
+
+async def run(args) -> Dict[str, Any]:
+    """تنفيذ السيناريوهات المختارة"""
+    report: Dict[str, Any] = {}
+    with OfflineBackends(whois_delay=args.whois_delay_ms / 1000) as backends:
+        for scenario in args.scenarios:
+            start = time.perf_counter()
+            try:
+                if scenario == "scan":
+                    report[scenario] = await bench_scan(backends, args.targets)
+                elif scenario == "parallel":
+                    report[scenario] = await bench_parallel(args.tasks)
+                elif scenario == "nlp":
+                    report[scenario] = await bench_nlp(backends, args.docs, args.concurrency)
+                elif scenario == "api":
+                    report[scenario] = await bench_api(
+                        backends, args.investigations, args.targets_per_investigation, args.concurrency
+                    )
+            except Exception as e:
+                # سيناريو فاشل (اعتمادية غير مثبتة مثلاً) لا يوقف البقية
+                report[scenario] = {"error": f"{type(e).__name__}: {e}"}
+            report[scenario]["wall_s"] = time.perf_counter() - start
+    return report
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="حزمة القياس دون اتصال")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--targets", type=int, default=500)
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--investigations", type=int, default=50)
+    parser.add_argument("--targets-per-investigation", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--whois-delay-ms", type=float, default=0.0,
+                        help="زمن استجابة مصطنع لخادم WHOIS المحلي")
+    parser.add_argument("--output", help="ملف JSON لحفظ النتائج")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "environment": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "config": vars(args),
+        "scenarios": asyncio.run(run(args))
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+قياس أداء عميل WHOIS
+WHOIS Client Benchmark
+
+يقارن الاستعلام المتسلسل القديم (إحالة ثم سجل لكل نطاق، دون ذاكرة مؤقتة)
+بالعميل غير المتزامن على خادم WHOIS محلي: بارد، ثم دافئ من الذاكرة،
+ثم دافئ من القرص بعميل جديد:
+    python -m benchmarks.bench_whois --domains 10000 --delay-ms 2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import time
+
+from benchmarks.stub_whois import StubWhoisServer
+from core.async_whois import AsyncWhoisClient, parse_whois
+from core.result_cache import TwoTierCache
+
+TLDS = ["test", "example", "invalid", "bench"]
+
+def domain_names(count: int, nx_ratio: float = 0.05):
+    """نطاقات موزعة على عدة نطاقات عليا (نسبة منها غير مسجلة)"""
+    nx_every = int(1 / nx_ratio) if nx_ratio > 0 else 0
+    return [
+        f"{'nx' if nx_every and i % nx_every == 0 else 'site'}{i}.{TLDS[i % len(TLDS)]}"
+        for i in range(count)
+    ]
+
+def blocking_query(port: int, text: str) -> str:
+    """استعلام WHOIS حاجب عبر socket"""
+    with socket.create_connection(("127.0.0.1", port)) as connection:
+        connection.sendall(f"{text}\r\n".encode())
+        chunks = []
+        while True:
+            chunk = connection.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return b''.join(chunks).decode('utf-8', 'replace')
+
+def blocking_baseline(domains, port: int) -> float:
+    """الطريقة القديمة: إحالة ثم سجل لكل نطاق على التوالي"""
+    start = time.perf_counter()
+    for domain in domains:
+        blocking_query(port, domain.rsplit('.', 1)[1])
+        parse_whois(blocking_query(port, domain))
+    return time.perf_counter() - start
+
+def client(server: StubWhoisServer, cache_path: str, concurrency: int) -> AsyncWhoisClient:
+    """عميل موجه إلى الخادم المحلي بذاكرة مؤقتة في ملف القياس"""
+    return AsyncWhoisClient(
+        root_server=server.host,
+        port=server.port,
+        concurrency_per_server=concurrency,
+        cache=TwoTierCache(path=cache_path, namespace="whois", max_memory_entries=100000, ttl=3600),
+        referral_cache=TwoTierCache(path=cache_path, namespace="whois_referrals", ttl=3600)
+    )
+
+async def timed_lookups(whois: AsyncWhoisClient, domains):
+    start = time.perf_counter()
+    results = await whois.lookup_many(domains)
+    return time.perf_counter() - start, results
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس أداء عميل WHOIS")
+    parser.add_argument("--domains", type=int, default=10000)
+    parser.add_argument("--baseline-domains", type=int, default=500,
+                        help="عدد النطاقات للطريقة المتسلسلة (تُستقرأ للعدد الكامل)")
+    parser.add_argument("--concurrency", type=int, default=8, help="حد الاتصالات لكل خادم")
+    parser.add_argument("--delay-ms", type=float, default=2.0, help="زمن استجابة الخادم المحلي")
+    args = parser.parse_args()
+
+    domains = domain_names(args.domains)
+    with StubWhoisServer(delay=args.delay_ms / 1000) as server, \
+            tempfile.TemporaryDirectory() as directory:
+        baseline_sample = domains[:args.baseline_domains]
+        baseline = blocking_baseline(baseline_sample, server.port) * args.domains / len(baseline_sample)
+
+        server.referrals = server.queries = server.max_connections = 0
+        cache_path = os.path.join(directory, "whois.db")
+        whois = client(server, cache_path, args.concurrency)
+        cold, results = asyncio.run(timed_lookups(whois, domains))
+        warm, _ = asyncio.run(timed_lookups(whois, domains))
+        stats = whois.get_stats()
+
+        # عميل جديد على نفس الملف (إعادة تشغيل العملية)
+        disk, _ = asyncio.run(timed_lookups(client(server, cache_path, args.concurrency), domains))
+
+        print(json.dumps({
+            "domains": args.domains,
+            "server_delay_ms": args.delay_ms,
+            "baseline_estimated_s": baseline,
+            "cold_s": cold,
+            "warm_memory_s": warm,
+            "warm_disk_s": disk,
+            "cold_domains_per_s": args.domains / cold,
+            "speedup_cold": baseline / cold,
+            "registered": sum(1 for record in results.values() if record.get('registered')),
+            "errors": sum(1 for record in results.values() if 'error' in record),
+            "server_referrals": server.referrals,
+            "server_queries": server.queries,
+            "server_max_connections": server.max_connections,
+            "client_stats": stats
+        }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+مجموعات بيانات اصطناعية للاختبار
+Synthetic Benchmark Corpora
+
+أهداف ونصوص منشورات وجهات اتصال خام حتمية (نفس البذرة تعطي نفس
+البيانات في كل تشغيل) تُولد عند الطلب دون تخزينها.
+"""
+
+import random
+from typing import Iterator, List, Tuple
+
+FIRST_NAMES = ["Omar", "Layla", "Karim", "Nadia", "Samir", "Huda", "Yusuf", "Rania", "Tariq", "Mona"]
+ORGANIZATIONS = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Vandelay", "Stark", "Wayne"]
+LOCATIONS = ["Cairo", "Amman", "Dubai", "Beirut", "Riyadh", "Tunis", "Doha", "Muscat"]
+TEMPLATES = [
+    "Great meeting with {name} at {org} in {location} today!",
+    "I am so tired of {org} software breaking every week, worst support ever.",
+    "Visiting family in {location} for the holidays, feeling grateful. #family",
+    "{name} announced new programming courses at {org} for next year.",
+    "Contact {name} at {email} or {phone} about the {org} project.",
+    "Just started a new job at {org} in {location} @{handle} https://{domain}/jobs",
+    "Never again. {org} lost my order and {name} did not answer {email}.",
+    "Excited to see {name} speaking in {location}. #tech #{org}"
+]
+
+def targets(count: int, zone: str = "bench.test", nx_ratio: float = 0.1) -> List[str]:
+    """أسماء أهداف داخل منطقة الاختبار (نسبة منها غير موجودة)"""
+    nx_every = int(1 / nx_ratio) if nx_ratio > 0 else 0
+    return [
+        f"nx{i}.{zone}" if nx_every and i % nx_every == nx_every - 1 else f"target{i}.{zone}"
+        for i in range(count)
+    ]
+
+def posts(count: int, seed: int = 7, min_sentences: int = 1, max_sentences: int = 8) -> Iterator[str]:
+    """نصوص منشورات بأسماء ومؤسسات وأماكن وجهات اتصال (كل نص فريد)"""
+    rng = random.Random(seed)
+    for i in range(count):
+        sentences = []
+        for _ in range(rng.randint(min_sentences, max_sentences)):
+            name = rng.choice(FIRST_NAMES)
+            org = rng.choice(ORGANIZATIONS)
+            sentences.append(rng.choice(TEMPLATES).format(
+                name=name,
+                org=org,
+                location=rng.choice(LOCATIONS),
+                email=f"{name.lower()}{rng.randint(1, 500)}@{org.lower()}.example",
+                phone=f"+1-202-555-{rng.randint(0, 9999):04d}",
+                handle=f"{name.lower()}_{rng.randint(1, 99)}",
+                domain=f"{org.lower()}.example"
+            ))
+        sentences.append(f"(post {i})")
+        yield " ".join(sentences)
+
+def raw_contacts(count: int, unique: int) -> Iterator[Tuple[str, str]]:
+    """جهات اتصال خام: كل كيان يظهر بعدة صيغ"""
+    for i in range(count):
+        entity = (i * 2654435761) % unique
+        variant = i % 4
+        if entity % 3 == 0:
+            number = f"{2000000000 + entity:010d}"
+            yield 'phone', (
+                f"+1 {number[:3]}-{number[3:6]}-{number[6:]}", number,
+                f"({number[:3]}) {number[3:6]} {number[6:]}", f"001{number}"
+            )[variant]
+        elif entity % 3 == 1:
+            yield 'email', (
+                f"user{entity}@example.com", f"User{entity}@Example.COM",
+                f"user{entity}+news@example.com", f" user{entity}@example.com. "
+            )[variant]
+        else:
+            yield 'domain', (
+                f"host{entity}.bücher.de", f"HOST{entity}.BÜCHER.DE.",
+                f"host{entity}.xn--bcher-kva.de", f"host{entity}.xn--bcher-kva.de."
+            )[variant]
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+بيئة اختبار دون اتصال
+Offline Benchmark Environment
+
+تشغّل خادمي DNS وWHOIS المحليين، وتستبدل نماذج النصوص بالنماذج الحتمية،
+وتوجه مسارات التخزين (قاعدة البيانات، نقاط الاستئناف، الذاكرة المؤقتة)
+إلى مجلد مؤقت، ثم تعيد كل شيء كما كان عند الخروج:
+
+    with OfflineBackends() as backends:
+        engine = backends.engine()
+        await engine.comprehensive_scan(targets, resume=False)
+"""
+
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from benchmarks.corpora import targets
+from benchmarks.stub_dns import StubDNSServer
+from benchmarks.stub_models import STUB_MODELS, install_stub_models
+from benchmarks.stub_whois import StubWhoisServer
+from config.settings import Settings
+from core.async_dns import AsyncDNSResolver, BulkResolver
+from core.async_whois import AsyncWhoisClient
+from core.model_registry import model_registry
+from core.subdomain_enumerator import SubdomainEnumerator
+
+class OfflineBackends:
+    """خوادم محلية وإعدادات مؤقتة لتشغيل مراحل المسح دون شبكة أو نماذج كبيرة"""
+    def __init__(self, zone: str = "bench.test", whois_delay: float = 0.0, subdomain_ratio: float = 0.1):
+        self.zone = zone
+        self.dns = StubDNSServer(zone=zone, subdomain_ratio=subdomain_ratio)
+        self.whois = StubWhoisServer(delay=whois_delay)
+        self.directory: Optional[tempfile.TemporaryDirectory] = None
+        self.saved_settings: Dict[str, Any] = {}
+        self.saved_models: Dict[str, Any] = {}
+
+    def settings_overrides(self, path: str) -> Dict[str, Any]:
+        """إعدادات تشير إلى المجلد المؤقت والخوادم المحلية"""
+        return {
+            'CACHE_DIR': path,
+            'DATABASE_URL': f"sqlite:///{os.path.join(path, 'osint.db')}",
+            'NLP_CACHE_PATH': os.path.join(path, 'nlp_cache.db'),
+            'CHECKPOINT_PATH': os.path.join(path, 'checkpoints.db'),
+            'WHOIS_CACHE_PATH': os.path.join(path, 'whois_cache.db'),
+            'RESULTS_SPILL_DIR': os.path.join(path, 'spill'),
+            'PROFILE_DIR': os.path.join(path, 'profiles'),
+            'DNS_NAMESERVERS': [self.dns.host]
+        }
+
+    def __enter__(self) -> 'OfflineBackends':
+        self.dns.start()
+        self.whois.start()
+        self.directory = tempfile.TemporaryDirectory(prefix="osint_bench_")
+        for name, value in self.settings_overrides(self.directory.name).items():
+            self.saved_settings[name] = getattr(Settings, name)
+            setattr(Settings, name, value)
+        for name in STUB_MODELS:
+            self.saved_models[name] = (model_registry.factories.get(name), model_registry.versions.get(name))
+        install_stub_models(model_registry)
+        return self
+
+    def __exit__(self, *exc):
+        for name, (factory, version) in self.saved_models.items():
+            if factory is not None:
+                model_registry.register(name, factory, version)
+        for name, value in self.saved_settings.items():
+            setattr(Settings, name, value)
+        self.whois.stop()
+        self.dns.stop()
+        self.directory.cleanup()
+
+    def resolver(self, **kwargs) -> AsyncDNSResolver:
+        """محلل DNS موجه إلى الخادم المحلي"""
+        return AsyncDNSResolver(nameservers=[self.dns.host], port=self.dns.port, **kwargs)
+
+    def whois_client(self, **kwargs) -> AsyncWhoisClient:
+        """عميل WHOIS موجه إلى الخادم المحلي (الجذر والنطاقات العليا معاً)"""
+        return AsyncWhoisClient(root_server=self.whois.host, port=self.whois.port, **kwargs)
+
+    def subdomain_enumerator(self, **kwargs) -> SubdomainEnumerator:
+        """معدد نطاقات فرعية موجه إلى الخادم المحلي"""
+        return SubdomainEnumerator(resolver=BulkResolver(nameservers=[self.dns.host], port=self.dns.port), **kwargs)
+
+    def engine(self):
+        """محرك مسح موجه إلى الخوادم المحلية"""
+        from core.advanced_engine import QuantumOSINTEngine
+        engine = QuantumOSINTEngine(warm_up_models=False)
+        engine.dns_resolver = self.resolver()
+        engine.whois_client = self.whois_client()
+        engine.subdomain_enumerator = self.subdomain_enumerator()
+        return engine
+
+    def targets(self, count: int, nx_ratio: float = 0.1) -> List[str]:
+        """أهداف داخل منطقة الخادم المحلي"""
+        return targets(count, self.zone, nx_ratio)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+خادم DNS محلي للاختبار
+Local Stub DNS Server
+
+يجيب على أي اسم بعنوان حتمي مشتق منه، ويعيد NXDOMAIN
+للأسماء التي تبدأ بـ "nx"، إلا داخل المناطق ذات السجل الشامل.
+مع subdomain_ratio توجد نسبة حتمية فقط من الأسماء الأعمق من أبناء
+المنطقة المباشرين (لقياس تعداد النطاقات الفرعية).
+"""
+
+import asyncio
+import hashlib
+import threading
+from typing import Optional, Tuple
+
+import dns.message
+import dns.rcode
+import dns.rdataclass
+import dns.rdatatype
+import dns.rrset
+
+STUB_TTL = 300
+WILDCARD_ADDRESS = "203.0.113.7"
+
+def address_for(name: str) -> str:
+    """عنوان IPv4 حتمي لاسم"""
+    digest = hashlib.blake2b(name.encode(), digest_size=3).digest()
+    return f"10.{digest[0]}.{digest[1]}.{digest[2]}"
+
+class StubDNSProtocol(asyncio.DatagramProtocol):
+    """بروتوكول UDP لخادم DNS التجريبي"""
+    def __init__(self, server: "StubDNSServer"):
+        self.server = server
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]):
+        try:
+            query = dns.message.from_wire(data)
+        except Exception:
+            return
+        self.server.queries += 1
+        self.transport.sendto(self.server.build_response(query).to_wire(), addr)
+
+class StubDNSServer:
+    """خادم DNS محلي يعمل في خيط مستقل"""
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, zone: str = "bench.test",
+                 subdomain_ratio: Optional[float] = None):
+        self.host = host
+        self.port = port
+        self.zone = zone.rstrip(".")
+        self.subdomain_ratio = subdomain_ratio
+        self.queries = 0
+        self.wildcard_zones = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    def build_response(self, query):
+        """بناء الإجابة لاستعلام"""
+        response = dns.message.make_response(query)
+        question = query.question[0]
+        name = question.name.to_text(omit_final_dot=True).lower()
+        label = name.split(".", 1)[0]
+
+        if self.is_wildcard(name):
+            address = WILDCARD_ADDRESS
+        elif label.startswith("nx") or not self.name_exists(name):
+            response.set_rcode(dns.rcode.NXDOMAIN)
+            response.authority.append(self.soa_rrset())
+            return response
+        else:
+            address = address_for(name)
+
+        if question.rdtype == dns.rdatatype.A:
+            response.answer.append(dns.rrset.from_text(
+                question.name, STUB_TTL, dns.rdataclass.IN, dns.rdatatype.A, address
+            ))
+        elif question.rdtype == dns.rdatatype.MX:
+            response.answer.append(dns.rrset.from_text(
+                question.name, STUB_TTL, dns.rdataclass.IN, dns.rdatatype.MX,
+                f"10 mail.{self.zone}."
+            ))
+        else:
+            response.authority.append(self.soa_rrset())
+        return response
+
+    def name_exists(self, name: str) -> bool:
+        """وجود الاسم حسب subdomain_ratio (الأهداف المباشرة موجودة دائماً)"""
+        if self.subdomain_ratio is None or name.count(".") <= self.zone.count(".") + 1:
+            return True
+        digest = hashlib.blake2b(name.encode(), digest_size=2).digest()
+        return int.from_bytes(digest, "big") < self.subdomain_ratio * 65536
+
+    def is_wildcard(self, name: str) -> bool:
+        """هل الاسم داخل منطقة ذات سجل شامل"""
+        return any(name.endswith("." + zone) for zone in self.wildcard_zones)
+
+    def soa_rrset(self):
+        """سجل SOA للإجابات السلبية"""
+        return dns.rrset.from_text(
+            self.zone + ".", STUB_TTL, dns.rdataclass.IN, dns.rdatatype.SOA,
+            f"ns.{self.zone}. admin.{self.zone}. 1 3600 600 86400 60"
+        )
+
+    def start(self) -> "StubDNSServer":
+        """تشغيل الخادم في الخلفية"""
+        def run():
+            self._loop = asyncio.new_event_loop()
+            transport, _ = self._loop.run_until_complete(
+                self._loop.create_datagram_endpoint(
+                    lambda: StubDNSProtocol(self),
+                    local_addr=(self.host, self.port)
+                )
+            )
+            self.port = transport.get_extra_info("sockname")[1]
+            self._ready.set()
+            self._loop.run_forever()
+            transport.close()
+
+        self._thread = threading.Thread(target=run, name="stub-dns", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        """إيقاف الخادم"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
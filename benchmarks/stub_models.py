@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+نماذج حتمية صغيرة للاختبار
+Deterministic Stub Models
+
+بدائل لخطوط transformers بنفس واجهة الاستدعاء وصيغة المخرجات (نص أو
+قائمة نصوص)، تعتمد على قواعد بسيطة فتعطي نفس النتيجة دائماً دون تحميل
+نماذج أو اتصال بالشبكة. كلفتها تتناسب مع طول النص فقط.
+"""
+
+import hashlib
+import re
+from typing import Any, Dict, List, Union
+
+from core.model_registry import ModelRegistry, model_registry
+
+_TOKENS = re.compile(r"\S+")
+_EMAIL = re.compile(r"^[\w.+-]+@[\w-]+\.[\w.-]+$")
+_PHONE = re.compile(r"^\+?[\d()-]{7,}$")
+
+POSITIVE_WORDS = {"great", "love", "happy", "grateful", "excellent", "good", "amazing", "excited"}
+NEGATIVE_WORDS = {"worst", "hate", "tired", "angry", "bad", "broken", "never", "terrible"}
+ENTITY_GROUPS = ("PER", "ORG", "LOC")
+
+def stable_byte(word: str) -> int:
+    """قيمة حتمية بين 0 و255 مشتقة من الكلمة"""
+    return hashlib.blake2b(word.encode(), digest_size=1).digest()[0]
+
+class StubPipeline:
+    """أساس مشترك: نص واحد يعيد نتيجة واحدة وقائمة تعيد قائمة"""
+    task = ""
+
+    def __init__(self):
+        # دون مقسم رموز: مقسم النوافذ يستخدم المسافات
+        self.tokenizer = None
+
+    def __call__(self, inputs: Union[str, List[str]], **kwargs) -> Any:
+        if isinstance(inputs, str):
+            return self.predict(inputs)
+        return [self.predict(text) for text in inputs]
+
+    def predict(self, text: str) -> Any:
+        raise NotImplementedError
+
+class StubSentimentPipeline(StubPipeline):
+    """مشاعر بعدّ كلمات إيجابية وسلبية (تصنيفات cardiffnlp)"""
+    task = "sentiment-analysis"
+
+    def predict(self, text: str) -> Dict[str, Any]:
+        words = [word.strip(".,!?").lower() for word in text.split()]
+        positive = sum(word in POSITIVE_WORDS for word in words)
+        negative = sum(word in NEGATIVE_WORDS for word in words)
+        if positive == negative:
+            return {'label': 'neutral', 'score': 0.5}
+        label = 'positive' if positive > negative else 'negative'
+        return {'label': label, 'score': 0.5 + 0.5 * abs(positive - negative) / (positive + negative)}
+
+class StubNERPipeline(StubPipeline):
+    """كيانات بقواعد: الكلمات بحرف كبير وجهات الاتصال (aggregation_strategy=simple)"""
+    task = "ner"
+
+    def predict(self, text: str) -> List[Dict[str, Any]]:
+        entities = []
+        for match in _TOKENS.finditer(text):
+            word = match.group().strip(".,!?:;\"'()")
+            if not word:
+                continue
+            if _EMAIL.match(word) or _PHONE.match(word):
+                group = 'MISC'
+            elif word[0].isupper() and word[1:].islower():
+                group = ENTITY_GROUPS[stable_byte(word) % len(ENTITY_GROUPS)]
+            else:
+                continue
+            start = match.start() + match.group().index(word)
+            entities.append({
+                'entity_group': group,
+                'score': 0.6 + 0.4 * stable_byte(word) / 255,
+                'word': word,
+                'start': start,
+                'end': start + len(word)
+            })
+        return entities
+
+STUB_MODELS = {
+    "sentiment": StubSentimentPipeline,
+    "ner": StubNERPipeline
+}
+
+def install_stub_models(registry: ModelRegistry = model_registry):
+    """استبدال نماذج النصوص في السجل بالنماذج الحتمية"""
+    for name, pipeline_class in STUB_MODELS.items():
+        registry.register(name, pipeline_class, version=f"stub:{pipeline_class.task}:1")
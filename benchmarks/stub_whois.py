@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+خادم WHOIS محلي للاختبار
+Local Fake WHOIS Server
+
+يجيب على استعلامات النطاقات الأعلى (TLD) بإحالة إلى نفسه كما يفعل
+whois.iana.org، وعلى النطاقات بسجل حتمي مشتق من الاسم بصيغة السجلات
+الشائعة، ويعيد "No match" للأسماء التي تبدأ بـ "nx". يسجل أقصى عدد
+اتصالات متزامنة لقياس حدود التزامن لدى العميل.
+"""
+
+import asyncio
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+
+REGISTRARS = ["Bench Registrar One", "Bench Registrar Two", "Bench Registrar Three"]
+
+def whois_record(domain: str) -> str:
+    """سجل WHOIS حتمي لنطاق"""
+    digest = hashlib.blake2b(domain.encode(), digest_size=8).digest()
+    created = datetime(2000, 1, 1) + timedelta(days=int.from_bytes(digest[:2], 'big') % 8000)
+    expires = created + timedelta(days=365 * (1 + digest[2] % 10))
+    registrar = REGISTRARS[digest[3] % len(REGISTRARS)]
+    upper = domain.upper()
+    return (
+        f"   Domain Name: {upper}\r\n"
+        f"   Registry Domain ID: {digest.hex()}_DOMAIN_BENCH\r\n"
+        f"   Registrar: {registrar}\r\n"
+        f"   Creation Date: {created:%Y-%m-%dT%H:%M:%SZ}\r\n"
+        f"   Registry Expiry Date: {expires:%Y-%m-%dT%H:%M:%SZ}\r\n"
+        f"   Domain Status: clientTransferProhibited\r\n"
+        f"   Name Server: NS{digest[4] % 4 + 1}.{upper}\r\n"
+        f"   Name Server: NS{digest[5] % 4 + 5}.{upper}\r\n"
+        f"   DNSSEC: unsigned\r\n"
+        f">>> Last update of whois database: 2024-01-01T00:00:00Z <<<\r\n"
+    )
+
+class StubWhoisServer:
+    """خادم WHOIS (TCP) محلي يعمل في خيط مستقل"""
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay: float = 0.0):
+        self.host = host
+        self.port = port
+        # زمن استجابة مصطنع لكل استعلام (محاكاة زمن الشبكة)
+        self.delay = delay
+        self.queries = 0
+        self.referrals = 0
+        self.connections = 0
+        self.max_connections = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    def build_response(self, query: str) -> str:
+        """بناء الإجابة لاستعلام"""
+        query = query.strip().lower().rstrip(".")
+        if "." not in query:
+            self.referrals += 1
+            return (
+                f"% IANA WHOIS server\r\n\r\n"
+                f"refer:        {self.host}\r\n\r\n"
+                f"domain:       {query.upper()}\r\n"
+            )
+        self.queries += 1
+        if query.startswith("nx"):
+            return f'No match for "{query.upper()}".\r\n'
+        return whois_record(query)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """اتصال واحد: سطر استعلام ثم الإجابة وإغلاق الاتصال"""
+        self.connections += 1
+        self.max_connections = max(self.max_connections, self.connections)
+        try:
+            query = (await reader.readline()).decode("utf-8", "replace")
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            writer.write(self.build_response(query).encode("utf-8"))
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    def start(self) -> "StubWhoisServer":
+        """تشغيل الخادم في الخلفية"""
+        def run():
+            self._loop = asyncio.new_event_loop()
+            server = self._loop.run_until_complete(
+                asyncio.start_server(self.handle, self.host, self.port, backlog=1024)
+            )
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            self._loop.run_forever()
+            server.close()
+
+        self._thread = threading.Thread(target=run, name="stub-whois", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        """إيقاف الخادم"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
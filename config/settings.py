@@ -5,6 +5,7 @@ System Settings
 """
 
 import os
+import tempfile
 from typing import Dict, Any
 
 class Settings:
@@ -25,6 +26,89 @@ class Settings:
     # إعدادات API
     MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "50"))
     REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "30"))
+    # التحقيقات المتزامنة (عمال ينتظرون I/O غالباً؛ موزع واحد فقط يسحب من المخزن ويسلمهم المهام)
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "256"))
+    # اتصالات القراءة لمخزن التحقيقات (اتصال الكتابة منفصل)
+    STORE_READ_CONNECTIONS = int(os.getenv("STORE_READ_CONNECTIONS", "4"))
+    EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "256"))
+    EVENT_HEARTBEAT = float(os.getenv("EVENT_HEARTBEAT", "15"))
+    
+    # إعدادات المسح
+    SCAN_PHASES = [
+        'advanced_reconnaissance',
+        'deep_hidden_mining',
+        'cross_platform_correlation',
+        'behavioral_analysis'
+    ]
+    RECON_TECHNIQUES = [
+        'advanced_dns_recon',
+        'whois_analysis',
+        'subdomain_enumeration'
+    ]
+    
+    # إعدادات المعالجة المتوازية
+    PARALLEL_BACKEND = os.getenv("PARALLEL_BACKEND", "auto")  # auto / thread / process
+    PROCESS_WORKERS = int(os.getenv("PROCESS_WORKERS", str(os.cpu_count() or 1)))
+    PROCESS_CHUNK_SIZE = int(os.getenv("PROCESS_CHUNK_SIZE", "256"))
+    SCORE_BATCH_SIZE = int(os.getenv("SCORE_BATCH_SIZE", "512"))
+    SCORE_MAX_WAIT_MS = float(os.getenv("SCORE_MAX_WAIT_MS", "50"))
+    RESULTS_SPILL_DIR = os.getenv("RESULTS_SPILL_DIR", os.path.join(tempfile.gettempdir(), "quantum_osint"))
+    
+    # إعدادات DNS
+    DNS_CONCURRENCY = int(os.getenv("DNS_CONCURRENCY", "200"))
+    DNS_TIMEOUT = float(os.getenv("DNS_TIMEOUT", "5"))
+    DNS_NEGATIVE_TTL = int(os.getenv("DNS_NEGATIVE_TTL", "300"))
+    DNS_CACHE_SIZE = int(os.getenv("DNS_CACHE_SIZE", "100000"))
+    DNS_NAMESERVERS = [ns for ns in os.getenv("DNS_NAMESERVERS", "").split(",") if ns]
+    
+    # إعدادات تعداد النطاقات الفرعية
+    SUBDOMAIN_WORDLIST = os.getenv("SUBDOMAIN_WORDLIST", "")  # ملف كلمات (كلمة في كل سطر)، فارغ = القائمة المدمجة
+    SUBDOMAIN_INITIAL_CONCURRENCY = int(os.getenv("SUBDOMAIN_INITIAL_CONCURRENCY", "64"))
+    SUBDOMAIN_MAX_CONCURRENCY = int(os.getenv("SUBDOMAIN_MAX_CONCURRENCY", "1024"))
+    SUBDOMAIN_TIMEOUT = float(os.getenv("SUBDOMAIN_TIMEOUT", "2"))
+    SUBDOMAIN_RETRIES = int(os.getenv("SUBDOMAIN_RETRIES", "2"))
+    SUBDOMAIN_WILDCARD_PROBES = int(os.getenv("SUBDOMAIN_WILDCARD_PROBES", "3"))
+    
+    # إعدادات WHOIS
+    WHOIS_ROOT_SERVER = os.getenv("WHOIS_ROOT_SERVER", "whois.iana.org")  # مصدر إحالات النطاقات العليا
+    WHOIS_PORT = int(os.getenv("WHOIS_PORT", "43"))
+    WHOIS_CONCURRENCY_PER_SERVER = int(os.getenv("WHOIS_CONCURRENCY_PER_SERVER", "4"))
+    WHOIS_TIMEOUT = float(os.getenv("WHOIS_TIMEOUT", "10"))
+    WHOIS_CACHE_TTL = float(os.getenv("WHOIS_CACHE_TTL", str(24 * 3600)))  # نافذة صلاحية السجلات بالثواني
+    WHOIS_REFERRAL_TTL = float(os.getenv("WHOIS_REFERRAL_TTL", str(7 * 24 * 3600)))
+    WHOIS_CACHE_MEMORY_ENTRIES = int(os.getenv("WHOIS_CACHE_MEMORY_ENTRIES", "10000"))
+    
+    # إعدادات نماذج الذكاء الاصطناعي
+    MODEL_WARMUP = os.getenv("MODEL_WARMUP", "False").lower() == "true"
+    INFERENCE_BATCH_SIZE = int(os.getenv("INFERENCE_BATCH_SIZE", "32"))
+    INFERENCE_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", "10"))
+    CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "512"))
+    CHUNK_STRIDE = int(os.getenv("CHUNK_STRIDE", "128"))
+    
+    # إعدادات الذاكرة المؤقتة
+    CACHE_DIR = os.getenv("CACHE_DIR", "./cache")
+    NLP_CACHE_PATH = os.getenv("NLP_CACHE_PATH", os.path.join(CACHE_DIR, "nlp_cache.db"))
+    NLP_CACHE_MEMORY_ENTRIES = int(os.getenv("NLP_CACHE_MEMORY_ENTRIES", "10000"))
+    WHOIS_CACHE_PATH = os.getenv("WHOIS_CACHE_PATH", os.path.join(CACHE_DIR, "whois_cache.db"))
+    
+    # إعدادات الربط بين الأهداف
+    CORRELATION_MAX_FANOUT = int(os.getenv("CORRELATION_MAX_FANOUT", "100"))
+    PHONE_DEFAULT_COUNTRY_CODE = os.getenv("PHONE_DEFAULT_COUNTRY_CODE", "1")  # للأرقام المحلية دون رمز دولة
+    
+    GRAPH_NETWORKX_MAX_EDGES = int(os.getenv("GRAPH_NETWORKX_MAX_EDGES", "100000"))
+    GRAPH_BETWEENNESS_SAMPLES = int(os.getenv("GRAPH_BETWEENNESS_SAMPLES", "64"))
+    
+    # إعدادات نقاط الاستئناف
+    CHECKPOINTS_ENABLED = os.getenv("CHECKPOINTS_ENABLED", "True").lower() == "true"
+    CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", os.path.join(CACHE_DIR, "checkpoints.db"))
+    CHECKPOINT_TTL = float(os.getenv("CHECKPOINT_TTL", str(24 * 3600)))  # نافذة الصلاحية بالثواني
+    
+    # إعدادات محلل الأداء
+    PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(CACHE_DIR, "profiles"))
+    PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))  # نسبة التحقيقات المحللة تلقائياً
+    PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "10"))
+    PROFILE_TRACE_FRAMES = int(os.getenv("PROFILE_TRACE_FRAMES", "1"))  # عمق مكدس tracemalloc
+    PROFILE_TOP_ALLOCATIONS = int(os.getenv("PROFILE_TOP_ALLOCATIONS", "25"))
     
     # إعدادات المنصات
     PLATFORMS = {
@@ -6,26 +6,41 @@ Advanced Quantum OSINT Engine
 
 import asyncio
 import aiohttp
-import undetected_chromedriver as uc
-from selenium_stealth import stealth
-import torch
-import transformers
-from deepface import DeepFace
-import cv2
-import speech_recognition as sr
-from pyAudioAnalysis import audioAnalysis
+import contextvars
 import geocoder
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Awaitable, Callable, Iterator, Optional, Tuple
 import random
 import os
 from datetime import datetime
+from config.settings import Settings
+from core.model_registry import model_registry
+from core.async_dns import AsyncDNSResolver, DNS_RECORD_TYPES
+from core.async_whois import AsyncWhoisClient
+from core.checkpoints import ScanCheckpoints
+from core.correlation_index import CorrelationIndex, CorrelationLink
+from core.relationship_graph import RelationshipGraph
+from core.subdomain_enumerator import SubdomainEnumerator
+from core.event_bus import emit_scan_event, scan_event_sink
+from core.metrics import ScanMetrics, record_error, scan_metrics, timed, track
+from core.quantum_parallel_processor import QuantumParallelProcessor
+from core.scheduler import TaskScheduler
+
+# فهرس الربط الخاص بالمسح الجاري (كل تحقيق يربط أهدافه فقط ويُحرر فهرسه عند انتهائه)
+scan_correlator: contextvars.ContextVar[Optional['RealTimeDataCorrelator']] = \
+    contextvars.ContextVar('scan_correlator', default=None)
 
 class QuantumOSINTEngine:
-    def __init__(self):
+    # المراحل التي تعيد قاموساً لكل هدف وتحفظ نقطة استئناف لكل هدف فور اكتماله
+    RESUMABLE_PHASES = ('advanced_reconnaissance',)
+    # المراحل التي تعتمد على نتائج بقية المراحل فتُنفذ بعدها
+    DEPENDENT_PHASES = ('cross_platform_correlation',)
+    
+    def __init__(self, warm_up_models: Optional[bool] = None):
         self.logger = self.setup_logging()
+        self.recon_techniques = list(Settings.RECON_TECHNIQUES)
         self.setup_quantum_processing()
-        self.init_ai_models()
+        self.init_ai_models(Settings.MODEL_WARMUP if warm_up_models is None else warm_up_models)
         self.setup_ghost_networking()
         self.operation_start = datetime.now()
         
@@ -41,24 +56,49 @@ class QuantumOSINTEngine:
         """إعداد المعالجة الكمومية"""
         self.logger.info("🔄 تهيئة المعالجة الكمومية...")
         self.parallel_processor = QuantumParallelProcessor()
-        self.real_time_correlator = RealTimeDataCorrelator()
+        self.standalone_correlator: Optional[RealTimeDataCorrelator] = None
         self.data_fusion_engine = AdvancedDataFusionEngine()
+        self.dns_resolver = AsyncDNSResolver()
+        self.whois_client = AsyncWhoisClient()
+        self.subdomain_enumerator = SubdomainEnumerator()
+        self.scheduler = TaskScheduler()
+        self.checkpoints = ScanCheckpoints() if Settings.CHECKPOINTS_ENABLED else None
         
-    def init_ai_models(self):
+    def init_ai_models(self, warm_up: bool = False):
         """تهيئة نماذج الذكاء الاصطناعي"""
-        self.logger.info("🧠 تحميل نماذج الذكاء الاصطناعي...")
-        try:
-            self.nlp_analyzer = transformers.pipeline(
-                "text-classification", 
-                model="microsoft/DialogRPT-updown"
+        # النماذج تُبنى عند أول استخدام من السجل المشترك
+        self.model_registry = model_registry
+        if warm_up:
+            self.logger.info("🧠 تسخين نماذج الذكاء الاصطناعي في الخلفية...")
+            self.model_registry.warm_up(
+                ["dialog_rpt", "beit_large", "voice_recognizer"],
+                background=True
             )
-            self.image_analyzer = transformers.pipeline(
-                "image-classification",
-                model="microsoft/beit-large-patch16-224"
-            )
-            self.voice_analyzer = sr.Recognizer()
-        except Exception as e:
-            self.logger.error(f"فشل تحميل نماذج الذكاء الاصطناعي: {e}")
+    
+    @property
+    def real_time_correlator(self) -> 'RealTimeDataCorrelator':
+        """رابط المسح الجاري، أو رابط مشترك عند استدعاء المراحل خارج comprehensive_scan"""
+        correlator = scan_correlator.get()
+        if correlator is None:
+            if self.standalone_correlator is None:
+                self.standalone_correlator = RealTimeDataCorrelator()
+            correlator = self.standalone_correlator
+        return correlator
+    
+    @property
+    def nlp_analyzer(self):
+        """محلل النصوص (يُحمّل عند الطلب)"""
+        return self.model_registry.get("dialog_rpt")
+    
+    @property
+    def image_analyzer(self):
+        """محلل الصور (يُحمّل عند الطلب)"""
+        return self.model_registry.get("beit_large")
+    
+    @property
+    def voice_analyzer(self):
+        """محلل الصوت (يُحمّل عند الطلب)"""
+        return self.model_registry.get("voice_recognizer")
     
     def setup_ghost_networking(self):
         """إعداد شبكة الأشباح"""
@@ -67,75 +107,275 @@ class QuantumOSINTEngine:
         self.ip_rotator = AdvancedIPRotator()
         self.browser_fingerprint_spoofer = FingerprintSpoofer()
     
-    async def comprehensive_scan(self, targets: List[str]) -> Dict[str, Any]:
-        """مسح شامل متقدم"""
+    async def comprehensive_scan(self, targets: List[str], phases: Optional[List[str]] = None,
+                                 progress_callback: Optional[Callable[[str, int, int], Awaitable[None]]] = None,
+                                 event_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                                 resume: bool = True) -> Dict[str, Any]:
+        """مسح شامل متقدم (يستأنف من نقاط الاستئناف الصالحة عند resume)"""
         self.logger.info(f"🎯 بدء المسح الشامل لـ {len(targets)} هدف")
         
         scan_results = {}
         
+        # أحداث هذا المسح وأزمنته وروابطه تصل من جميع المهام الفرعية
+        sink_token = scan_event_sink.set(event_callback)
+        recorder = ScanMetrics()
+        metrics_token = scan_metrics.set(recorder)
+        correlator_token = scan_correlator.set(RealTimeDataCorrelator())
+        
         try:
-            # مراحل المسح المتوازية
-            scan_phases = [
-                self.phase_advanced_reconnaissance,
-                self.phase_deep_hidden_mining,
-                self.phase_cross_platform_correlation,
-                self.phase_behavioral_analysis
-            ]
-            
-            # تنفيذ متوازي لجميع المراحل
-            tasks = [phase(targets) for phase in scan_phases]
-            phase_results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # دمج النتائج
-            scan_results = self.data_fusion_engine.fuse_results(phase_results)
-            
-            self.logger.info("✅ اكتمل المسح الشامل بنجاح")
+            with track('scan', 'comprehensive_scan'):
+                # مراحل المسح المتوازية
+                scan_phases = []
+                for phase in (phases or Settings.SCAN_PHASES):
+                    phase_method = getattr(self, f"phase_{phase}", None)
+                    if phase_method is None:
+                        self.logger.warning(f"مرحلة غير متوفرة: {phase}")
+                        continue
+                    scan_phases.append((phase, phase_method))
+                
+                completed_phases = 0
+                
+                async def run_phase(name, phase_method):
+                    nonlocal completed_phases
+                    emit_scan_event('phase_started', phase=name)
+                    try:
+                        resumed = await self.load_checkpoints(name, targets) if resume else {}
+                        remaining = [target for target in targets if target not in resumed]
+                        with track('phase', name):
+                            result = await phase_method(remaining) if remaining else {}
+                        if resumed:
+                            result = {**resumed, **result}
+                        emit_scan_event('phase_finished', phase=name, status='completed', resumed=len(resumed))
+                        return result
+                    except Exception as e:
+                        emit_scan_event('phase_finished', phase=name, status='failed', error=str(e))
+                        raise
+                    finally:
+                        completed_phases += 1
+                        if progress_callback is not None:
+                            await progress_callback(name, completed_phases, len(scan_phases))
+                
+                # تنفيذ متوازي للمراحل المستقلة ثم المراحل المعتمدة عليها
+                scan_phases.sort(key=lambda phase: phase[0] in self.DEPENDENT_PHASES)
+                independent = [phase for phase in scan_phases if phase[0] not in self.DEPENDENT_PHASES]
+                dependent = scan_phases[len(independent):]
+                
+                phase_results = await asyncio.gather(
+                    *(run_phase(name, phase_method) for name, phase_method in independent),
+                    return_exceptions=True
+                )
+                if dependent:
+                    phase_results += await asyncio.gather(
+                        *(run_phase(name, phase_method) for name, phase_method in dependent),
+                        return_exceptions=True
+                    )
+                
+                # دمج النتائج
+                scan_results = self.data_fusion_engine.fuse_results(
+                    phase_results, [name for name, _ in scan_phases]
+                )
+                if 'cross_platform_correlation' in scan_results['phases']:
+                    scan_results['network_analysis'] = await self.analyze_network(targets)
+                
+                self.logger.info("✅ اكتمل المسح الشامل بنجاح")
             
         except Exception as e:
             self.logger.error(f"❌ فشل المسح الشامل: {e}")
+            # النتائج الجزئية تُعاد، والمستدعي يميز المسح المنهار بهذا المفتاح
+            scan_results['fatal_error'] = f"{type(e).__name__}: {e}"
             
+        finally:
+            scan_event_sink.reset(sink_token)
+            scan_metrics.reset(metrics_token)
+            scan_correlator.reset(correlator_token)
+        
+        scan_results['metrics'] = recorder.summary()
         return scan_results
     
+    async def load_checkpoints(self, phase: str, targets: List[str]) -> Dict[str, Any]:
+        """نتائج الأهداف المكتملة سابقاً في هذه المرحلة بتقنيات المسح الحالية"""
+        if self.checkpoints is None or phase not in self.RESUMABLE_PHASES:
+            return {}
+        try:
+            resumed = await self.checkpoints.aload(phase, targets, self.recon_techniques)
+        except Exception as e:
+            self.logger.warning(f"قراءة نقاط الاستئناف فشلت: {e}")
+            return {}
+        
+        if resumed:
+            self.logger.info(f"♻️ استئناف {phase}: تخطي {len(resumed)} من {len(targets)} هدف")
+        for target, result in resumed.items():
+            self.real_time_correlator.correlate(target, result)
+            emit_scan_event('target_completed', phase=phase, target=target, result=result, resumed=True)
+        return resumed
+    
+    async def save_checkpoint(self, phase: str, target: str, result: Any, techniques: List[str]):
+        """حفظ نقطة استئناف لهدف واحد بالتقنيات التي أنتجت النتيجة"""
+        if self.checkpoints is None:
+            return
+        try:
+            await self.checkpoints.asave(phase, target, result, techniques)
+        except Exception as e:
+            self.logger.warning(f"حفظ نقطة الاستئناف فشل: {e}")
+    
     async def phase_advanced_reconnaissance(self, targets: List[str]) -> Dict[str, Any]:
         """مرحلة الاستطلاع المتقدم"""
         recon_data = {}
+        # قائمة التقنيات عند بدء المرحلة (النتائج ونقاط الاستئناف تتبعها حتى لو تغيرت أثناء المسح)
+        techniques = list(self.recon_techniques)
         
-        for target in targets:
+        # تقنيات استطلاع متعددة (التقنية غير المنفذة تفشل وحدها لكل هدف دون إسقاط المرحلة)
+        recon_techniques = []
+        for technique in techniques:
+            method = getattr(self, technique, None)
+            if method is None:
+                self.logger.warning(f"تقنية استطلاع غير متوفرة: {technique}")
+                method = self.missing_technique(technique)
+            recon_techniques.append(timed('technique', technique)(method))
+        
+        # كل هدف يحل سجلات DNS داخل مهمته (دون حل مسبق يؤخر أول نتيجة)، والاستعلامات المتطابقة تُدمج في المحلل
+        async def recon_target(target: str) -> Dict[str, Any]:
             self.logger.info(f"🔍 استطلاع متقدم للهدف: {target}")
-            
-            # تقنيات استطلاع متعددة
-            recon_techniques = [
-                self.advanced_dns_recon,
-                self.whois_analysis,
-                self.subdomain_enumeration,
-                self.port_scanning_light
-            ]
-            
-            tasks = [tech(target) for tech in recon_techniques]
-            technique_results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            recon_data[target] = self.correlate_recon_data(technique_results)
+            technique_results = await self.scheduler.run_all(recon_techniques, target)
+            return self.correlate_recon_data(technique_results, techniques)
+        
+        # الأهداف تُنفذ بالتوازي وتُجمع نتائجها فور اكتمالها
+        async for target, result in self.scheduler.as_completed(targets, recon_target):
+            # المهمة الملغاة تعود CancelledError (ليست Exception) وهي خطأ لا نتيجة
+            if isinstance(result, BaseException):
+                recon_data[target] = {'error': str(result) or type(result).__name__}
+            else:
+                recon_data[target] = result
+            await self.save_checkpoint('advanced_reconnaissance', target, recon_data[target], techniques)
+            self.real_time_correlator.correlate(target, recon_data[target])
+            emit_scan_event(
+                'target_completed',
+                phase='advanced_reconnaissance',
+                target=target,
+                result=recon_data[target]
+            )
         
         return recon_data
     
+    async def phase_cross_platform_correlation(self, targets: List[str]) -> Dict[str, Any]:
+        """مرحلة الربط بين المنصات: الأهداف المرتبطة بكل هدف عبر الكيانات المشتركة"""
+        return self.real_time_correlator.related(targets)
+    
+    async def analyze_network(self, targets: List[str]) -> Dict[str, Any]:
+        """تحليل شبكة العلاقات حول الأهداف (في خيط منفصل لأنه كثيف المعالجة)"""
+        try:
+            with track('analysis', 'network_analysis'):
+                graph = self.real_time_correlator.network_graph(targets)
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(None, graph.analyze)
+        except Exception as e:
+            self.logger.warning(f"تحليل الشبكة فشل: {e}")
+            return {'error': str(e)}
+    
+    @staticmethod
+    def missing_technique(technique: str) -> Callable[[str], Awaitable[Dict[str, Any]]]:
+        """بديل لتقنية مهيأة دون تنفيذ يعيد علامة خطأ لكل هدف"""
+        async def unavailable(target: str) -> Dict[str, Any]:
+            return {'error': f"تقنية استطلاع غير متوفرة: {technique}"}
+        return unavailable
+    
+    def correlate_recon_data(self, technique_results: List[Any], techniques: List[str]) -> Dict[str, Any]:
+        """ربط نتائج تقنيات الاستطلاع"""
+        correlated = {}
+        for technique, result in zip(techniques, technique_results):
+            if isinstance(result, BaseException):
+                correlated[technique] = {'error': str(result) or type(result).__name__}
+            else:
+                correlated[technique] = result
+        return correlated
+    
     async def advanced_dns_recon(self, target: str) -> Dict[str, Any]:
         """استطلاع DNS متقدم"""
         dns_data = {}
         try:
-            import dns.resolver
+            dns_data = await self.dns_resolver.resolve_records(target, DNS_RECORD_TYPES)
             
-            record_types = ['A', 'AAAA', 'MX', 'TXT', 'NS', 'CNAME']
-            for record_type in record_types:
-                try:
-                    answers = dns.resolver.resolve(target, record_type)
-                    dns_data[record_type] = [str(rdata) for rdata in answers]
-                except:
-                    continue
-                    
         except Exception as e:
             self.logger.warning(f"استطلاع DNS فشل: {e}")
+            record_error('technique', 'advanced_dns_recon')
+            # علامة الخطأ تمنع حفظ النتيجة الفارغة كنقطة استئناف مكتملة
+            dns_data = {'error': str(e)}
             
         return dns_data
+    
+    async def whois_analysis(self, target: str) -> Dict[str, Any]:
+        """تحليل سجل WHOIS"""
+        whois_data = {}
+        try:
+            whois_data = await self.whois_client.lookup(target)
+            
+        except Exception as e:
+            self.logger.warning(f"استعلام WHOIS فشل: {e}")
+            record_error('technique', 'whois_analysis')
+            whois_data = {'error': str(e)}
+            
+        return whois_data
+    
+    async def subdomain_enumeration(self, target: str) -> Dict[str, Any]:
+        """تعداد النطاقات الفرعية"""
+        subdomains = {}
+        try:
+            subdomains = await self.subdomain_enumerator.enumerate_zone(target)
+            
+        except Exception as e:
+            self.logger.warning(f"تعداد النطاقات الفرعية فشل: {e}")
+            record_error('technique', 'subdomain_enumeration')
+            subdomains = {'error': str(e)}
+            
+        return subdomains
+
+class RealTimeDataCorrelator:
+    """رابط البيانات في الوقت الحقيقي"""
+    def __init__(self, index: Optional[CorrelationIndex] = None):
+        self.index = index or CorrelationIndex(max_fanout=Settings.CORRELATION_MAX_FANOUT)
+        self.index.add_listener(self.on_link)
+    
+    def on_link(self, link: CorrelationLink):
+        """بث كل رابط جديد لمستمعي المسح الجاري"""
+        emit_scan_event('correlation_link', **link._asdict())
+    
+    def correlate(self, target: str, result: Any) -> List[CorrelationLink]:
+        """ربط نتيجة هدف بجميع النتائج السابقة"""
+        return self.index.add_result(target, result)
+    
+    def related(self, targets: List[str]) -> Dict[str, Dict[str, int]]:
+        """الأهداف المرتبطة بكل هدف وعدد الكيانات المشتركة"""
+        return {target: self.index.related_targets(target) for target in targets}
+    
+    def network_graph(self, targets: List[str]) -> RelationshipGraph:
+        """رسم العلاقات حول الأهداف (الأهداف وجيرانها المباشرون في الفهرس)"""
+        graph = RelationshipGraph()
+        for target in targets:
+            graph.node_id(target)
+            for other, weight in self.index.related_targets(target).items():
+                graph.add_edge(target, other, weight)
+        return graph
+
+class AdvancedDataFusionEngine:
+    """محرك دمج البيانات المتقدم"""
+    def fuse_results(self, phase_results: List[Any], phase_names: List[str]) -> Dict[str, Any]:
+        """دمج نتائج المراحل"""
+        fused = {'phases': {}, 'errors': {}}
+        for name, result in zip(phase_names, phase_results):
+            if isinstance(result, Exception):
+                fused['errors'][name] = str(result)
+            else:
+                fused['phases'][name] = result
+        return fused
+    
+    @staticmethod
+    def iter_target_records(fused: Dict[str, Any]) -> Iterator[Tuple[str, str, Any]]:
+        """تفكيك النتائج المدمجة إلى سجلات (الهدف، المرحلة، النتيجة)"""
+        for phase, phase_result in fused.get('phases', {}).items():
+            if not isinstance(phase_result, dict):
+                continue
+            for target, result in phase_result.items():
+                yield target, phase, result
 
 class GhostNetworkManager:
     """مدير شبكة الأشباح"""
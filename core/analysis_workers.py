@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+عمال التحليل كثيف المعالجة
+CPU-bound Analysis Workers
+
+دوال على مستوى الوحدة حتى يمكن إرسالها إلى مجمع العمليات،
+والأنماط تُجمّع مرة واحدة لكل عملية عبر init_worker.
+"""
+
+import re
+from typing import Dict, List, Any
+from core.contact_extractor import contact_extractor
+
+TOPIC_KEYWORDS = {
+    'technology': ['computer', 'software', 'programming', 'tech'],
+    'business': ['company', 'work', 'job', 'business'],
+    'education': ['school', 'university', 'study', 'learn'],
+    'personal': ['family', 'friend', 'home', 'life']
+}
+
+_PATTERNS = None
+
+def init_worker():
+    """تهيئة عملية العامل: تجميع الأنماط مرة واحدة"""
+    global _PATTERNS
+    if _PATTERNS is None:
+        _PATTERNS = {
+            'contacts': contact_extractor,
+            'topics': {
+                topic: re.compile('|'.join(map(re.escape, words)))
+                for topic, words in TOPIC_KEYWORDS.items()
+            }
+        }
+    return _PATTERNS
+
+def extract_contacts(text: str) -> Dict[str, List[str]]:
+    """استخراج الإيميلات والهواتف من نص"""
+    return init_worker()['contacts'].extract_grouped(text)
+
+def extract_topics(text: str) -> List[str]:
+    """استخراج الموضوعات بالكلمات المفتاحية"""
+    text_lower = text.lower()
+    return [
+        topic for topic, pattern in init_worker()['topics'].items()
+        if pattern.search(text_lower)
+    ]
+
+def score_confidence(contacts: Dict[str, List[str]]) -> float:
+    """درجة ثقة بسيطة حسب تنوع جهات الاتصال"""
+    found = sum(1 for values in contacts.values() if values)
+    return found / len(contacts) if contacts else 0.0
+
+def analyze_document(text: str) -> Dict[str, Any]:
+    """تحليل وثيقة كاملة: جهات الاتصال والموضوعات والثقة"""
+    contacts = extract_contacts(text)
+    return {
+        'contacts': contacts,
+        'topics': extract_topics(text),
+        'confidence': score_confidence(contacts)
+    }
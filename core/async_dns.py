@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+محلل DNS غير المتزامن
+Async DNS Resolver
+"""
+
+import asyncio
+import logging
+import random
+import socket
+import struct
+import time
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+from config.settings import Settings
+
+DNS_RECORD_TYPES = ['A', 'AAAA', 'MX', 'TXT', 'NS', 'CNAME']
+
+# رموز الإجابة في رأس رسالة DNS
+RCODE_NOERROR = 0
+RCODE_NXDOMAIN = 3
+
+class DNSCache:
+    """ذاكرة DNS مؤقتة تحترم TTL وتخزن النتائج السلبية"""
+    def __init__(self, max_entries: int = 100000, negative_ttl: int = 300):
+        self.max_entries = max_entries
+        self.negative_ttl = negative_ttl
+        self.entries: "OrderedDict[Tuple[str, str], Tuple[float, List[str]]]" = OrderedDict()
+        self.stats = {'hits': 0, 'negative_hits': 0, 'misses': 0, 'expired': 0}
+
+    def get(self, name: str, record_type: str) -> Optional[List[str]]:
+        """قراءة إجابة مخزنة صالحة (قائمة فارغة = نتيجة سلبية)"""
+        key = (name.lower(), record_type)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+
+        expires_at, records = entry
+        if expires_at <= time.monotonic():
+            del self.entries[key]
+            self.stats['expired'] += 1
+            self.stats['misses'] += 1
+            return None
+
+        self.entries.move_to_end(key)
+        if records:
+            self.stats['hits'] += 1
+        else:
+            self.stats['negative_hits'] += 1
+        return records
+
+    def set(self, name: str, record_type: str, records: List[str], ttl: int):
+        """تخزين إجابة لمدة TTL"""
+        if ttl <= 0:
+            return
+        key = (name.lower(), record_type)
+        self.entries[key] = (time.monotonic() + ttl, records)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def set_negative(self, name: str, record_type: str, ttl: Optional[int] = None):
+        """تخزين نتيجة سلبية (NXDOMAIN / NoAnswer)"""
+        self.set(name, record_type, [], self.negative_ttl if ttl is None else ttl)
+
+    def __len__(self):
+        return len(self.entries)
+
+def negative_ttl(response) -> Optional[int]:
+    """مدة التخزين السلبي من سجل SOA في قسم السلطة (RFC 2308)؛ None إذا لم يوجد"""
+    import dns.rdatatype
+    for rrset in response.authority:
+        if rrset.rdtype == dns.rdatatype.SOA:
+            return min(rrset.ttl, rrset[0].minimum)
+    return None
+
+class AsyncDNSResolver:
+    """محلل DNS غير متزامن بحد تزامن قابل للضبط"""
+    def __init__(self,
+                 concurrency: Optional[int] = None,
+                 timeout: Optional[float] = None,
+                 nameservers: Optional[List[str]] = None,
+                 port: int = 53,
+                 cache: Optional[DNSCache] = None):
+        self.logger = logging.getLogger(__name__)
+        self.concurrency = concurrency or Settings.DNS_CONCURRENCY
+        self.timeout = timeout or Settings.DNS_TIMEOUT
+        self.nameservers = nameservers or Settings.DNS_NAMESERVERS
+        self.port = port
+        self.cache = cache or DNSCache(Settings.DNS_CACHE_SIZE, Settings.DNS_NEGATIVE_TTL)
+        self._resolver = None
+        self._semaphore = None
+        self._in_flight: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    @property
+    def resolver(self):
+        """محلل dnspython غير المتزامن (يُنشأ عند أول استخدام)"""
+        if self._resolver is None:
+            import dns.asyncresolver
+            self._resolver = dns.asyncresolver.Resolver(configure=not self.nameservers)
+            if self.nameservers:
+                self._resolver.nameservers = list(self.nameservers)
+            self._resolver.port = self.port
+            self._resolver.lifetime = self.timeout
+        return self._resolver
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """حد التزامن (يُنشأ داخل حلقة الأحداث)"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    async def resolve(self, name: str, record_type: str) -> List[str]:
+        """حل سجل واحد مع الاستفادة من الذاكرة المؤقتة"""
+        cached = self.cache.get(name, record_type)
+        if cached is not None:
+            return cached
+
+        # دمج الاستعلامات المتطابقة الجارية في استعلام واحد
+        key = (name.lower(), record_type)
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # أُلغي المستدعي الذي ينفذ الاستعلام: المنتظر يعيده بنفسه
+                return await self.resolve(name, record_type)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            records = await self._query(name, record_type)
+            future.set_result(records)
+            return records
+        except Exception as e:
+            future.set_exception(e)
+            # تجنب تحذير "Future exception was never retrieved"
+            future.exception()
+            raise
+        finally:
+            # الإلغاء لا يترك المنتظرين معلقين
+            if not future.done():
+                future.cancel()
+            del self._in_flight[key]
+
+    async def _query(self, name: str, record_type: str) -> List[str]:
+        """تنفيذ الاستعلام الفعلي وتخزين نتيجته"""
+        import dns.resolver
+
+        async with self.semaphore:
+            try:
+                answer = await self.resolver.resolve(
+                    name, record_type, raise_on_no_answer=False
+                )
+            except dns.resolver.NXDOMAIN as e:
+                responses = list(e.responses().values())
+                self.cache.set_negative(name, record_type, negative_ttl(responses[-1]) if responses else None)
+                return []
+            except (dns.resolver.NoNameservers, dns.resolver.LifetimeTimeout) as e:
+                # أخطاء مؤقتة لا تُخزن وتصل للمستدعي حتى لا تُعامل كإجابة فارغة
+                self.logger.debug(f"استعلام DNS فشل {name}/{record_type}: {e}")
+                raise
+
+        if answer.rrset is None:
+            self.cache.set_negative(name, record_type, negative_ttl(answer.response))
+            return []
+
+        records = [str(rdata) for rdata in answer.rrset]
+        self.cache.set(name, record_type, records, answer.rrset.ttl)
+        return records
+
+    async def resolve_records(self, name: str, record_types: Optional[List[str]] = None) -> Dict[str, Any]:
+        """حل جميع أنواع السجلات لهدف واحد بالتوازي
+
+        السجلات التي فشل حلها مؤقتاً تُذكر في مفتاح 'error' مع بقاء ما نجح.
+        """
+        record_types = record_types or DNS_RECORD_TYPES
+        results = await asyncio.gather(
+            *(self.resolve(name, record_type) for record_type in record_types),
+            return_exceptions=True
+        )
+
+        dns_data = {}
+        failed = []
+        for record_type, records in zip(record_types, results):
+            if isinstance(records, BaseException):
+                failed.append(f"{record_type}: {type(records).__name__}")
+            elif records:
+                dns_data[record_type] = records
+        if failed:
+            dns_data['error'] = ", ".join(failed)
+        return dns_data
+
+    async def resolve_many(self, names: List[str], record_types: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """حل جميع السجلات لجميع الأهداف دفعة واحدة"""
+        results = await asyncio.gather(
+            *(self.resolve_records(name, record_types) for name in names)
+        )
+        return dict(zip(names, results))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """إحصائيات الذاكرة المؤقتة"""
+        return {**self.cache.stats, 'cached_entries': len(self.cache)}
+
+class DNSQueryError(Exception):
+    """إجابة فاشلة من الخادم (SERVFAIL أو REFUSED...)"""
+
+def encode_name(name: str) -> bytes:
+    """اسم النطاق بصيغة الرسالة (مقاطع مسبوقة بطولها)"""
+    wire = b''.join(
+        bytes([len(label)]) + label for label in name.rstrip('.').encode('ascii').split(b'.')
+    )
+    return wire + b'\x00'
+
+def encode_a_query(query_id: int, qname: bytes) -> bytes:
+    """استعلام A مع طلب الحل التكراري (RD)"""
+    return struct.pack('!HHHHHH', query_id, 0x0100, 1, 0, 0, 0) + qname + b'\x00\x01\x00\x01'
+
+def skip_name(data: bytes, offset: int) -> int:
+    """موضع ما بعد اسم في الرسالة (مع دعم مؤشرات الضغط)"""
+    while True:
+        length = data[offset]
+        if length == 0:
+            return offset + 1
+        if length & 0xC0 == 0xC0:
+            return offset + 2
+        offset += length + 1
+
+def parse_a_response(data: bytes) -> Tuple[int, int, List[str]]:
+    """(المعرف، رمز الإجابة، عناوين IPv4) من إجابة DNS"""
+    query_id, flags, qdcount, ancount = struct.unpack_from('!HHHH', data)
+    offset = 12
+    for _ in range(qdcount):
+        offset = skip_name(data, offset) + 4
+    addresses = []
+    for _ in range(ancount):
+        offset = skip_name(data, offset)
+        record_type, _, _, length = struct.unpack_from('!HHIH', data, offset)
+        offset += 10
+        if record_type == 1 and length == 4:
+            addresses.append(socket.inet_ntoa(data[offset:offset + 4]))
+        offset += length
+    return query_id, flags & 0x000F, addresses
+
+def system_nameservers() -> List[str]:
+    """خوادم الأسماء من /etc/resolv.conf"""
+    nameservers = []
+    try:
+        with open('/etc/resolv.conf') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == 'nameserver':
+                    nameservers.append(parts[1])
+    except OSError:
+        pass
+    return nameservers or ['127.0.0.1']
+
+class BulkResolverProtocol(asyncio.DatagramProtocol):
+    """بروتوكول UDP يوزع الإجابات على الاستعلامات المنتظرة حسب المعرف"""
+    def __init__(self, resolver: "BulkResolver"):
+        self.resolver = resolver
+
+    def datagram_received(self, data: bytes, addr):
+        self.resolver.on_response(data)
+
+    def error_received(self, exc):
+        self.resolver.logger.debug(f"خطأ UDP: {exc}")
+
+class BulkResolver:
+    """محلل سجلات A عالي الإنتاجية: مقبس UDP واحد لكل خادم وآلاف الاستعلامات الجارية
+
+    الرسائل تُبنى وتُحلل مباشرة دون dnspython ودون ذاكرة مؤقتة، لأن
+    تعداد الأسماء يسأل عن كل اسم مرة واحدة. المهلة تُنفذ بمؤقت على
+    الـ Future نفسه بدلاً من مهمة wait_for لكل استعلام.
+    """
+    def __init__(self,
+                 nameservers: Optional[List[str]] = None,
+                 port: int = 53,
+                 timeout: Optional[float] = None,
+                 retries: Optional[int] = None):
+        self.logger = logging.getLogger(__name__)
+        self.nameservers = nameservers or Settings.DNS_NAMESERVERS or system_nameservers()
+        self.port = port
+        self.timeout = timeout or Settings.SUBDOMAIN_TIMEOUT
+        self.retries = Settings.SUBDOMAIN_RETRIES if retries is None else retries
+        self.transports: List[asyncio.DatagramTransport] = []
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        # قفل الفتح مرتبط بالحلقة التي أُنشئ فيها
+        self.open_lock: Optional[asyncio.Lock] = None
+        self.open_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.pending: Dict[int, Tuple[bytes, asyncio.Future]] = {}
+        self.next_server = 0
+        self.stats = {'queries': 0, 'timeouts': 0, 'mismatched': 0}
+
+    async def open(self):
+        """فتح مقابس UDP داخل حلقة الأحداث الحالية"""
+        loop = asyncio.get_running_loop()
+        if self.loop is loop and self.transports:
+            return
+        if self.open_lock_loop is not loop:
+            self.open_lock = asyncio.Lock()
+            self.open_lock_loop = loop
+        # المستدعون المتزامنون الأوائل ينتظرون فتحاً واحداً بدلاً من فتح مقابس مكررة
+        async with self.open_lock:
+            if self.loop is loop and self.transports:
+                return
+            self.close()
+            transports = []
+            try:
+                for nameserver in self.nameservers:
+                    transport, _ = await loop.create_datagram_endpoint(
+                        lambda: BulkResolverProtocol(self), remote_addr=(nameserver, self.port)
+                    )
+                    transports.append(transport)
+            except BaseException:
+                for transport in transports:
+                    transport.close()
+                raise
+            self.loop = loop
+            self.transports = transports
+
+    def close(self):
+        """إغلاق المقابس"""
+        for transport in self.transports:
+            transport.close()
+        self.transports = []
+        self.pending.clear()
+
+    def on_response(self, data: bytes):
+        """تسليم إجابة للاستعلام المنتظر"""
+        try:
+            query_id, rcode, addresses = parse_a_response(data)
+        except (struct.error, IndexError):
+            self.stats['mismatched'] += 1
+            return
+        entry = self.pending.pop(query_id, None)
+        if entry is None:
+            self.stats['mismatched'] += 1
+            return
+        qname, future = entry
+        # السؤال في الإجابة يجب أن يطابق الاسم المرسل (حماية من الإجابات المزيفة)
+        if data[12:12 + len(qname)].lower() != qname.lower():
+            self.stats['mismatched'] += 1
+            self.pending[query_id] = entry
+            return
+        if future.done():
+            return
+        if rcode == RCODE_NOERROR:
+            future.set_result(addresses)
+        elif rcode == RCODE_NXDOMAIN:
+            future.set_result([])
+        else:
+            future.set_exception(DNSQueryError(f"rcode {rcode}"))
+
+    def expire(self, query_id: int, future: asyncio.Future):
+        """انقضاء مهلة استعلام"""
+        if self.pending.get(query_id, (None, None))[1] is future:
+            del self.pending[query_id]
+        if not future.done():
+            self.stats['timeouts'] += 1
+            future.set_exception(asyncio.TimeoutError())
+
+    async def send(self, qname: bytes) -> List[str]:
+        """إرسال استعلام واحد وانتظار إجابته"""
+        query_id = random.getrandbits(16)
+        while query_id in self.pending:
+            query_id = random.getrandbits(16)
+        future = self.loop.create_future()
+        self.pending[query_id] = (qname, future)
+        timer = self.loop.call_later(self.timeout, self.expire, query_id, future)
+        try:
+            transport = self.transports[self.next_server % len(self.transports)]
+            self.next_server += 1
+            transport.sendto(encode_a_query(query_id, qname))
+            self.stats['queries'] += 1
+            return await future
+        finally:
+            timer.cancel()
+            # الإلغاء أو فشل الإرسال لا يترك المعرف محجوزاً (ما لم يُعد استخدامه لاستعلام آخر)
+            if self.pending.get(query_id, (None, None))[1] is future:
+                del self.pending[query_id]
+
+    async def query_a(self, name: str) -> List[str]:
+        """عناوين IPv4 لاسم ([] إذا لم يوجد)؛ ترفع TimeoutError بعد استنفاد المحاولات"""
+        await self.open()
+        qname = encode_name(name)
+        for attempt in range(self.retries + 1):
+            try:
+                return await self.send(qname)
+            except asyncio.TimeoutError:
+                if attempt == self.retries:
+                    raise
+        return []
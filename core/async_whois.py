@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+عميل WHOIS غير متزامن
+Async WHOIS Client
+
+استعلامات WHOIS عبر TCP (المنفذ 43) دون حجب حلقة الأحداث، بحد اتصالات
+متزامنة لكل خادم. خادم كل نطاق أعلى (TLD) يُعرف بإحالة من الخادم الجذر
+مرة واحدة ثم يُحفظ، والسجلات المحللة تُحفظ في ذاكرة مؤقتة LRU وعلى القرص
+بنافذة صلاحية قابلة للضبط.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from config.settings import Settings
+from core.entity_normalizer import normalize_domain
+from core.result_cache import TwoTierCache
+
+# أقصى حجم لإجابة خادم واحد (حماية من الخوادم المعطوبة)
+MAX_RESPONSE_BYTES = 1 << 20
+
+# أسماء الحقول المختلفة بين السجلات والحقل الموحد المقابل
+FIELD_ALIASES = {
+    'domain name': 'domain_name',
+    'domain': 'domain_name',
+    'registrar': 'registrar',
+    'sponsoring registrar': 'registrar',
+    'registrar whois server': 'whois_server',
+    'whois server': 'whois_server',
+    'whois': 'whois_server',
+    'refer': 'whois_server',
+    'creation date': 'creation_date',
+    'created': 'creation_date',
+    'created on': 'creation_date',
+    'registration time': 'creation_date',
+    'registry expiry date': 'expiration_date',
+    'registrar registration expiration date': 'expiration_date',
+    'expiry date': 'expiration_date',
+    'expiration date': 'expiration_date',
+    'paid-till': 'expiration_date',
+    'updated date': 'updated_date',
+    'last-modified': 'updated_date',
+    'changed': 'updated_date',
+    'name server': 'name_servers',
+    'nserver': 'name_servers',
+    'domain status': 'status',
+    'status': 'status',
+    'registrant name': 'registrant_name',
+    'registrant organization': 'registrant_organization',
+    'registrant country': 'registrant_country',
+    'registrant email': 'emails',
+    # عناوين الإدارة والدعم الفني غالباً لوكيل خصوصية أو مزود استضافة، وعنوان
+    # الإبلاغ يخص المسجل نفسه: حقول منفصلة حتى لا تربط كل نطاقاتهم ببعضها
+    'admin email': 'contact_emails',
+    'tech email': 'contact_emails',
+    'registrar abuse contact email': 'abuse_email',
+    'dnssec': 'dnssec'
+}
+LIST_FIELDS = {'name_servers', 'status', 'emails', 'contact_emails'}
+
+# عبارات إجابة "غير مسجل" الشائعة
+NOT_FOUND_MARKERS = ('no match', 'not found', 'no data found', 'no entries found', 'status: free', 'status: available')
+
+def parse_whois(text: str) -> Dict[str, Any]:
+    """تحليل نص WHOIS إلى حقول موحدة"""
+    record: Dict[str, Any] = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith('>>>'):
+            break
+        if not line or line[0] in '%#':
+            continue
+        key, separator, value = line.partition(':')
+        value = value.strip()
+        field = FIELD_ALIASES.get(key.strip().lower())
+        if not separator or not value or field is None:
+            continue
+        if field in LIST_FIELDS:
+            if field == 'status':
+                # "clientTransferProhibited https://icann.org/epp#..." -> الرمز فقط
+                value = value.split()[0]
+            elif field == 'name_servers':
+                value = value.split()[0].lower().rstrip('.')
+            values = record.setdefault(field, [])
+            if value not in values:
+                values.append(value)
+        else:
+            record.setdefault(field, value)
+
+    # عبارات "غير مسجل" تُعتمد فقط إذا لم يحتوِ النص على حقول (التذييلات قد تذكرها)
+    lowered = text.lower()
+    record['registered'] = bool(record) or not any(marker in lowered for marker in NOT_FOUND_MARKERS)
+    return record
+
+class AsyncWhoisClient:
+    """عميل WHOIS غير متزامن بذاكرة مؤقتة للإحالات والسجلات"""
+    def __init__(self,
+                 root_server: Optional[str] = None,
+                 port: Optional[int] = None,
+                 concurrency_per_server: Optional[int] = None,
+                 timeout: Optional[float] = None,
+                 cache: Optional[TwoTierCache] = None,
+                 referral_cache: Optional[TwoTierCache] = None,
+                 follow_registrar: bool = True):
+        self.logger = logging.getLogger(__name__)
+        self.root_server = root_server or Settings.WHOIS_ROOT_SERVER
+        self.port = port or Settings.WHOIS_PORT
+        self.concurrency_per_server = concurrency_per_server or Settings.WHOIS_CONCURRENCY_PER_SERVER
+        self.timeout = timeout or Settings.WHOIS_TIMEOUT
+        self.cache = cache or TwoTierCache(
+            path=Settings.WHOIS_CACHE_PATH,
+            namespace="whois",
+            max_memory_entries=Settings.WHOIS_CACHE_MEMORY_ENTRIES,
+            ttl=Settings.WHOIS_CACHE_TTL
+        )
+        # الإحالات نادرة التغير: نافذة صلاحية أطول في نفس الملف
+        self.referral_cache = referral_cache or TwoTierCache(
+            path=Settings.WHOIS_CACHE_PATH,
+            namespace="whois_referrals",
+            ttl=Settings.WHOIS_REFERRAL_TTL
+        )
+        # السجلات الرفيعة (مثل .com) تحيل إلى خادم المسجل للتفاصيل
+        self.follow_registrar = follow_registrar
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.stats = {'lookups': 0, 'queries': 0, 'referral_queries': 0, 'registrar_queries': 0, 'errors': 0}
+
+    def semaphore(self, server: str) -> asyncio.Semaphore:
+        """حد الاتصالات المتزامنة لخادم واحد (يُنشأ داخل حلقة الأحداث)"""
+        semaphore = self._semaphores.get(server)
+        if semaphore is None:
+            semaphore = self._semaphores[server] = asyncio.Semaphore(self.concurrency_per_server)
+        return semaphore
+
+    async def query(self, server: str, text: str) -> str:
+        """استعلام واحد بحد اتصالات الخادم ومهلة واحدة للاستعلام كاملاً"""
+        async with self.semaphore(server):
+            self.stats['queries'] += 1
+            return await asyncio.wait_for(self.exchange(server, text), self.timeout)
+
+    async def exchange(self, server: str, text: str) -> str:
+        """اتصال، سطر الاستعلام، ثم القراءة حتى إغلاق الخادم"""
+        reader, writer = await asyncio.open_connection(server, self.port)
+        try:
+            writer.write(f"{text}\r\n".encode('utf-8'))
+            chunks = []
+            size = 0
+            while size < MAX_RESPONSE_BYTES:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                size += len(chunk)
+        finally:
+            writer.close()
+        return b''.join(chunks).decode('utf-8', 'replace')
+
+    async def coalesced(self, key: str, factory) -> Any:
+        """دمج الطلبات المتطابقة الجارية في طلب واحد"""
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # أُلغي المستدعي الذي ينفذ الطلب: المنتظر يعيده بنفسه
+                return await self.coalesced(key, factory)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await factory()
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            # تجنب تحذير "Future exception was never retrieved"
+            future.exception()
+            raise
+        finally:
+            # الإلغاء (أو أي BaseException) لا يترك المنتظرين معلقين
+            if not future.done():
+                future.cancel()
+            del self._in_flight[key]
+
+    async def server_for(self, tld: str) -> Optional[str]:
+        """خادم WHOIS للنطاق الأعلى (إحالة من الخادم الجذر مرة واحدة)"""
+        key = f"tld:{tld}"
+        if key not in self._in_flight:
+            cached = await self.referral_cache.aget(tld)
+            if cached is not None:
+                return cached or None
+
+        async def refer():
+            self.stats['referral_queries'] += 1
+            server = parse_whois(await self.query(self.root_server, tld)).get('whois_server', '')
+            # النطاق الأعلى دون خادم يُحفظ كنص فارغ حتى لا يُسأل عنه مجدداً
+            await self.referral_cache.aset(tld, server)
+            return server
+
+        return await self.coalesced(key, refer) or None
+
+    async def lookup(self, domain: str) -> Dict[str, Any]:
+        """سجل WHOIS المحلل لنطاق ({} إذا لم يكن اسم نطاق)"""
+        domain = normalize_domain(domain)
+        if not domain or '.' not in domain:
+            return {}
+        self.stats['lookups'] += 1
+        cached = await self.cache.aget(domain)
+        if cached is not None:
+            return cached
+        return await self.coalesced(domain, lambda: self.fetch(domain))
+
+    async def fetch(self, domain: str) -> Dict[str, Any]:
+        """الاستعلام الفعلي وتخزين السجل المحلل"""
+        try:
+            server = await self.server_for(domain.rsplit('.', 1)[1])
+            if server is None:
+                return {}
+            record = parse_whois(await self.query(server, domain))
+
+            registrar_server = record.get('whois_server')
+            if self.follow_registrar and registrar_server and registrar_server.lower() != server.lower():
+                try:
+                    self.stats['registrar_queries'] += 1
+                    details = parse_whois(await self.query(registrar_server, domain))
+                    if details.get('registered'):
+                        record = {**record, **details}
+                except (OSError, asyncio.TimeoutError) as e:
+                    # سجل السجل الرفيع يكفي إذا تعذر خادم المسجل
+                    self.logger.debug(f"خادم المسجل {registrar_server} فشل لـ {domain}: {e}")
+        except (OSError, asyncio.TimeoutError) as e:
+            # أخطاء مؤقتة لا تُخزن
+            self.stats['errors'] += 1
+            raise ConnectionError(f"استعلام WHOIS فشل لـ {domain}: {e}") from e
+
+        await self.cache.aset(domain, record)
+        return record
+
+    async def lookup_many(self, domains: List[str]) -> Dict[str, Dict[str, Any]]:
+        """سجلات عدة نطاقات بالتوازي (الفاشل يعيد {'error': ...})"""
+        results = await asyncio.gather(*(self.lookup(domain) for domain in domains), return_exceptions=True)
+        return {
+            domain: {'error': str(result)} if isinstance(result, Exception) else result
+            for domain, result in zip(domains, results)
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """إحصائيات الاستعلامات والذاكرة المؤقتة"""
+        return {
+            **self.stats,
+            'record_cache': self.cache.get_stats(),
+            'referral_cache': self.referral_cache.get_stats()
+        }
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+نقاط استئناف المسح
+Scan Checkpoints
+
+تحفظ نتيجة كل (هدف × مرحلة) فور اكتمالها، فيتخطى المسح المعاد تشغيله
+ما اكتمل ضمن نافذة الصلاحية ويستأنف الباقي فقط.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+from config.settings import Settings
+from core.result_cache import TwoTierCache, content_key
+
+class ScanCheckpoints:
+    """مخزن نقاط الاستئناف على مستوى الهدف والمرحلة
+
+    البصمة (إعدادات المسح المؤثرة في النتائج مثل قائمة التقنيات) تُمرر مع
+    كل قراءة وكتابة، لأنها قد تتغير بين مسح وآخر على نفس المحرك.
+    """
+    def __init__(self,
+                 cache: Optional[TwoTierCache] = None,
+                 ttl: Optional[float] = None):
+        self.logger = logging.getLogger(__name__)
+        self.cache = cache or TwoTierCache(
+            path=Settings.CHECKPOINT_PATH,
+            namespace="scan_checkpoints",
+            max_memory_entries=1000,
+            ttl=Settings.CHECKPOINT_TTL if ttl is None else ttl
+        )
+
+    @staticmethod
+    def key(phase: str, target: str, fingerprint: Sequence[str] = ()) -> str:
+        """مفتاح نقطة الاستئناف (تغيير البصمة يبطل النقاط السابقة)"""
+        return content_key(phase, target, *fingerprint)
+
+    @staticmethod
+    def is_complete(result: Any) -> bool:
+        """النتائج الفاشلة (كلياً أو في إحدى التقنيات) لا تُحفظ حتى يعاد تنفيذها"""
+        if not isinstance(result, dict):
+            return True
+        if 'error' in result:
+            return False
+        return not any(isinstance(value, dict) and 'error' in value for value in result.values())
+
+    def load(self, phase: str, targets: List[str], fingerprint: Sequence[str] = ()) -> Dict[str, Any]:
+        """النتائج الصالحة المحفوظة لهذه الأهداف في المرحلة"""
+        keys = {self.key(phase, target, fingerprint): target for target in targets}
+        found = self.cache.get_many(list(keys))
+        return {keys[key]: result for key, result in found.items()}
+
+    async def aload(self, phase: str, targets: List[str], fingerprint: Sequence[str] = ()) -> Dict[str, Any]:
+        """مثل load دون حجب حلقة الأحداث"""
+        keys = {self.key(phase, target, fingerprint): target for target in targets}
+        found = await self.cache.aget_many(list(keys))
+        return {keys[key]: result for key, result in found.items()}
+
+    def save(self, phase: str, target: str, result: Any, fingerprint: Sequence[str] = ()):
+        """حفظ نتيجة هدف واحد في المرحلة"""
+        if self.is_complete(result):
+            self.cache.set(self.key(phase, target, fingerprint), result)
+
+    async def asave(self, phase: str, target: str, result: Any, fingerprint: Sequence[str] = ()):
+        """مثل save دون حجب حلقة الأحداث"""
+        if self.is_complete(result):
+            await self.cache.aset(self.key(phase, target, fingerprint), result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """إحصائيات نقاط الاستئناف"""
+        return self.cache.get_stats()
+
+    def close(self):
+        """إغلاق المخزن"""
+        self.cache.close()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+مستخرج جهات الاتصال الموحد
+Unified Contact Extractor
+
+جميع أنماط الهواتف والإيميلات مجمعة مرة واحدة في نمط واحد متعدد
+الفروع، والمستند يُمسح في مرور واحد سواء كان str أو bytes أو memoryview.
+"""
+
+import re
+from typing import Dict, Iterator, List, NamedTuple, Optional, Union
+
+Document = Union[str, bytes, bytearray, memoryview]
+
+# مصدر الأنماط (ASCII فقط حتى يمكن تجميعها لـ str و bytes)
+EMAIL_PATTERN = r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}'
+INTL_PHONE_PATTERN = r'\+\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}'
+LOCAL_PHONE_PATTERN = r'\d{3}[-.]?\d{3}[-.]?\d{4}'  # أمريكي
+SCAN_PHONE_PATTERN = r'\d{2,3}[-.]?\d{3}[-.]?\d{4}'  # أمريكي ودول أخرى
+
+# نمط المسح: \b مشتركة بين فرعي الإيميل والهاتف المحلي حتى يُفحص
+# شرط حد الكلمة مرة واحدة في كل موضع
+SCAN_PATTERN = (
+    r'\b(?:'
+    rf'(?P<email>{EMAIL_PATTERN})\b'
+    rf'|(?P<phone>{SCAN_PHONE_PATTERN})\b'
+    r')'
+    rf'|(?P<intl_phone>{INTL_PHONE_PATTERN})\b'
+)
+
+# نوع الجهة لكل فرع في النمط
+GROUP_KINDS = {
+    'email': 'email',
+    'intl_phone': 'phone',
+    'phone': 'phone'
+}
+
+class ContactSpan(NamedTuple):
+    """جهة اتصال مع موقعها في المستند"""
+    kind: str
+    start: int
+    end: int
+    value: str
+
+class ContactExtractor:
+    """مستخرج جهات اتصال بمرور واحد على المستند"""
+    def __init__(self):
+        self.scan_str = re.compile(SCAN_PATTERN)
+        self.scan_bytes = re.compile(SCAN_PATTERN.encode('ascii'))
+        self.valid_email = re.compile(EMAIL_PATTERN)
+        self.valid_phone = re.compile(f'{INTL_PHONE_PATTERN}|{LOCAL_PHONE_PATTERN}')
+        self.valid_contact = re.compile(f'{INTL_PHONE_PATTERN}|{LOCAL_PHONE_PATTERN}|{EMAIL_PATTERN}')
+
+    def finditer(self, document: Document) -> Iterator[ContactSpan]:
+        """مسح المستند وإرجاع جهات الاتصال بالترتيب"""
+        if isinstance(document, str):
+            for match in self.scan_str.finditer(document):
+                group = match.lastgroup
+                yield ContactSpan(GROUP_KINDS[group], match.start(), match.end(), match.group(group))
+        else:
+            for match in self.scan_bytes.finditer(document):
+                group = match.lastgroup
+                yield ContactSpan(
+                    GROUP_KINDS[group], match.start(), match.end(),
+                    match.group(group).decode('ascii')
+                )
+
+    def extract(self, document: Document) -> List[ContactSpan]:
+        """جميع جهات الاتصال في المستند"""
+        return list(self.finditer(document))
+
+    def extract_grouped(self, document: Document) -> Dict[str, List[str]]:
+        """جهات الاتصال مجمعة حسب النوع"""
+        grouped = {'emails': [], 'phones': []}
+        for span in self.finditer(document):
+            grouped['emails' if span.kind == 'email' else 'phones'].append(span.value)
+        return grouped
+
+    def classify(self, contact: str) -> Optional[str]:
+        """تحديد نوع قيمة كاملة: email أو phone أو None"""
+        if not contact:
+            return None
+        if self.valid_phone.fullmatch(contact):
+            return 'phone'
+        if self.valid_email.fullmatch(contact):
+            return 'email'
+        return None
+
+    def is_valid(self, contact: str) -> bool:
+        """هل القيمة جهة اتصال صالحة"""
+        return self.classify(contact) is not None
+
+    def count_valid(self, contacts: List[str]) -> int:
+        """عدد القيم الصالحة في قائمة (مطابقة واحدة بنمط موحد لكل قيمة)"""
+        fullmatch = self.valid_contact.fullmatch
+        return sum(1 for contact in contacts if contact and fullmatch(contact))
+
+# مستخرج مشترك بين جميع الوحدات
+contact_extractor = ContactExtractor()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+فهرس الربط بين الأهداف
+Cross-Target Correlation Index
+
+فهرس مقلوب تزايدي: كل كيان مُطبّع (إيميل، هاتف، نطاق، IP، بصمة اسم،
+خادم MX/NS) يشير إلى الأهداف التي ظهر فيها، فتُربط كل نتيجة جديدة
+بالنتائج السابقة بعملية O(1) تقريباً لكل كيان.
+"""
+
+import hashlib
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from core.entity_normalizer import normalize_domain, normalize_email, normalize_phone
+
+# مفاتيح جهات الاتصال في نتائج المراحل والإضافات
+CONTACT_KINDS = {
+    'emails': 'email', 'potential_emails': 'email',
+    'phones': 'phone', 'potential_phones': 'phone'
+}
+
+# نوع الكيان لكل سجل DNS
+DNS_KINDS = {'A': 'ip', 'AAAA': 'ip', 'MX': 'mx', 'NS': 'ns', 'CNAME': 'domain'}
+
+class CorrelationLink(NamedTuple):
+    """رابط بين هدفين يشتركان في كيان"""
+    source: str
+    target: str
+    kind: str
+    value: str
+
+def normalize_host(value: str) -> Optional[str]:
+    """اسم مضيف موحد دون أولوية MX"""
+    return normalize_domain(value.rsplit(' ', 1)[-1])
+
+def normalize_entity(kind: str, value: Any) -> Optional[str]:
+    """الصيغة الموحدة للكيان قبل الفهرسة (نفس صيغ entity_normalizer)"""
+    value = str(value).strip()
+    if not value:
+        return None
+    if kind == 'email':
+        return normalize_email(value)
+    if kind == 'phone':
+        return normalize_phone(value)
+    if kind in ('domain', 'mx', 'ns'):
+        return normalize_host(value)
+    if kind == 'name':
+        # الأسماء تُفهرس ببصمتها فقط
+        folded = ' '.join(value.casefold().split())
+        return hashlib.blake2b(folded.encode('utf-8'), digest_size=8).hexdigest()
+    return value.lower()
+
+def entity_key(kind: str, value: str) -> int:
+    """بصمة 64 بت ثابتة بين العمليات (hash() مملح لكل عملية)"""
+    digest = hashlib.blake2b(f"{kind}\x00{value}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+def iter_entities(result: Any, depth: int = 0) -> Iterator[Tuple[str, str]]:
+    """الكيانات (النوع، القيمة الخام) في نتيجة هدف"""
+    if depth > 8 or not isinstance(result, dict):
+        return
+    for key, value in result.items():
+        if key in CONTACT_KINDS and isinstance(value, list):
+            for contact in value:
+                yield CONTACT_KINDS[key], contact
+        elif key == 'advanced_dns_recon' and isinstance(value, dict):
+            for record_type, records in value.items():
+                kind = DNS_KINDS.get(record_type)
+                if kind:
+                    for record in records or ():
+                        yield kind, record
+        elif key == 'subdomain_enumeration' and isinstance(value, (list, dict)):
+            # علامة فشل التقنية ({'error': ...}) ليست نطاقات فرعية
+            if isinstance(value, dict) and 'error' in value:
+                continue
+            for subdomain in value:
+                yield 'domain', subdomain
+        elif key == 'name_servers' and isinstance(value, list):
+            # خوادم الأسماء في سجل WHOIS
+            for name_server in value:
+                yield 'ns', name_server
+        elif key == 'entities' and isinstance(value, list):
+            for entity in value:
+                if isinstance(entity, dict) and (entity.get('entity_group') or entity.get('entity')) in ('PER', 'B-PER'):
+                    yield 'name', entity.get('word', '')
+        elif isinstance(value, dict):
+            yield from iter_entities(value, depth + 1)
+
+class CorrelationIndex:
+    """فهرس مقلوب: بصمة الكيان -> الأهداف التي ظهر فيها
+
+    المفاتيح بصمات 64 بت لـ (النوع، القيمة) بدلاً من النصوص لتوفير الذاكرة،
+    والقائمة تُحفظ كرقم هدف واحد حتى يظهر الكيان في هدف ثانٍ.
+    الكيانات الشائعة جداً (مثل خوادم MX العامة) تتوقف عن توليد روابط
+    بعد max_fanout هدف حتى لا ينفجر عدد الروابط.
+    """
+    def __init__(self, max_fanout: int = 100):
+        self.logger = logging.getLogger(__name__)
+        self.max_fanout = max_fanout
+        self.target_ids: Dict[str, int] = {}
+        self.target_names: List[str] = []
+        self.postings: Dict[int, Union[int, List[int]]] = {}
+        self.hub_counts: Dict[int, int] = {}
+        # الجوار: رقم الهدف -> {رقم الهدف المرتبط: عدد الكيانات المشتركة}
+        self.neighbors: Dict[int, Dict[int, int]] = defaultdict(dict)
+        self.listeners: List[Callable[[CorrelationLink], None]] = []
+        self.stats = {'results': 0, 'entities': 0, 'links': 0, 'hubs': 0}
+
+    def add_listener(self, listener: Callable[[CorrelationLink], None]):
+        """استدعاء listener لكل رابط جديد فور ظهوره"""
+        self.listeners.append(listener)
+
+    def target_id(self, target: str) -> int:
+        """رقم داخلي ثابت للهدف"""
+        target_id = self.target_ids.get(target)
+        if target_id is None:
+            target_id = len(self.target_names)
+            self.target_ids[target] = target_id
+            self.target_names.append(target)
+        return target_id
+
+    def add_result(self, target: str, result: Any) -> List[CorrelationLink]:
+        """فهرسة نتيجة هدف وربطها بجميع النتائج السابقة"""
+        self.stats['results'] += 1
+        return self.add_entities(target, iter_entities(result))
+
+    def add_entities(self, target: str, entities) -> List[CorrelationLink]:
+        """فهرسة كيانات (النوع، القيمة) لهدف وإرجاع الروابط الجديدة"""
+        target_id = self.target_id(target)
+        postings = self.postings
+        links = []
+
+        for kind, raw_value in entities:
+            value = normalize_entity(kind, raw_value)
+            if value is None:
+                continue
+            self.stats['entities'] += 1
+            key = entity_key(kind, value)
+
+            owners = postings.get(key)
+            if owners is None:
+                postings[key] = target_id
+                continue
+
+            if isinstance(owners, int):
+                if owners == target_id:
+                    continue
+                postings[key] = owners = [owners]
+            elif target_id in owners:
+                continue
+
+            if len(owners) >= self.max_fanout:
+                # كيان شائع: يُعد فقط دون روابط جديدة
+                if key not in self.hub_counts:
+                    self.stats['hubs'] += 1
+                self.hub_counts[key] = self.hub_counts.get(key, len(owners)) + 1
+                continue
+
+            for owner in owners:
+                links.append(self.link(owner, target_id, kind, value))
+            owners.append(target_id)
+
+        return links
+
+    def link(self, owner: int, target_id: int, kind: str, value: str) -> CorrelationLink:
+        """تسجيل رابط وإبلاغ المستمعين"""
+        for first, second in ((owner, target_id), (target_id, owner)):
+            adjacent = self.neighbors[first]
+            adjacent[second] = adjacent.get(second, 0) + 1
+        self.stats['links'] += 1
+        link = CorrelationLink(self.target_names[owner], self.target_names[target_id], kind, value)
+        for listener in self.listeners:
+            try:
+                listener(link)
+            except Exception as e:
+                self.logger.warning(f"مستمع الروابط فشل: {e}")
+        return link
+
+    def related_targets(self, target: str) -> Dict[str, int]:
+        """الأهداف المرتبطة بهدف مع عدد الكيانات المشتركة"""
+        target_id = self.target_ids.get(target)
+        if target_id is None or target_id not in self.neighbors:
+            return {}
+        return {
+            self.target_names[other]: weight
+            for other, weight in self.neighbors[target_id].items()
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """إحصائيات الفهرس"""
+        return {
+            **self.stats,
+            'targets': len(self.target_names),
+            'indexed_keys': len(self.postings),
+            'linked_pairs': sum(len(adjacent) for adjacent in self.neighbors.values()) // 2
+        }
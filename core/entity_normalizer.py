@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+تطبيع الكيانات وإزالة المكرر
+Entity Normalization and Deduplication
+
+يحوّل الهواتف إلى E.164، والإيميلات إلى أحرف صغيرة دون وسم "+"،
+والنطاقات إلى صيغة IDNA (punycode)، فتتطابق الصيغ المختلفة لنفس الكيان.
+إزالة المكرر على نطاق كبير تتم ببصمات 64 بت في فهرس من مصفوفات مرتبة
+(8 بايت لكل كيان فريد) بدلاً من مجموعة نصوص.
+"""
+
+import re
+from encodings import idna
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from config.settings import Settings
+
+_NON_DIGITS = re.compile(r'\D')
+
+# حدود طول الرقم الدولي دون "+" (E.164 حتى 15 رقماً)
+E164_MIN_DIGITS = 7
+E164_MAX_DIGITS = 15
+
+def normalize_phone(value: Any, country_code: Optional[str] = None) -> Optional[str]:
+    """هاتف بصيغة E.164 (مثل +12025550123)
+
+    الأرقام المحلية تُكمل برمز الدولة الافتراضي: الصفر الأول بادئة محلية
+    تُحذف، والرقم الذي يبدأ برمز الدولة يُعد دولياً دون "+".
+    """
+    value = str(value).strip()
+    digits = _NON_DIGITS.sub('', value)
+    if value.startswith('+'):
+        number = digits
+    elif digits.startswith('00'):
+        number = digits[2:]
+    else:
+        country_code = country_code or Settings.PHONE_DEFAULT_COUNTRY_CODE
+        if digits.startswith('0'):
+            number = country_code + digits[1:]
+        elif digits.startswith(country_code):
+            number = digits
+        else:
+            number = country_code + digits
+    if not E164_MIN_DIGITS <= len(number) <= E164_MAX_DIGITS or number[0] == '0':
+        return None
+    return '+' + number
+
+@lru_cache(maxsize=65536)
+def idna_label(label: str) -> str:
+    """مقطع نطاق دولي بصيغة punycode (المقاطع تتكرر كثيراً بين النطاقات)"""
+    return idna.ToASCII(label).decode('ascii')
+
+def normalize_domain(value: Any) -> Optional[str]:
+    """نطاق بأحرف صغيرة دون النقطة الأخيرة، والأسماء الدولية بصيغة punycode"""
+    host = str(value).strip().rstrip('.').lower()
+    if not host:
+        return None
+    if not host.isascii():
+        # فقط المقاطع غير ASCII تمر بـ IDNA (nameprep بطيء)
+        try:
+            host = '.'.join(
+                label if label.isascii() else idna_label(label)
+                for label in idna.dots.split(host)
+            )
+        except UnicodeError:
+            return None
+    return host
+
+def normalize_email(value: Any) -> Optional[str]:
+    """إيميل بأحرف صغيرة دون وسم "+" ونطاقه بصيغة IDNA"""
+    local, separator, domain = str(value).strip().rpartition('@')
+    if not separator:
+        return None
+    local = local.split('+', 1)[0].lower()
+    domain = normalize_domain(domain)
+    if not local or not domain:
+        return None
+    return f"{local}@{domain}"
+
+NORMALIZERS: Dict[str, Callable[[Any], Optional[str]]] = {
+    'phone': normalize_phone,
+    'email': normalize_email,
+    'domain': normalize_domain
+}
+
+def canonicalize(kind: str, value: Any) -> Optional[str]:
+    """الصيغة الموحدة لكيان (None إذا كان غير صالح)"""
+    normalize = NORMALIZERS.get(kind)
+    if normalize is None:
+        value = str(value).strip()
+        return value or None
+    return normalize(value)
+
+def canonical_key(kind: str, canonical: str) -> int:
+    """بصمة 64 بت للنوع والصيغة الموحدة
+
+    النوع جزء من البصمة لأن الأنواع دون مطبّع (مثل معرفات الحسابات) قد
+    تطابق صيغة نطاق أو غيره، والبصمة صالحة داخل العملية فقط فلا تُحفظ.
+    """
+    return hash((kind, canonical))
+
+def dedupe_contacts(kind: str, values: Iterable[Any]) -> List[str]:
+    """الصيغ الموحدة الفريدة لقائمة جهات اتصال (بترتيب أول ظهور)"""
+    normalize = NORMALIZERS[kind]
+    unique = {}
+    for value in values:
+        canonical = normalize(value)
+        if canonical is not None:
+            unique.setdefault(canonical, None)
+    return list(unique)
+
+class CanonicalKeySet:
+    """مجموعة بصمات مضغوطة: مصفوفات int64 مرتبة تُدمج تدريجياً
+
+    كل دفعة جديدة تُرتب وتُضاف كمصفوفة، والمصفوفات المتقاربة في الحجم
+    تُدمج (كعداد ثنائي) فيبقى عددها لوغاريتمياً والبحث بـ searchsorted.
+    """
+    def __init__(self):
+        self.runs: List[np.ndarray] = []
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, key: int) -> bool:
+        return bool(self.contains(np.array([key], dtype=np.int64))[0])
+
+    def contains(self, keys: np.ndarray) -> np.ndarray:
+        """قناع البصمات الموجودة مسبقاً"""
+        found = np.zeros(len(keys), dtype=bool)
+        for run in self.runs:
+            positions = np.minimum(np.searchsorted(run, keys), len(run) - 1)
+            found |= run[positions] == keys
+        return found
+
+    def add_batch(self, keys: Iterable[int]) -> np.ndarray:
+        """إضافة دفعة بصمات وإرجاع قناع أول ظهور لكل بصمة جديدة"""
+        keys = np.fromiter(keys, dtype=np.int64) if not isinstance(keys, np.ndarray) else keys
+        unique, first = np.unique(keys, return_index=True)
+        fresh = ~self.contains(unique)
+        added = unique[fresh]
+        if len(added):
+            self.runs.append(added)
+            self.size += len(added)
+            self.compact()
+        mask = np.zeros(len(keys), dtype=bool)
+        mask[first[fresh]] = True
+        return mask
+
+    def compact(self):
+        """دمج آخر مصفوفتين ما دامت السابقة لا تزيد عن ضعف الأخيرة"""
+        runs = self.runs
+        while len(runs) > 1 and len(runs[-2]) <= 2 * len(runs[-1]):
+            last = runs.pop()
+            merged = np.concatenate([runs.pop(), last])
+            merged.sort(kind='stable')
+            runs.append(merged)
+
+class EntityDeduplicator:
+    """مرحلة تطبيع وإزالة مكرر لتدفق كيانات (النوع، القيمة الخام)"""
+    def __init__(self, batch_size: int = 65536):
+        self.batch_size = batch_size
+        self.keys = CanonicalKeySet()
+        self.stats = {'raw': 0, 'invalid': 0, 'unique': 0}
+
+    def dedupe_batch(self, entities: List[Tuple[str, Any]]) -> List[Tuple[str, str]]:
+        """الكيانات الجديدة الموحدة في دفعة (بترتيب أول ظهور)"""
+        self.stats['raw'] += len(entities)
+        canonical = []
+        # القيم الخام المكررة داخل الدفعة تُطبع مرة واحدة
+        distinct = dict.fromkeys(entities)
+        normalizers = NORMALIZERS
+        for kind, value in distinct:
+            normalize = normalizers.get(kind)
+            normalized = normalize(value) if normalize else canonicalize(kind, value)
+            if normalized is not None:
+                canonical.append((kind, normalized))
+        self.stats['invalid'] += len(distinct) - len(canonical)
+        if not canonical:
+            return []
+
+        mask = self.keys.add_batch([canonical_key(kind, value) for kind, value in canonical])
+        fresh = [canonical[i] for i in np.flatnonzero(mask).tolist()]
+        self.stats['unique'] += len(fresh)
+        return fresh
+
+    def dedupe_stream(self, entities: Iterable[Tuple[str, Any]]) -> Iterator[Tuple[str, str]]:
+        """تدفق الكيانات الموحدة الفريدة دفعة بعد دفعة"""
+        entities = iter(entities)
+        while True:
+            batch = list(islice(entities, self.batch_size))
+            if not batch:
+                return
+            yield from self.dedupe_batch(batch)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """إحصائيات المرحلة"""
+        return {**self.stats, 'index_bytes': sum(run.nbytes for run in self.keys.runs)}
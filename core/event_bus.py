@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+ناقل أحداث التحقيقات
+Investigation Event Bus
+
+نشر/اشتراك داخل العملية: كل مشترك له طابور محدود، والمشترك البطيء
+الذي يمتلئ طابوره يُفصل بدلاً من إبطاء المسح.
+"""
+
+import asyncio
+import contextvars
+import logging
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional, Set
+from config.settings import Settings
+
+# الأحداث التي تنهي بث التحقيق
+TERMINAL_EVENTS = ('investigation_completed', 'investigation_failed')
+
+# علامة إغلاق الاشتراك داخل الطابور
+_CLOSED = object()
+
+# ناشر أحداث المسح الحالي (يُورث تلقائياً للمهام الفرعية)
+scan_event_sink: contextvars.ContextVar[Optional[Callable[[str, Dict[str, Any]], None]]] = \
+    contextvars.ContextVar('scan_event_sink', default=None)
+
+def emit_scan_event(event: str, **data: Any):
+    """نشر حدث للمسح الجاري إن وُجد مستمع"""
+    sink = scan_event_sink.get()
+    if sink is not None:
+        sink(event, data)
+
+class Subscription:
+    """اشتراك في موضوع واحد بطابور محدود"""
+    def __init__(self, bus: "EventBus", topic: str, max_queue: int):
+        self.bus = bus
+        self.topic = topic
+        self.queue: asyncio.Queue = asyncio.Queue(max_queue)
+        self.dropped = False
+        self.closed = False
+        self.finished = False
+
+    def offer(self, event: Dict[str, Any]) -> bool:
+        """إضافة حدث دون انتظار؛ False إذا امتلأ الطابور"""
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def end(self):
+        """إنهاء الاشتراك مع ضمان وصول علامة الإغلاق"""
+        if self.closed:
+            return
+        self.closed = True
+        if self.queue.full():
+            # المشترك متأخر أصلاً؛ الأحداث القديمة لا قيمة لها بعد الفصل
+            while not self.queue.empty():
+                self.queue.get_nowait()
+        self.queue.put_nowait(_CLOSED)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """الحدث التالي، أو None عند انتهاء المهلة أو إغلاق الاشتراك"""
+        if self.finished:
+            return None
+        try:
+            event = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if event is _CLOSED:
+            self.finished = True
+            return None
+        return event
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        event = await self.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+    def close(self):
+        """إلغاء الاشتراك"""
+        self.bus.unsubscribe(self)
+
+class EventBus:
+    """ناقل أحداث داخل العملية يوزع كل حدث على مشتركي موضوعه"""
+    def __init__(self, max_queue: Optional[int] = None):
+        self.logger = logging.getLogger(__name__)
+        self.max_queue = max_queue or Settings.EVENT_QUEUE_SIZE
+        self.subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+        self.sequences: Dict[str, int] = defaultdict(int)
+        self.stats = {'published': 0, 'delivered': 0, 'dropped_subscribers': 0}
+
+    def subscribe(self, topic: str, max_queue: Optional[int] = None) -> Subscription:
+        """اشتراك جديد في موضوع"""
+        subscription = Subscription(self, topic, max_queue or self.max_queue)
+        self.subscribers[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """إزالة اشتراك"""
+        subscribers = self.subscribers.get(subscription.topic)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self.subscribers[subscription.topic]
+        subscription.end()
+
+    def publish(self, topic: str, event: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """نشر حدث دون انتظار أي مشترك"""
+        self.sequences[topic] += 1
+        message = {
+            'seq': self.sequences[topic],
+            'event': event,
+            'topic': topic,
+            'timestamp': time.time(),
+            'data': data or {}
+        }
+        self.stats['published'] += 1
+
+        for subscription in list(self.subscribers.get(topic, ())):
+            if subscription.offer(message):
+                self.stats['delivered'] += 1
+            else:
+                self.logger.warning(f"🐢 فصل مشترك بطيء عن {topic}")
+                subscription.dropped = True
+                self.stats['dropped_subscribers'] += 1
+                self.unsubscribe(subscription)
+
+        if event in TERMINAL_EVENTS:
+            self.close_topic(topic)
+        return message
+
+    def close_topic(self, topic: str):
+        """إنهاء جميع اشتراكات الموضوع"""
+        for subscription in list(self.subscribers.pop(topic, ())):
+            subscription.end()
+        self.sequences.pop(topic, None)
+
+    def sink(self, topic: str) -> Callable[[str, Dict[str, Any]], None]:
+        """دالة نشر مرتبطة بموضوع (تُمرر إلى المحرك)"""
+        def publish(event: str, data: Dict[str, Any]):
+            self.publish(topic, event, data)
+        return publish
+
+    def get_stats(self) -> Dict[str, Any]:
+        """إحصائيات الناقل"""
+        return {
+            **self.stats,
+            'topics': len(self.subscribers),
+            'subscribers': sum(len(subscribers) for subscribers in self.subscribers.values())
+        }
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+مقاييس الأداء
+Performance Metrics
+
+سجل خفيف لمدرجات زمن العمليات وعدادات الأخطاء ومقاييس العمليات الجارية
+وأعماق الطوابير، يُعرض بصيغة Prometheus النصية أو كملخص JSON. المسح
+الجاري يجمع أزمنته الخاصة عبر ContextVar فتُرفق بنتائجه.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# حدود المدرج بالثواني (من عمليات الذاكرة حتى مراحل المسح الطويلة)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+def format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """وسوم السلسلة بصيغة Prometheus"""
+    pairs = [
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def format_value(value: float) -> str:
+    """قيمة رقمية بصيغة Prometheus"""
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Metric:
+    """مقياس بوسوم: كل تركيبة قيم وسوم سلسلة مستقلة"""
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 lock: Optional[threading.Lock] = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.series: Dict[Tuple[str, ...], Any] = {}
+        # مقاييس تُحدّث معاً قد تتشارك قفلاً واحداً
+        self.lock = lock or threading.Lock()
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        """(اللاحقة، الوسوم، القيمة) لكل عينة"""
+        with self.lock:
+            series = list(self.series.items())
+        for labels, value in series:
+            yield '', format_labels(self.labelnames, labels), value
+
+    def render(self) -> List[str]:
+        """أسطر المقياس بصيغة Prometheus"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {format_value(value)}")
+        return lines
+
+class Counter(Metric):
+    """عداد تراكمي"""
+    kind = 'counter'
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self.lock:
+            self.add(labels, amount)
+
+    def add(self, labels: Tuple[str, ...], amount: float):
+        """زيادة دون قفل (المستدعي يحمل القفل)"""
+        self.series[labels] = self.series.get(labels, 0) + amount
+
+    def summary(self) -> Dict[str, Any]:
+        with self.lock:
+            return {'/'.join(labels): value for labels, value in self.series.items()}
+
+class Gauge(Metric):
+    """قيمة لحظية (عمليات جارية، عمق طابور)"""
+    kind = 'gauge'
+
+    def set(self, value: float, *labels: str):
+        self.series[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self.lock:
+            self.add(labels, amount)
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def add(self, labels: Tuple[str, ...], amount: float):
+        """زيادة دون قفل (المستدعي يحمل القفل)"""
+        self.series[labels] = self.series.get(labels, 0) + amount
+
+    def summary(self) -> Dict[str, Any]:
+        with self.lock:
+            return {'/'.join(labels): value for labels, value in self.series.items()}
+
+class Histogram(Metric):
+    """مدرج زمني بحدود ثابتة: [عدادات الفئات، المجموع، العدد] لكل سلسلة"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, lock: Optional[threading.Lock] = None):
+        super().__init__(name, documentation, labelnames, lock)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str):
+        with self.lock:
+            self.record(labels, value)
+
+    def record(self, labels: Tuple[str, ...], value: float):
+        """تسجيل قيمة دون قفل (المستدعي يحمل القفل)"""
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        # الحد الأعلى شامل (le): أول حد لا يقل عن القيمة
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def snapshot(self) -> List[Tuple[Tuple[str, ...], List[int], float, int]]:
+        with self.lock:
+            return [(labels, list(counts), total, count) for labels, (counts, total, count) in self.series.items()]
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        for labels, counts, total, count in self.snapshot():
+            cumulative = 0
+            for bound, hits in zip(self.buckets + (float('inf'),), counts):
+                cumulative += hits
+                yield '_bucket', format_labels(self.labelnames, labels, f'le="{format_value(float(bound))}"'), cumulative
+            yield '_sum', format_labels(self.labelnames, labels), total
+            yield '_count', format_labels(self.labelnames, labels), count
+
+    def quantile(self, counts: List[int], count: int, q: float) -> Optional[float]:
+        """تقدير المئين من الفئات (الحد الأعلى للفئة، None فوق آخر حد)"""
+        rank = q * count
+        cumulative = 0
+        for bound, hits in zip(self.buckets, counts):
+            cumulative += hits
+            if cumulative >= rank:
+                return bound
+        return None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            '/'.join(labels): {
+                'count': count,
+                'sum': total,
+                'mean': total / count if count else 0.0,
+                'p50': self.quantile(counts, count, 0.5),
+                'p95': self.quantile(counts, count, 0.95),
+                'p99': self.quantile(counts, count, 0.99)
+            }
+            for labels, counts, total, count in self.snapshot()
+        }
+
+class MetricsRegistry:
+    """سجل المقاييس"""
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        existing = self.metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                lock: Optional[threading.Lock] = None) -> Counter:
+        return self.register(Counter(name, documentation, labelnames, lock))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+              lock: Optional[threading.Lock] = None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, lock))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS, lock: Optional[threading.Lock] = None) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets, lock))
+
+    def render_prometheus(self) -> str:
+        """جميع المقاييس بصيغة Prometheus النصية"""
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def summary(self) -> Dict[str, Any]:
+        """ملخص JSON لجميع المقاييس"""
+        return {name: metric.summary() for name, metric in self.metrics.items()}
+
+# السجل المشترك والمقاييس الأساسية (مقاييس العمليات تتشارك قفلاً واحداً
+# فيُحدّث track الثلاثة بقفل واحد عند البداية وآخر عند النهاية)
+metrics = MetricsRegistry()
+_OPERATION_LOCK = threading.Lock()
+OPERATION_SECONDS = metrics.histogram(
+    'osint_operation_seconds', 'Operation latency in seconds', ('component', 'operation'),
+    lock=_OPERATION_LOCK
+)
+OPERATIONS_IN_FLIGHT = metrics.gauge(
+    'osint_operations_in_flight', 'Operations currently running', ('component', 'operation'),
+    lock=_OPERATION_LOCK
+)
+OPERATION_ERRORS = metrics.counter(
+    'osint_operation_errors_total', 'Failed operations', ('component', 'operation'),
+    lock=_OPERATION_LOCK
+)
+QUEUE_DEPTH = metrics.gauge('osint_queue_depth', 'Items waiting in a queue', ('queue',))
+
+class ScanMetrics:
+    """أزمنة مسح واحد: [العدد، المجموع، الأقصى، الأخطاء] لكل عملية"""
+    def __init__(self):
+        self.operations: Dict[Tuple[str, str], List[float]] = {}
+
+    def entry(self, component: str, operation: str) -> List[float]:
+        entry = self.operations.get((component, operation))
+        if entry is None:
+            entry = self.operations[(component, operation)] = [0, 0.0, 0.0, 0]
+        return entry
+
+    def record(self, component: str, operation: str, seconds: float, failed: bool):
+        entry = self.entry(component, operation)
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+        entry[3] += failed
+
+    def record_error(self, component: str, operation: str):
+        self.entry(component, operation)[3] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """ملخص الأزمنة مجمعاً حسب المكوّن"""
+        summary: Dict[str, Dict[str, Any]] = {}
+        for (component, operation), (count, total, longest, errors) in self.operations.items():
+            summary.setdefault(component, {})[operation] = {
+                'count': count,
+                'total_seconds': total,
+                'mean_seconds': total / count if count else 0.0,
+                'max_seconds': longest,
+                'errors': errors
+            }
+        # أعماق الطوابير مشتركة بين جميع المسوح الجارية: لقطة للعملية كلها عند الطلب لا قيم هذا المسح
+        summary['process_queues'] = QUEUE_DEPTH.summary()
+        return summary
+
+# أزمنة المسح الجاري (تنتقل إلى جميع المهام الفرعية تلقائياً)
+scan_metrics: ContextVar[Optional[ScanMetrics]] = ContextVar('scan_metrics', default=None)
+
+class track:
+    """قياس زمن عملية وعدّها جارية، وعدّ الاستثناءات التي تمر عبرها كأخطاء
+
+    صنف بدلاً من contextmanager لأن كلفة المولّد تتكرر مع كل عملية.
+    """
+    __slots__ = ('labels', 'start')
+
+    def __init__(self, component: str, operation: str):
+        self.labels = (component, operation)
+
+    def __enter__(self):
+        with _OPERATION_LOCK:
+            OPERATIONS_IN_FLIGHT.add(self.labels, 1)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        elapsed = time.perf_counter() - self.start
+        labels = self.labels
+        failed = exc_type is not None
+        with _OPERATION_LOCK:
+            OPERATION_SECONDS.record(labels, elapsed)
+            OPERATIONS_IN_FLIGHT.add(labels, -1)
+            if failed:
+                OPERATION_ERRORS.add(labels, 1)
+        recorder = scan_metrics.get()
+        if recorder is not None:
+            recorder.record(labels[0], labels[1], elapsed, failed)
+        return False
+
+def record_error(component: str, operation: str):
+    """تسجيل خطأ عولج داخل العملية دون أن يمر عبر track"""
+    OPERATION_ERRORS.inc(component, operation)
+    recorder = scan_metrics.get()
+    if recorder is not None:
+        recorder.record_error(component, operation)
+
+def timed(component: str, operation: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """مزخرف يقيس الدالة (متزامنة أو غير متزامنة) بـ track"""
+    def decorator(func: Callable) -> Callable:
+        name = operation or func.__name__
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with track(component, name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with track(component, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
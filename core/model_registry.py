@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+سجل النماذج الكسول
+Lazy Model Registry
+"""
+
+import importlib
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+def lazy_import(module_name: str):
+    """استيراد وحدة ثقيلة عند الحاجة فقط"""
+    return importlib.import_module(module_name)
+
+class ModelRegistry:
+    """سجل مشترك للنماذج يبني كل نموذج عند أول استخدام"""
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.factories: Dict[str, Callable[[], Any]] = {}
+        self.versions: Dict[str, str] = {}
+        self.models: Dict[str, Any] = {}
+        self.load_locks: Dict[str, threading.Lock] = {}
+        self.registry_lock = threading.Lock()
+        self.warmup_thread: Optional[threading.Thread] = None
+
+    def register(self, name: str, factory: Callable[[], Any], version: Optional[str] = None):
+        """تسجيل دالة بناء نموذج دون تحميله"""
+        with self.registry_lock:
+            self.factories[name] = factory
+            self.versions[name] = version or getattr(factory, 'version', name)
+            self.load_locks.setdefault(name, threading.Lock())
+            self.models.pop(name, None)
+
+    def get_version(self, name: str) -> str:
+        """معرف إصدار النموذج (يُستخدم في مفاتيح الذاكرة المؤقتة)"""
+        return self.versions.get(name, name)
+
+    def is_loaded(self, name: str) -> bool:
+        """هل تم تحميل النموذج مسبقاً"""
+        return name in self.models
+
+    def get(self, name: str) -> Any:
+        """الحصول على النموذج وبناؤه عند أول طلب"""
+        model = self.models.get(name)
+        if model is not None:
+            return model
+
+        if name not in self.factories:
+            raise KeyError(f"نموذج غير مسجل: {name}")
+
+        # قفل لكل نموذج حتى لا يُبنى نفس النموذج مرتين بالتوازي
+        with self.load_locks[name]:
+            model = self.models.get(name)
+            if model is not None:
+                return model
+
+            self.logger.info(f"🧠 تحميل النموذج عند الطلب: {name}")
+            try:
+                model = self.factories[name]()
+                self.models[name] = model
+            except Exception as e:
+                self.logger.error(f"فشل تحميل النموذج {name}: {e}")
+                return None
+
+        return model
+
+    def warm_up(self, names: Optional[List[str]] = None, background: bool = True) -> Optional[threading.Thread]:
+        """تسخين النماذج مسبقاً في خيط خلفي"""
+        names = list(names or self.factories.keys())
+
+        def load_all():
+            for name in names:
+                self.get(name)
+
+        if not background:
+            load_all()
+            return None
+
+        if self.warmup_thread is None or not self.warmup_thread.is_alive():
+            self.warmup_thread = threading.Thread(
+                target=load_all,
+                name="model-warmup",
+                daemon=True
+            )
+            self.warmup_thread.start()
+        return self.warmup_thread
+
+    def unload(self, name: Optional[str] = None):
+        """تفريغ نموذج أو جميع النماذج من الذاكرة"""
+        with self.registry_lock:
+            if name is None:
+                self.models.clear()
+            else:
+                self.models.pop(name, None)
+
+def build_pipeline(task: str, model: str, **kwargs) -> Callable[[], Any]:
+    """دالة بناء خط transformers مؤجلة"""
+    def factory():
+        transformers = lazy_import("transformers")
+        return transformers.pipeline(task, model=model, **kwargs)
+    factory.version = f"{task}:{model}:{kwargs.get('revision', 'main')}"
+    return factory
+
+def build_voice_recognizer():
+    """بناء محلل الصوت"""
+    sr = lazy_import("speech_recognition")
+    return sr.Recognizer()
+
+# السجل المشترك بين جميع المحركات
+model_registry = ModelRegistry()
+
+model_registry.register(
+    "dialog_rpt",
+    build_pipeline("text-classification", "microsoft/DialogRPT-updown")
+)
+model_registry.register(
+    "beit_large",
+    build_pipeline("image-classification", "microsoft/beit-large-patch16-224")
+)
+model_registry.register("voice_recognizer", build_voice_recognizer)
+model_registry.register(
+    "sentiment",
+    build_pipeline("sentiment-analysis", "cardiffnlp/twitter-roberta-base-sentiment-latest")
+)
+model_registry.register(
+    "ner",
+    build_pipeline("ner", "dslim/bert-base-NER", aggregation_strategy="simple")
+)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+محلل أداء المسح
+Scan Profiler
+
+يأخذ عينات من مكدسات جميع الخيوط على فترات ثابتة (دون تتبع كل استدعاء)
+ويكتبها بصيغة collapsed stacks لأدوات flamegraph، ويكتب تقرير ذاكرة عند
+بداية ونهاية كل مرحلة: لقطات tracemalloc بأكبر مواقع التخصيص في التحليل
+المطلوب صراحة، أو الذاكرة المقيمة وعدد الكتل المخصصة فقط في عينات التحقيقات
+التلقائية (تتبع كل تخصيص يبطئ الكود كثيف التخصيص عدة أضعاف، ومسح كل كائنات
+الكومة يوقف حلقة الأحداث عند كل حد مرحلة).
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+from config.settings import Settings
+
+# أطراف مكدسات الخيوط الخاملة (عمال المجمعات بانتظار مهام) لا تُحتسب
+IDLE_LEAVES = {('threading.py', 'wait'), ('queue.py', 'get'), ('thread.py', '_worker')}
+
+# أحداث المسح التي تُلتقط عندها لقطة ذاكرة
+BOUNDARY_EVENTS = ('phase_started', 'phase_finished')
+
+# ملفات لا تظهر في تقرير التخصيص (المحلل نفسه)
+IGNORED_ALLOCATION_FILES = (tracemalloc.__file__, __file__)
+
+def frame_label(code) -> str:
+    """اسم الإطار في المكدس: الدالة (الملف:السطر الأول)"""
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+def resident_memory() -> int:
+    """الذاكرة المقيمة الحالية بالبايت (0 إذا لم تتوفر)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+class StackSampler:
+    """أخذ عينات مكدسات جميع الخيوط من خيط منفصل"""
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.stopped = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="scan-profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+
+    def run(self):
+        own_ident = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                leaf = (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name)
+                if leaf in IDLE_LEAVES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def write_collapsed(self, path: str):
+        """كتابة المكدسات بصيغة collapsed (سطر لكل مكدس مع عدد العينات)"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+class ScanProfiler:
+    """محلل أداء مسح واحد
+
+    يعمل محلل واحد فقط في كل مرة لأن tracemalloc وعينات الخيوط على مستوى
+    العملية (العينات تشمل أي عمل آخر يجري في نفس العملية)؛ إذا كان محلل
+    آخر يعمل يُنفذ المسح دون تحليل.
+
+        with ScanProfiler("osint_results_20240101") as profiler:
+            await engine.comprehensive_scan(targets, event_callback=profiler.wrap_events(callback))
+        profiler.report  # مسارات الملفات والإحصائيات
+    """
+    _active_lock = threading.Lock()
+    _active = False
+
+    def __init__(self, output_prefix: str,
+                 trace_allocations: bool = True,
+                 interval_ms: Optional[float] = None,
+                 trace_frames: Optional[int] = None,
+                 top_allocations: Optional[int] = None):
+        self.logger = logging.getLogger(__name__)
+        self.output_prefix = output_prefix
+        self.trace_allocations = trace_allocations
+        self.interval = (interval_ms or Settings.PROFILE_INTERVAL_MS) / 1000
+        self.trace_frames = trace_frames or Settings.PROFILE_TRACE_FRAMES
+        self.top_allocations = top_allocations or Settings.PROFILE_TOP_ALLOCATIONS
+        self.sampler: Optional[StackSampler] = None
+        self.started_tracing = False
+        # آخر لقطة (tracemalloc أو الذاكرة المقيمة والكتل) للمقارنة بالحد التالي
+        self.previous_snapshot = None
+        self.allocation_sections: List[str] = []
+        self.started_at = 0.0
+        self.report: Optional[Dict[str, Any]] = None
+
+    @property
+    def running(self) -> bool:
+        return self.sampler is not None
+
+    def start(self) -> bool:
+        """بدء التحليل (False إذا كان محلل آخر يعمل)"""
+        with ScanProfiler._active_lock:
+            if ScanProfiler._active:
+                self.logger.warning("⚠️ محلل أداء آخر يعمل، تنفيذ المسح دون تحليل")
+                return False
+            ScanProfiler._active = True
+
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+            self.started_tracing = True
+        self.started_at = time.perf_counter()
+        self.mark('scan_started')
+        self.sampler = StackSampler(self.interval)
+        self.sampler.start()
+        return True
+
+    def mark(self, label: str):
+        """تقرير ذاكرة عند حد مرحلة بأكبر التغيرات منذ الحد السابق"""
+        try:
+            elapsed = time.perf_counter() - self.started_at
+            if self.started_tracing:
+                lines = self.allocation_lines(label, elapsed)
+            else:
+                lines = self.census_lines(label, elapsed)
+            self.allocation_sections.append('\n'.join(lines))
+        except Exception as e:
+            self.logger.warning(f"لقطة الذاكرة فشلت: {e}")
+
+    def allocation_lines(self, label: str, elapsed: float) -> List[str]:
+        """أكبر مواقع التخصيص (بالسطر) من لقطة tracemalloc"""
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [
+            f"== {label} @ {elapsed:.3f}s: traced {current / 2 ** 20:.1f} MiB,"
+            f" peak {peak / 2 ** 20:.1f} MiB =="
+        ]
+        if self.previous_snapshot is None:
+            stats = snapshot.statistics('lineno')
+        else:
+            stats = snapshot.compare_to(self.previous_snapshot, 'lineno')
+        # الترشيح بعد التجميع أرخص بكثير من filter_traces على كل اللقطة
+        stats = [
+            stat for stat in stats
+            if stat.traceback[0].filename not in IGNORED_ALLOCATION_FILES
+        ]
+        lines.extend(str(stat) for stat in stats[:self.top_allocations])
+        self.previous_snapshot = snapshot
+        return lines
+
+    def census_lines(self, label: str, elapsed: float) -> List[str]:
+        """إحصاء خفيف بكلفة ثابتة: الذاكرة المقيمة والكتل المخصصة وتغيرهما منذ الحد السابق
+
+        لا يمر على كائنات الكومة (gc.get_objects) لأنه يُستدعى في خيط حلقة الأحداث.
+        """
+        rss, blocks = resident_memory(), sys.getallocatedblocks()
+        previous_rss, previous_blocks = self.previous_snapshot or (rss, blocks)
+        self.previous_snapshot = (rss, blocks)
+        return [
+            f"== {label} @ {elapsed:.3f}s: rss {rss / 2 ** 20:.1f} MiB"
+            f" ({(rss - previous_rss) / 2 ** 20:+.1f}),"
+            f" allocated blocks {blocks} ({blocks - previous_blocks:+d}) =="
+        ]
+
+    def wrap_events(self, callback: Optional[Callable[[str, Dict[str, Any]], None]]
+                    ) -> Optional[Callable[[str, Dict[str, Any]], None]]:
+        """مستقبل أحداث يلتقط لقطة ذاكرة عند حدود المراحل ثم يمرر الحدث"""
+        if not self.running:
+            return callback
+
+        def on_event(event: str, data: Dict[str, Any]):
+            if event in BOUNDARY_EVENTS:
+                self.mark(f"{event}:{data.get('phase')}")
+            if callback is not None:
+                callback(event, data)
+
+        return on_event
+
+    def stop(self) -> Optional[Dict[str, Any]]:
+        """إيقاف التحليل وكتابة الملفات"""
+        if not self.running:
+            return None
+        self.sampler.stop()
+        duration = time.perf_counter() - self.started_at
+        try:
+            self.mark('scan_finished')
+            directory = os.path.dirname(self.output_prefix)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            collapsed_path = f"{self.output_prefix}.collapsed"
+            self.sampler.write_collapsed(collapsed_path)
+            allocations_path = None
+            if self.allocation_sections:
+                allocations_path = f"{self.output_prefix}.allocations.txt"
+                with open(allocations_path, 'w', encoding='utf-8') as f:
+                    f.write('\n\n'.join(self.allocation_sections))
+                    f.write('\n')
+            self.report = {
+                'duration_seconds': duration,
+                'samples': self.sampler.samples,
+                'interval_ms': self.interval * 1000,
+                'collapsed_stacks': collapsed_path,
+                'allocations': allocations_path
+            }
+            self.logger.info(f"🔬 تقرير الأداء: {collapsed_path}")
+        finally:
+            if self.started_tracing:
+                tracemalloc.stop()
+            self.previous_snapshot = None
+            self.sampler = None
+            with ScanProfiler._active_lock:
+                ScanProfiler._active = False
+        return self.report
+
+    def __enter__(self) -> 'ScanProfiler':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.stop()
+        return False
@@ -6,137 +6,449 @@ Quantum Parallel Processor
 
 import asyncio
 import concurrent.futures
-from typing import List, Dict, Any
+import inspect
+import json
+import os
+import tempfile
+from typing import List, Dict, Any, AsyncIterator, Callable, Iterable, Iterator, NamedTuple, Optional, Sequence, Tuple
 import logging
 from datetime import datetime
+import numpy as np
+from config.settings import Settings
+from core.analysis_workers import init_worker
+from core.batch_scoring import ResultScores, score_results
+from core.event_bus import emit_scan_event
+from core.metrics import QUEUE_DEPTH, record_error, track
+
+# علامة انتهاء المهام للعمال
+_STOP = object()
+
+class CPUTask(NamedTuple):
+    """مهمة كثيفة المعالجة تُوجّه إلى مجمع العمليات
+
+    يجب أن تكون func دالة على مستوى وحدة وأن تكون args قابلة للتسلسل.
+    """
+    func: Callable
+    args: tuple = ()
+
+def cpu_task(func: Callable, *args) -> CPUTask:
+    """تعريف مهمة من نوع cpu"""
+    return CPUTask(func, args)
+
+def run_task_chunk(chunk: List[CPUTask]) -> List[Tuple[bool, Any]]:
+    """تنفيذ دفعة مهام داخل عملية عامل (نتيجة كل مهمة مستقلة عن الأخرى)"""
+    results = []
+    for task in chunk:
+        try:
+            results.append((True, task.func(*task.args)))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+def close_unstarted(tasks: Iterable[Any]):
+    """إغلاق كائنات coroutine لم تُسلّم لأي عامل (تجنب تحذير "never awaited")"""
+    if inspect.isgenerator(tasks):
+        # المولد لم ينشئ بقية المهام بعد
+        tasks.close()
+        return
+    for task in tasks:
+        if inspect.iscoroutine(task):
+            task.close()
 
 class QuantumParallelProcessor:
-    def __init__(self, max_workers: int = 50):
+    def __init__(self,
+                 max_workers: int = 50,
+                 queue_size: Optional[int] = None,
+                 backend: Optional[str] = None,
+                 process_workers: Optional[int] = None,
+                 chunk_size: Optional[int] = None,
+                 initializer: Optional[Callable] = init_worker,
+                 initargs: tuple = (),
+                 score_batch_size: Optional[int] = None,
+                 score_max_wait: Optional[float] = None):
         self.max_workers = max_workers
+        self.queue_size = queue_size or max_workers * 4
+        self.backend = backend or Settings.PARALLEL_BACKEND
+        if self.backend not in ('auto', 'thread', 'process'):
+            raise ValueError(f"نوع تنفيذ غير معروف: {self.backend}")
+        self.process_workers = process_workers or Settings.PROCESS_WORKERS
+        self.chunk_size = chunk_size or Settings.PROCESS_CHUNK_SIZE
+        self.initializer = initializer
+        self.initargs = initargs
+        self.score_batch_size = score_batch_size or Settings.SCORE_BATCH_SIZE
+        self.score_max_wait = Settings.SCORE_MAX_WAIT_MS / 1000 if score_max_wait is None else score_max_wait
+        self.process_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self.thread_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
         self.logger = logging.getLogger(__name__)
-        self.task_queue = asyncio.Queue()
-        self.results_aggregator = ResultsAggregator()
+        self.task_queue: Optional[asyncio.Queue] = None
+        
+    async def parallel_execution(self, tasks: Iterable[Any],
+                                 aggregator: Optional['ResultsAggregator'] = None) -> Dict[str, Any]:
+        """تنفيذ متوازي للمهام
         
-    async def parallel_execution(self, tasks: List[callable]) -> Dict[str, Any]:
-        """تنفيذ متوازي للمهام"""
-        self.logger.info(f"⚡ بدء التنفيذ المتوازي لـ {len(tasks)} مهمة")
+        كل استدعاء يجمع نتائجه في مجمع خاص به. إذا مرر المستدعي مجمعاً
+        فهو مسؤول عن قراءة النتائج الخام ثم discard()، وإلا يُحذف ملف
+        التفريغ فور حساب الملخص.
+        """
+        owned = aggregator is None
+        results_aggregator = ResultsAggregator() if owned else aggregator
+        total_tasks = len(tasks) if hasattr(tasks, '__len__') else None
+        self.logger.info(f"⚡ بدء التنفيذ المتوازي لـ {total_tasks or '?'} مهمة")
         
         completed_tasks = 0
-        total_tasks = len(tasks)
-        
-        # استخدام ThreadPoolExecutor للتوازي
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # تحويل المهام إلى future objects
-            future_to_task = {
-                executor.submit(task): task 
-                for task in tasks
-            }
+        if total_tasks:
+            results_aggregator.metadata['total_tasks'] += total_tasks
+        
+        # النتائج تُقيّم على دفعات صغيرة: عند امتلاء الدفعة، أو بمؤقت بعد score_max_wait
+        # من أول نتيجة فيها حتى لو توقف وصول النتائج (مهام بطيئة)
+        loop = asyncio.get_running_loop()
+        batch: List[Any] = []
+        flush_timer: Optional[asyncio.TimerHandle] = None
+        timed_flushes = set()
+        
+        def flush_due():
+            nonlocal batch, flush_timer
+            flush_timer = None
+            if batch:
+                due, batch = batch, []
+                flush = asyncio.ensure_future(self.batch_result_processing(due, results_aggregator))
+                timed_flushes.add(flush)
+                flush.add_done_callback(timed_flushes.discard)
+        
+        try:
+            # النتائج تُستهلك فور اكتمالها دون حجب حلقة الأحداث
+            async for _, result in self.execute_stream(tasks):
+                if isinstance(result, Exception):
+                    self.logger.error(f"❌ فشلت المهمة: {result}")
+                    results_aggregator.record_failure()
+                    continue
+                
+                completed_tasks += 1
+                
+                if not batch:
+                    flush_timer = loop.call_later(self.score_max_wait, flush_due)
+                batch.append(result)
+                if len(batch) >= self.score_batch_size:
+                    flush_timer.cancel()
+                    flush_timer = None
+                    full, batch = batch, []
+                    await self.batch_result_processing(full, results_aggregator)
+                
+                # تحديث التقدم
+                if total_tasks and completed_tasks % 10 == 0:
+                    progress = (completed_tasks / total_tasks) * 100
+                    self.logger.info(f"📊 تقدم المعالجة: {progress:.1f}%")
+                    emit_scan_event('tasks_progress', completed=completed_tasks, total=total_tasks)
             
-            # جمع النتائج عند اكتمالها
-            for future in concurrent.futures.as_completed(future_to_task):
-                try:
-                    result = future.result()
-                    completed_tasks += 1
-                    
-                    # معالجة فورية للنتيجة
-                    await self.immediate_result_processing(result)
-                    
-                    # تحديث التقدم
-                    if completed_tasks % 10 == 0:
-                        progress = (completed_tasks / total_tasks) * 100
-                        self.logger.info(f"📊 تقدم المعالجة: {progress:.1f}%")
-                        
-                except Exception as e:
-                    self.logger.error(f"❌ فشلت المهمة: {e}")
+            if batch:
+                full, batch = batch, []
+                await self.batch_result_processing(full, results_aggregator)
+        finally:
+            if flush_timer is not None:
+                flush_timer.cancel()
+            if timed_flushes:
+                await asyncio.gather(*timed_flushes, return_exceptions=True)
+            if owned:
+                results_aggregator.discard()
+        
+        if not total_tasks:
+            results_aggregator.metadata['total_tasks'] += completed_tasks
         
         self.logger.info("✅ اكتمل التنفيذ المتوازي")
-        return self.results_aggregator.get_final_results()
+        return results_aggregator.get_final_results()
     
-    async def immediate_result_processing(self, result):
-        """معالجة فورية للنتائج"""
+    async def execute_stream(self, tasks: Iterable[Any]) -> AsyncIterator[Tuple[int, Any]]:
+        """تنفيذ المهام عبر مجموعة عمال وإرجاع (الفهرس، النتيجة) فور اكتمالها
+        
+        تقبل المهام كائنات coroutine أو دوال غير متزامنة أو دوال عادية؛
+        الدوال العادية تُنفذ في مجمع خيوط عبر run_in_executor، ومهام CPUTask
+        تُجمع في دفعات وتُرسل إلى مجمع العمليات. الطابور محدود الحجم،
+        لذلك يتوقف إدخال المهام إذا تأخر العمال أو المستهلك.
+        """
+        loop = asyncio.get_running_loop()
+        self.task_queue = asyncio.Queue(maxsize=self.queue_size)
+        result_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        executor = self.get_thread_pool()
+        task_queue = self.task_queue
+        pending = iter(tasks)
+        closing = False
+        
+        async def producer():
+            chunk = []
+            try:
+                for index, task in enumerate(pending):
+                    if self.route(task) == 'cpu':
+                        # تجميع مهام المعالجة في دفعات لتقليل كلفة التسلسل
+                        chunk.append((index, self.as_cpu_task(task)))
+                        if len(chunk) >= self.chunk_size:
+                            await task_queue.put(chunk)
+                            chunk = []
+                    else:
+                        try:
+                            await task_queue.put((index, task))
+                        except asyncio.CancelledError:
+                            close_unstarted([task])
+                            raise
+                if chunk:
+                    await task_queue.put(chunk)
+            finally:
+                # العمال يتوقفون حتى لو فشل توليد المهام، والخطأ يصل إلى المستهلك
+                # عبر producer_task؛ عند الإلغاء لا يوجد عمال ينتظرون العلامة
+                if not closing:
+                    for _ in range(self.max_workers):
+                        await task_queue.put(_STOP)
+        
+        async def worker():
+            while True:
+                item = await task_queue.get()
+                QUEUE_DEPTH.set(task_queue.qsize(), 'parallel_tasks')
+                if item is _STOP:
+                    await result_queue.put(_STOP)
+                    return
+                if isinstance(item, list):
+                    with track('parallel', 'cpu_chunk'):
+                        results = await self.execute_chunk(item, loop)
+                    for result in results:
+                        await result_queue.put(result)
+                    continue
+                index, task = item
+                try:
+                    with track('parallel', 'task'):
+                        result = await self.execute_task(task, loop, executor)
+                except Exception as e:
+                    result = e
+                await result_queue.put((index, result))
+        
+        producer_task = asyncio.ensure_future(producer())
+        workers = [asyncio.ensure_future(worker()) for _ in range(self.max_workers)]
+        
         try:
-            # تحليل سريع للنتيجة
-            quick_analysis = await self.quick_analyze_result(result)
+            finished_workers = 0
+            while finished_workers < self.max_workers:
+                item = await result_queue.get()
+                QUEUE_DEPTH.set(result_queue.qsize(), 'parallel_results')
+                if item is _STOP:
+                    finished_workers += 1
+                    continue
+                yield item
+            await producer_task
+        finally:
+            closing = True
+            for task in [producer_task, *workers]:
+                task.cancel()
+            await asyncio.gather(producer_task, *workers, return_exceptions=True)
             
-            # تحديث المجمع
-            self.results_aggregator.add_result(quick_analysis)
+            # إيقاف مبكر من المستهلك: المهام المتبقية في الطابور والمصدر لن تُنفذ
+            while not task_queue.empty():
+                item = task_queue.get_nowait()
+                if isinstance(item, tuple):
+                    close_unstarted([item[1]])
+            if inspect.isgenerator(pending) or hasattr(tasks, '__len__'):
+                close_unstarted(pending)
+    
+    async def execute_task(self, task: Any, loop: asyncio.AbstractEventLoop,
+                           executor: concurrent.futures.Executor) -> Any:
+        """تنفيذ مهمة واحدة حسب نوعها"""
+        if inspect.isawaitable(task):
+            return await task
+        if inspect.iscoroutinefunction(task):
+            return await task()
+        if isinstance(task, CPUTask):
+            return await loop.run_in_executor(executor, task.func, *task.args)
+        
+        # الدوال العادية تُنفذ خارج حلقة الأحداث
+        result = await loop.run_in_executor(executor, task)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+    
+    def route(self, task: Any) -> str:
+        """تحديد مسار المهمة: io (خيوط/حلقة الأحداث) أو cpu (عمليات)"""
+        if self.backend == 'thread':
+            return 'io'
+        if isinstance(task, CPUTask):
+            return 'cpu'
+        if self.backend == 'process' and callable(task) and not inspect.iscoroutinefunction(task):
+            return 'cpu'
+        return 'io'
+    
+    def as_cpu_task(self, task: Any) -> CPUTask:
+        """تحويل المهمة إلى CPUTask"""
+        return task if isinstance(task, CPUTask) else CPUTask(task)
+    
+    def get_thread_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        """مجمع الخيوط للدوال العادية (واحد لكل معالج تشترك فيه كل الاستدعاءات)"""
+        if self.thread_pool is None:
+            self.thread_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="parallel"
+            )
+        return self.thread_pool
+    
+    def get_process_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        """مجمع العمليات (يُنشأ مرة واحدة ويُعاد استخدامه)"""
+        if self.process_pool is None:
+            self.process_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.process_workers,
+                initializer=self.initializer,
+                initargs=self.initargs
+            )
+        return self.process_pool
+    
+    async def execute_chunk(self, chunk: List[Tuple[int, CPUTask]],
+                            loop: asyncio.AbstractEventLoop) -> List[Tuple[int, Any]]:
+        """تنفيذ دفعة مهام cpu في مجمع العمليات"""
+        indexes = [index for index, _ in chunk]
+        try:
+            outcomes = await loop.run_in_executor(
+                self.get_process_pool(),
+                run_task_chunk,
+                [task for _, task in chunk]
+            )
+        except Exception as e:
+            return [(index, e) for index in indexes]
+        for succeeded, _ in outcomes:
+            if not succeeded:
+                record_error('parallel', 'cpu_task')
+        return [(index, value) for index, (_, value) in zip(indexes, outcomes)]
+    
+    def shutdown(self):
+        """إيقاف مجمعي العمليات والخيوط"""
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=True)
+            self.process_pool = None
+        if self.thread_pool is not None:
+            self.thread_pool.shutdown(wait=True)
+            self.thread_pool = None
+    
+    async def batch_result_processing(self, results: List[Any], aggregator: 'ResultsAggregator'):
+        """تقييم دفعة من النتائج في مرور واحد ومعالجة الحرجة منها"""
+        try:
+            scores = score_results(results)
+            aggregator.add_batch(scores, results)
             
-            # إذا كانت النتيجة حرجة، معالجتها فوراً
-            if self.is_critical_result(result):
-                await self.process_critical_result(result)
+            for index in scores.critical_mask().nonzero()[0].tolist():
+                await self.process_critical_result(results[index])
                 
         except Exception as e:
-            self.logger.warning(f"معالجة النتيجة الفورية فشلت: {e}")
-    
-    async def quick_analyze_result(self, result):
-        """تحليل سريع للنتيجة"""
-        analysis = {
-            'timestamp': datetime.now().isoformat(),
-            'data_size': len(str(result)) if result else 0,
-            'has_contacts': self.check_for_contacts(result),
-            'confidence_score': self.calculate_confidence(result)
-        }
-        return analysis
-    
-    def check_for_contacts(self, result):
-        """التحقق من وجود جهات اتصال في النتيجة"""
-        if not result:
-            return False
-        
-        result_str = str(result).lower()
-        contact_indicators = ['@', 'phone', 'email', 'contact', 'mobile']
-        return any(indicator in result_str for indicator in contact_indicators)
-    
-    def calculate_confidence(self, result):
-        """حساب درجة الثقة في النتيجة"""
-        if not result:
-            return 0.0
-        
-        # خوارزمية متقدمة لحساب الثقة
-        confidence_factors = [
-            self.data_completeness(result),
-            self.data_consistency(result),
-            self.source_reliability(result)
-        ]
-        
-        return sum(confidence_factors) / len(confidence_factors)
+            self.logger.warning(f"معالجة دفعة النتائج فشلت: {e}")
+    
+    async def process_critical_result(self, result):
+        """معالجة النتائج الحرجة"""
+        self.logger.info(f"🚨 نتيجة حرجة: {str(result)[:200]}")
 
 class ResultsAggregator:
-    """مجمع النتائج المتقدم"""
-    def __init__(self):
-        self.results = {}
+    """مجمع النتائج المتدفق
+    
+    يحتفظ بعدادات تراكمية فقط، والنتائج الخام تُكتب إلى ملف NDJSON
+    على القرص فور وصولها، لذلك تبقى الذاكرة ثابتة مهما كان عدد النتائج.
+    """
+    def __init__(self, spill_dir: Optional[str] = None, histogram_bins: int = 10):
+        self.spill_dir = spill_dir or Settings.RESULTS_SPILL_DIR
+        self.spill_path: Optional[str] = None
+        self.spill_file = None
+        self.histogram_bins = histogram_bins
+        self.counters = {
+            'total_results': 0,
+            'critical_findings': 0,
+            'with_contacts': 0,
+            'failed_tasks': 0,
+            'total_data_size': 0,
+            'confidence_sum': 0.0
+        }
+        self.confidence_histogram = [0] * histogram_bins
         self.metadata = {
-            'start_time': datetime.now(),
+            'start_time': datetime.now().isoformat(),
             'total_tasks': 0,
             'completed_tasks': 0
         }
     
-    def add_result(self, result):
-        """إضافة نتيجة جديدة"""
-        task_id = f"task_{len(self.results)}"
-        self.results[task_id] = {
-            'data': result,
-            'timestamp': datetime.now(),
-            'processed': False
-        }
-        self.metadata['completed_tasks'] += 1
+    def add_batch(self, scores: ResultScores, results: Sequence[Any]):
+        """إضافة دفعة نتائج مقيّمة (تحديث العدادات بعمليات مصفوفات)"""
+        count = len(scores)
+        if not count:
+            return
+        counters = self.counters
+        counters['total_results'] += count
+        self.metadata['completed_tasks'] += count
+        counters['confidence_sum'] += float(scores.confidence.sum())
+        counters['total_data_size'] += int(scores.data_size.sum())
+        counters['with_contacts'] += int(scores.has_contacts.sum())
+        counters['critical_findings'] += int(scores.critical_mask().sum())
+        
+        buckets = np.clip((scores.confidence * self.histogram_bins).astype(np.int64), 0, self.histogram_bins - 1)
+        for bucket, hits in enumerate(np.bincount(buckets, minlength=self.histogram_bins).tolist()):
+            self.confidence_histogram[bucket] += hits
+        
+        for result in results:
+            self.spill(result)
+    
+    def record_failure(self):
+        """تسجيل مهمة فاشلة"""
+        self.counters['failed_tasks'] += 1
+    
+    def spill(self, result):
+        """كتابة النتيجة الخام إلى ملف التفريغ"""
+        if self.spill_file is None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            fd, self.spill_path = tempfile.mkstemp(
+                prefix='results_', suffix='.ndjson', dir=self.spill_dir
+            )
+            self.spill_file = os.fdopen(fd, 'w', encoding='utf-8', buffering=1 << 20)
+        self.spill_file.write(json.dumps(result, ensure_ascii=False, default=str))
+        self.spill_file.write('\n')
+    
+    def iter_results(self) -> Iterator[Any]:
+        """قراءة النتائج الخام من القرص بشكل متدفق"""
+        if self.spill_path is None:
+            return
+        if self.spill_file is not None:
+            self.spill_file.flush()
+        with open(self.spill_path, encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+    
+    def close(self):
+        """إغلاق ملف التفريغ"""
+        if self.spill_file is not None:
+            self.spill_file.close()
+            self.spill_file = None
+    
+    def discard(self):
+        """إغلاق ملف التفريغ وحذفه (العدادات والملخص تبقى متاحة)"""
+        self.close()
+        if self.spill_path is not None:
+            try:
+                os.unlink(self.spill_path)
+            except FileNotFoundError:
+                pass
+            self.spill_path = None
     
     def get_final_results(self):
         """الحصول على النتائج النهائية"""
+        if self.spill_file is not None:
+            self.spill_file.flush()
         return {
-            'results': self.results,
+            'results': {
+                'count': self.counters['total_results'],
+                'spill_path': self.spill_path
+            },
             'metadata': self.metadata,
             'summary': self.generate_summary()
         }
     
     def generate_summary(self):
-        """توليد ملخص النتائج"""
-        total_results = len(self.results)
-        critical_results = sum(1 for r in self.results.values() 
-                             if self.is_critical(r['data']))
+        """توليد ملخص النتائج من العدادات التراكمية"""
+        counters = self.counters
+        total_results = counters['total_results']
         
         return {
             'total_results': total_results,
-            'critical_findings': critical_results,
+            'critical_findings': counters['critical_findings'],
+            'with_contacts': counters['with_contacts'],
+            'failed_tasks': counters['failed_tasks'],
+            'total_data_size': counters['total_data_size'],
+            'average_confidence': counters['confidence_sum'] / total_results if total_results else 0.0,
+            'confidence_histogram': list(self.confidence_histogram),
             'success_rate': (self.metadata['completed_tasks'] / self.metadata['total_tasks']) * 100
-      }
+                            if self.metadata['total_tasks'] else 0.0
+        }
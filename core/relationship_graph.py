@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+محرك رسم العلاقات
+Relationship Graph Engine
+
+رسم علاقات يُبنى تدريجياً من روابط الربط بين الأهداف، ويحسب الكثافة
+والمركزية والمجتمعات. الرسوم الصغيرة تُحلل بـ networkx، والكبيرة
+بتمثيل CSR على مصفوفات NumPy مع مركزية بينية تقريبية بعينة مصادر.
+"""
+
+import logging
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config.settings import Settings
+from core.correlation_index import CorrelationLink
+from core.model_registry import lazy_import
+
+class CSRGraph:
+    """رسم غير موجه مضغوط (CSR): indptr وindices وweights"""
+    def __init__(self, node_count: int, sources: np.ndarray, targets: np.ndarray, weights: np.ndarray):
+        self.node_count = node_count
+
+        # توحيد الحواف غير الموجهة وجمع أوزان المكرر منها
+        low = np.minimum(sources, targets).astype(np.int64)
+        high = np.maximum(sources, targets).astype(np.int64)
+        keep = low != high
+        pair_keys, inverse = np.unique(low[keep] * node_count + high[keep], return_inverse=True)
+        pair_weights = np.bincount(inverse, weights=weights[keep]).astype(np.float32)
+        low, high = pair_keys // node_count, pair_keys % node_count
+        self.edge_count = len(pair_keys)
+
+        # كل حافة تُخزن في الاتجاهين
+        rows = np.concatenate([low, high])
+        cols = np.concatenate([high, low])
+        order = np.argsort(rows, kind='stable')
+        self.indices = cols[order].astype(np.int32)
+        self.weights = np.concatenate([pair_weights, pair_weights])[order]
+        self.indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=node_count), out=self.indptr[1:])
+        self.degree = np.diff(self.indptr)
+
+    def density(self) -> float:
+        """كثافة الرسم"""
+        n = self.node_count
+        return 2.0 * self.edge_count / (n * (n - 1)) if n > 1 else 0.0
+
+    def neighbors_of(self, frontier: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """جميع الحواف الخارجة من مجموعة عقد: (المصدر، الجار)"""
+        starts = self.indptr[frontier]
+        counts = self.degree[frontier]
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        sources = np.repeat(frontier, counts)
+        # مواقع الجيران: بداية كل عقدة + الإزاحة داخلها
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        return sources, self.indices[np.repeat(starts, counts) + offsets].astype(np.int64)
+
+    def approximate_betweenness(self, samples: int, seed: int = 0) -> np.ndarray:
+        """مركزية بينية تقريبية (Brandes بعينة مصادر، BFS متجه بالمستويات)"""
+        n = self.node_count
+        betweenness = np.zeros(n, dtype=np.float64)
+        if n < 3:
+            return betweenness
+        rng = np.random.default_rng(seed)
+        sources = rng.choice(n, size=min(samples, n), replace=False)
+
+        for source in sources.tolist():
+            distance = np.full(n, -1, dtype=np.int64)
+            sigma = np.zeros(n, dtype=np.float64)
+            distance[source] = 0
+            sigma[source] = 1.0
+            frontier = np.array([source], dtype=np.int64)
+            level_edges = []
+
+            # المرور الأمامي: عدد أقصر المسارات لكل عقدة مستوى بعد مستوى
+            depth = 0
+            while frontier.size:
+                parents, children = self.neighbors_of(frontier)
+                unseen = distance[children] == -1
+                distance[children[unseen]] = depth + 1
+                on_path = distance[children] == depth + 1
+                parents, children = parents[on_path], children[on_path]
+                np.add.at(sigma, children, sigma[parents])
+                level_edges.append((parents, children))
+                frontier = np.unique(children)
+                depth += 1
+
+            # المرور الخلفي: تجميع الاعتماديات من الأعمق إلى الجذر
+            delta = np.zeros(n, dtype=np.float64)
+            for parents, children in reversed(level_edges):
+                np.add.at(delta, parents, sigma[parents] / sigma[children] * (1.0 + delta[children]))
+            delta[source] = 0.0
+            betweenness += delta
+
+        # تحجيم العينة إلى كل العقد وتطبيع الرسم غير الموجه
+        scale = n / len(sources)
+        return betweenness * scale / ((n - 1) * (n - 2))
+
+    def label_propagation(self, max_iterations: int = 20, seed: int = 0) -> np.ndarray:
+        """كشف المجتمعات بانتشار التسميات (تحديث نصف العقد عشوائياً في كل جولة)"""
+        n = self.node_count
+        labels = np.arange(n, dtype=np.int64)
+        if self.edge_count == 0:
+            return labels
+        rng = np.random.default_rng(seed)
+        rows = np.repeat(np.arange(n, dtype=np.int64), self.degree)
+
+        for _ in range(max_iterations):
+            # وزن كل تسمية بين جيران كل عقدة
+            keys, inverse = np.unique(rows * n + labels[self.indices], return_inverse=True)
+            scores = np.bincount(inverse, weights=self.weights)
+            key_rows, key_labels = keys // n, keys % n
+            # الأعلى وزناً لكل عقدة (التعادل يُكسر عشوائياً)
+            order = np.lexsort((rng.random(len(keys)), -scores, key_rows))
+            first = np.ones(len(order), dtype=bool)
+            first[1:] = key_rows[order][1:] != key_rows[order][:-1]
+            best_rows, best_labels = key_rows[order][first], key_labels[order][first]
+
+            # التوقف عندما تكون تسمية كل عقدة من بين الأعلى وزناً لدى جيرانها
+            own = labels[key_rows] == key_labels
+            best_score = np.zeros(n)
+            np.maximum.at(best_score, key_rows, scores)
+            own_score = np.zeros(n)
+            own_score[key_rows[own]] = scores[own]
+            if (own_score[key_rows] >= best_score[key_rows]).all():
+                break
+            update = rng.random(len(best_rows)) < 0.5
+            labels[best_rows[update]] = best_labels[update]
+        return labels
+
+class RelationshipGraph:
+    """رسم علاقات تزايدي بين الأهداف والكيانات"""
+    def __init__(self, networkx_max_edges: Optional[int] = None, betweenness_samples: Optional[int] = None):
+        self.logger = logging.getLogger(__name__)
+        self.networkx_max_edges = Settings.GRAPH_NETWORKX_MAX_EDGES if networkx_max_edges is None else networkx_max_edges
+        self.betweenness_samples = betweenness_samples or Settings.GRAPH_BETWEENNESS_SAMPLES
+        self.node_ids: Dict[str, int] = {}
+        self.node_names: List[str] = []
+        # الحواف في مصفوفات مضغوطة تُضاف إليها فقط
+        self.sources = array('i')
+        self.targets = array('i')
+        self.weights = array('f')
+
+    def node_id(self, name: str) -> int:
+        """رقم العقدة (تُنشأ عند أول ظهور)"""
+        node = self.node_ids.get(name)
+        if node is None:
+            node = len(self.node_names)
+            self.node_ids[name] = node
+            self.node_names.append(name)
+        return node
+
+    def add_edge(self, source: str, target: str, weight: float = 1.0):
+        """إضافة حافة (المكرر يجمع وزنه عند التحليل)"""
+        self.sources.append(self.node_id(source))
+        self.targets.append(self.node_id(target))
+        self.weights.append(weight)
+
+    def add_link(self, link: CorrelationLink):
+        """إضافة رابط من فهرس الربط"""
+        self.add_edge(link.source, link.target)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.sources)
+
+    def analyze(self, top: int = 10) -> Dict[str, Any]:
+        """الكثافة والمراكز الرئيسية والمجتمعات"""
+        if not self.node_names:
+            return {'backend': None, 'nodes': 0, 'edges': 0, 'network_density': 0.0,
+                    'key_connectors': [], 'communities': []}
+        if self.edge_count <= self.networkx_max_edges:
+            try:
+                return self.analyze_networkx(top)
+            except ImportError:
+                self.logger.warning("networkx غير متوفر، استخدام تمثيل CSR")
+        return self.analyze_csr(top)
+
+    def analyze_networkx(self, top: int) -> Dict[str, Any]:
+        """تحليل الرسوم الصغيرة بـ networkx"""
+        nx = lazy_import("networkx")
+        graph = nx.Graph()
+        graph.add_nodes_from(range(len(self.node_names)))
+        for source, target, weight in zip(self.sources, self.targets, self.weights):
+            if source == target:
+                continue
+            if graph.has_edge(source, target):
+                graph[source][target]['weight'] += weight
+            else:
+                graph.add_edge(source, target, weight=weight)
+
+        samples = min(self.betweenness_samples, graph.number_of_nodes())
+        betweenness = nx.betweenness_centrality(graph, k=samples, seed=0)
+        degree = nx.degree_centrality(graph)
+        communities = nx.community.louvain_communities(graph, weight='weight', seed=0)
+        return self.report(
+            'networkx',
+            graph.number_of_edges(),
+            nx.density(graph),
+            sorted(betweenness.items(), key=lambda item: -item[1])[:top],
+            sorted(degree.items(), key=lambda item: -item[1])[:top],
+            [sorted(community) for community in communities],
+            top
+        )
+
+    def analyze_csr(self, top: int) -> Dict[str, Any]:
+        """تحليل الرسوم الكبيرة بتمثيل CSR"""
+        n = len(self.node_names)
+        csr = CSRGraph(
+            n,
+            np.frombuffer(self.sources, dtype=np.int32),
+            np.frombuffer(self.targets, dtype=np.int32),
+            np.frombuffer(self.weights, dtype=np.float32)
+        )
+        betweenness = csr.approximate_betweenness(self.betweenness_samples)
+        degree = csr.degree / (n - 1) if n > 1 else csr.degree.astype(np.float64)
+        labels = csr.label_propagation()
+
+        def top_nodes(scores: np.ndarray) -> List[Tuple[int, float]]:
+            best = np.argsort(-scores, kind='stable')[:top]
+            return list(zip(best.tolist(), scores[best].tolist()))
+
+        order = np.argsort(labels, kind='stable')
+        boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+        communities = [group.tolist() for group in np.split(order, boundaries)]
+        return self.report(
+            'csr', csr.edge_count, csr.density(),
+            top_nodes(betweenness), top_nodes(degree), communities, top
+        )
+
+    def report(self, backend: str, edges: int, density: float,
+               betweenness: List[Tuple[int, float]], degree: List[Tuple[int, float]],
+               communities: List[List[int]], top: int) -> Dict[str, Any]:
+        """صيغة موحدة لنتيجة التحليل"""
+        names = self.node_names
+        communities = sorted(communities, key=len, reverse=True)
+        return {
+            'backend': backend,
+            'nodes': len(names),
+            'edges': edges,
+            'network_density': density,
+            'key_connectors': [{'node': names[node], 'betweenness': score} for node, score in betweenness],
+            'degree_centrality': [{'node': names[node], 'degree': score} for node, score in degree],
+            'community_count': len(communities),
+            'communities': [
+                {'name': f"community_{index}", 'members': len(members), 'sample': [names[node] for node in members[:5]]}
+                for index, members in enumerate(communities[:top])
+            ]
+        }
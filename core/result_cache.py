@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+ذاكرة النتائج المؤقتة ذات المستويين
+Two-Tier Result Cache
+
+مستوى أول LRU محدود في الذاكرة ومستوى ثانٍ دائم في SQLite،
+والمفاتيح مشتقة من بصمة المحتوى وإصدارات النماذج. المستويان يخزنان
+نص JSON نفسه، فكل قراءة تعيد نسخة مستقلة بنفس الأنواع أياً كان مصدرها.
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+def content_key(*parts: Any) -> str:
+    """مفتاح ثابت من بصمة SHA-256 لأجزاء المحتوى"""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part if isinstance(part, bytes) else str(part).encode('utf-8')
+        digest.update(len(data).to_bytes(8, 'little'))
+        digest.update(data)
+    return digest.hexdigest()
+
+def to_json(value: Any) -> str:
+    """تسلسل JSON يدعم أنواع numpy والتواريخ"""
+    def default(obj):
+        if hasattr(obj, 'item'):
+            return obj.item()
+        if hasattr(obj, 'tolist'):
+            return obj.tolist()
+        return str(obj)
+    return json.dumps(value, ensure_ascii=False, default=default)
+
+class TwoTierCache:
+    """ذاكرة مؤقتة: LRU في الذاكرة أمام مخزن SQLite على القرص
+
+    الدوال aget/aget_many/aset للاستدعاء من حلقة الأحداث: الذاكرة تُقرأ
+    مباشرة، وعمليات القرص تُنفذ في خيط المخزن.
+    """
+    def __init__(self,
+                 path: Optional[str] = None,
+                 namespace: str = "default",
+                 max_memory_entries: int = 10000,
+                 ttl: Optional[float] = None):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.namespace = namespace
+        self.max_memory_entries = max_memory_entries
+        self.ttl = ttl
+        # المفتاح -> (وقت الإنشاء، نص JSON)
+        self.memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        # قفل الذاكرة والإحصائيات قصير دائماً، وقفل الاتصال يُحمل طوال استعلام SQLite
+        # حتى لا تنتظر قراءات الذاكرة في حلقة الأحداث خلف عمليات القرص
+        self.lock = threading.Lock()
+        self.disk_lock = threading.Lock()
+        self.connection: Optional[sqlite3.Connection] = None
+        self.executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'expired': 0, 'writes': 0}
+        if path:
+            self.open_disk_tier(path)
+
+    def open_disk_tier(self, path: str):
+        """فتح مخزن SQLite وإنشاء الجدول"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key)"
+            ") WITHOUT ROWID"
+        )
+        # خيط واحد يحافظ على ترتيب الكتابات
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"cache-{self.namespace}"
+        )
+
+    def is_fresh(self, created_at: float) -> bool:
+        """هل القيمة ضمن نافذة الصلاحية"""
+        return self.ttl is None or time.time() - created_at < self.ttl
+
+    def memory_get(self, key: str) -> Optional[str]:
+        """نص القيمة من الذاكرة (يُستدعى مع القفل)"""
+        entry = self.memory.get(key)
+        if entry is None:
+            return None
+        created_at, data = entry
+        if self.is_fresh(created_at):
+            self.memory.move_to_end(key)
+            self.stats['memory_hits'] += 1
+            return data
+        del self.memory[key]
+        self.stats['expired'] += 1
+        return None
+
+    def disk_get(self, key: str) -> Optional[Any]:
+        """قراءة قيمة من القرص وإضافتها إلى الذاكرة"""
+        row = None
+        with self.disk_lock:
+            if self.connection is not None:
+                row = self.connection.execute(
+                    "SELECT value, created_at FROM cache WHERE namespace = ? AND key = ?",
+                    (self.namespace, key)
+                ).fetchone()
+
+        with self.lock:
+            if row is not None and self.is_fresh(row[1]):
+                self.remember(key, row[1], row[0])
+                self.stats['disk_hits'] += 1
+            else:
+                if row is not None:
+                    self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return None
+        return json.loads(row[0])
+
+    def get(self, key: str) -> Optional[Any]:
+        """قراءة قيمة من الذاكرة ثم من القرص"""
+        with self.lock:
+            data = self.memory_get(key)
+        if data is not None:
+            return json.loads(data)
+        return self.disk_get(key)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """قراءة دون حجب حلقة الأحداث"""
+        with self.lock:
+            data = self.memory_get(key)
+        if data is not None:
+            return json.loads(data)
+        return await self.run_disk(self.disk_get, key)
+
+    def memory_get_many(self, keys: List[str]) -> Tuple[Dict[str, Any], List[str]]:
+        """القيم الموجودة في الذاكرة والمفاتيح المفقودة منها"""
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+        with self.lock:
+            for key in keys:
+                data = self.memory_get(key)
+                if data is None:
+                    missing.append(key)
+                else:
+                    found[key] = data
+        return {key: json.loads(data) for key, data in found.items()}, missing
+
+    def disk_get_many(self, keys: List[str], batch_size: int = 500) -> Dict[str, Any]:
+        """قراءة عدة مفاتيح من القرص باستعلام واحد لكل دفعة"""
+        found: Dict[str, Any] = {}
+        rows = []
+        with self.disk_lock:
+            if self.connection is not None:
+                for offset in range(0, len(keys), batch_size):
+                    batch = keys[offset:offset + batch_size]
+                    rows.extend(self.connection.execute(
+                        "SELECT key, value, created_at FROM cache WHERE namespace = ?"
+                        f" AND key IN ({', '.join('?' * len(batch))})",
+                        (self.namespace, *batch)
+                    ).fetchall())
+
+        fresh = []
+        with self.lock:
+            for key, data, created_at in rows:
+                if self.is_fresh(created_at):
+                    fresh.append((key, data))
+                    self.remember(key, created_at, data)
+                    self.stats['disk_hits'] += 1
+                else:
+                    self.stats['expired'] += 1
+            self.stats['misses'] += len(keys) - len(fresh)
+        for key, data in fresh:
+            found[key] = json.loads(data)
+        return found
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """قراءة عدة مفاتيح؛ المفقود من الذاكرة يُقرأ من القرص"""
+        found, missing = self.memory_get_many(keys)
+        if missing:
+            found.update(self.disk_get_many(missing))
+        return found
+
+    async def aget_many(self, keys: List[str]) -> Dict[str, Any]:
+        """قراءة عدة مفاتيح دون حجب حلقة الأحداث"""
+        found, missing = self.memory_get_many(keys)
+        if missing:
+            found.update(await self.run_disk(self.disk_get_many, missing))
+        return found
+
+    def set(self, key: str, value: Any):
+        """كتابة قيمة في المستويين"""
+        self.disk_set(key, *self.memory_set(key, value))
+
+    async def aset(self, key: str, value: Any):
+        """كتابة قيمة: الذاكرة فوراً والقرص في خيط المخزن"""
+        created_at, data = self.memory_set(key, value)
+        await self.run_disk(self.disk_set, key, created_at, data)
+
+    def memory_set(self, key: str, value: Any) -> Tuple[float, str]:
+        """تسلسل القيمة مرة واحدة وتخزين النص في الذاكرة"""
+        created_at = time.time()
+        data = to_json(value)
+        with self.lock:
+            self.remember(key, created_at, data)
+            self.stats['writes'] += 1
+        return created_at, data
+
+    def disk_set(self, key: str, created_at: float, data: str):
+        """كتابة نص القيمة إلى القرص"""
+        with self.disk_lock:
+            if self.connection is not None:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO cache (namespace, key, value, created_at) VALUES (?, ?, ?, ?)",
+                    (self.namespace, key, data, created_at)
+                )
+
+    async def run_disk(self, func, *args) -> Any:
+        """تنفيذ عملية قرص في خيط المخزن (مباشرة إذا لم يوجد مستوى قرص)"""
+        if self.executor is None:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    def remember(self, key: str, created_at: float, data: str):
+        """إضافة إلى LRU الذاكرة مع إخراج الأقدم"""
+        self.memory[key] = (created_at, data)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory_entries:
+            self.memory.popitem(last=False)
+
+    def clear(self):
+        """مسح جميع القيم في هذا النطاق"""
+        with self.lock:
+            self.memory.clear()
+        with self.disk_lock:
+            if self.connection is not None:
+                self.connection.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """إحصائيات الإصابة والإخفاق"""
+        lookups = self.stats['memory_hits'] + self.stats['disk_hits'] + self.stats['misses']
+        hits = self.stats['memory_hits'] + self.stats['disk_hits']
+        return {
+            **self.stats,
+            'memory_entries': len(self.memory),
+            'hit_rate': hits / lookups if lookups else 0.0
+        }
+
+    def close(self):
+        """إغلاق مخزن القرص"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        with self.disk_lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+مجدول المهام محدود التزامن
+Bounded Concurrency Scheduler
+"""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, List, Optional, Tuple
+from config.settings import Settings
+
+class TaskScheduler:
+    """مجدول غير متزامن بحد تزامن ومهلة لكل تقنية"""
+    def __init__(self, max_concurrency: Optional[int] = None, timeout: Optional[float] = None):
+        self.logger = logging.getLogger(__name__)
+        self.max_concurrency = max_concurrency or Settings.MAX_CONCURRENT_REQUESTS
+        self.timeout = timeout or Settings.REQUEST_TIMEOUT
+        self._semaphore = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """حد التزامن (يُنشأ داخل حلقة الأحداث)"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def run(self, func: Callable[..., Awaitable[Any]], *args) -> Any:
+        """تنفيذ تقنية واحدة ضمن حد التزامن والمهلة"""
+        async with self.semaphore:
+            return await asyncio.wait_for(func(*args), timeout=self.timeout)
+
+    async def run_all(self, funcs: List[Callable[..., Awaitable[Any]]], *args) -> List[Any]:
+        """تنفيذ عدة تقنيات على نفس المدخلات (الأخطاء تُعاد كنتائج)"""
+        return await asyncio.gather(
+            *(self.run(func, *args) for func in funcs),
+            return_exceptions=True
+        )
+
+    async def as_completed(self,
+                           items: Iterable[Any],
+                           func: Callable[[Any], Awaitable[Any]]) -> AsyncIterator[Tuple[Any, Any]]:
+        """تنفيذ func لكل عنصر وإرجاع (العنصر، النتيجة) فور اكتمال كل منها
+
+        لا يُنشأ أكثر من max_concurrency مهمة في نفس الوقت، لذلك تبقى
+        الذاكرة ثابتة مهما كان عدد العناصر.
+        """
+        iterator = iter(items)
+        pending = {}
+
+        def schedule_next() -> bool:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return False
+            pending[asyncio.ensure_future(func(item))] = item
+            return True
+
+        while len(pending) < self.max_concurrency and schedule_next():
+            pass
+
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    item = pending.pop(task)
+                    if task.cancelled():
+                        result = asyncio.CancelledError()
+                    elif task.exception() is not None:
+                        result = task.exception()
+                    else:
+                        result = task.result()
+                    schedule_next()
+                    yield item, result
+        finally:
+            # إلغاء المهام المتبقية إذا توقف المستهلك مبكراً
+            for task in pending:
+                task.cancel()
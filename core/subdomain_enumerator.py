@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+تعداد النطاقات الفرعية
+Subdomain Enumeration Engine
+
+يولّد الأسماء المرشحة من قائمة كلمات كتدفق (دون تحميل القائمة في الذاكرة)
+ويحلها بمحلل UDP عالي الإنتاجية تحت حد تزامن متكيف (زيادة جمعية عند
+النجاح ونقصان ضربي عند انقضاء المهل). السجل الشامل (wildcard) يُكتشف مرة
+واحدة لكل منطقة بأسماء عشوائية، ثم تُستبعد إجاباته بمقارنة مجموعات O(1).
+"""
+
+import asyncio
+import logging
+import re
+import secrets
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from config.settings import Settings
+from core.async_dns import BulkResolver, DNSQueryError
+from core.entity_normalizer import normalize_domain
+
+# كلمات شائعة عند عدم تحديد ملف كلمات
+DEFAULT_WORDLIST = (
+    "www", "mail", "webmail", "smtp", "pop", "imap", "mx", "email", "exchange", "owa", "autodiscover",
+    "ns", "ns1", "ns2", "dns", "vpn", "remote", "gateway", "proxy", "api", "app", "dev", "staging",
+    "test", "qa", "uat", "demo", "sandbox", "beta", "prod", "admin", "portal", "login", "sso", "auth",
+    "secure", "intranet", "internal", "blog", "shop", "store", "m", "mobile", "cdn", "static", "assets",
+    "img", "media", "files", "download", "uploads", "docs", "wiki", "support", "help", "status",
+    "git", "gitlab", "jenkins", "jira", "confluence", "grafana", "kibana", "monitor", "db", "mysql",
+    "backup", "crm", "erp", "hr", "news", "forum", "chat", "calendar", "office", "cloud", "s3",
+    "web", "www2", "old", "new", "v1", "v2", "ftp"
+)
+
+_LABEL = re.compile(r'^[a-z0-9_](?:[a-z0-9_-]{0,61}[a-z0-9_])?$')
+
+def iter_wordlist(path: str) -> Iterator[str]:
+    """كلمات ملف القائمة سطراً بسطر (تتجاهل الأسطر الفارغة والتعليقات)"""
+    with open(path, encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            word = line.strip()
+            if word and not word.startswith('#'):
+                yield word
+
+def candidate_names(words: Iterable[str], zone: str) -> Iterator[str]:
+    """أسماء مرشحة صالحة داخل المنطقة (الكلمات قد تحتوي عدة مقاطع مثل dev.api)"""
+    max_prefix = 253 - len(zone) - 1
+    for word in words:
+        word = word.strip().lower().rstrip('.')
+        if not word or len(word) > max_prefix:
+            continue
+        if all(_LABEL.match(label) for label in word.split('.')):
+            yield f"{word}.{zone}"
+
+class AdaptiveLimiter:
+    """حد تزامن متكيف (AIMD)
+
+    كل نافذة من النجاحات بطول الحد الحالي تزيده واحداً، والفشل (انقضاء
+    مهلة أو رفض الخادم) يقسمه على اثنين مرة واحدة على الأكثر لكل نافذة
+    حتى لا تنهار الدفعة الواحدة من المهل بالحد إلى الأدنى.
+    """
+    def __init__(self, initial: int, minimum: int = 8, maximum: int = 1024):
+        self.minimum = minimum
+        self.maximum = max(maximum, minimum)
+        self.limit = min(max(initial, minimum), self.maximum)
+        self.in_use = 0
+        self.successes = 0
+        self.completed = 0
+        self.last_decrease = 0
+        self.peak = self.limit
+        self.waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self):
+        while self.in_use >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self.waiters.append(waiter)
+            await waiter
+        self.in_use += 1
+
+    def release(self, ok: bool):
+        self.in_use -= 1
+        self.completed += 1
+        if ok:
+            self.successes += 1
+            if self.successes >= self.limit and self.limit < self.maximum:
+                self.limit += 1
+                self.successes = 0
+                self.peak = max(self.peak, self.limit)
+        elif self.completed - self.last_decrease >= self.limit:
+            self.limit = max(self.minimum, self.limit // 2)
+            self.successes = 0
+            self.last_decrease = self.completed
+        while self.waiters and self.in_use < self.limit:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+class WildcardDetectionError(Exception):
+    """تعذر التحقق من وجود سجل شامل في المنطقة"""
+
+class SubdomainEnumerator:
+    """تعداد النطاقات الفرعية بقائمة كلمات ومحلل UDP"""
+    def __init__(self,
+                 resolver: Optional[BulkResolver] = None,
+                 initial_concurrency: Optional[int] = None,
+                 max_concurrency: Optional[int] = None,
+                 wildcard_probes: Optional[int] = None,
+                 wildcard_attempts: int = 2):
+        self.logger = logging.getLogger(__name__)
+        self.resolver = resolver or BulkResolver()
+        self.max_concurrency = max_concurrency or Settings.SUBDOMAIN_MAX_CONCURRENCY
+        # حد مشترك بين جميع المناطق حتى يتكيف مع قدرة الخادم الكلية
+        self.limiter = AdaptiveLimiter(
+            initial_concurrency or Settings.SUBDOMAIN_INITIAL_CONCURRENCY,
+            maximum=self.max_concurrency
+        )
+        self.wildcard_probes = wildcard_probes or Settings.SUBDOMAIN_WILDCARD_PROBES
+        self.wildcard_attempts = max(1, wildcard_attempts)
+        # المنطقة -> عناوين السجل الشامل (None = لا يوجد سجل شامل)
+        self.wildcards: Dict[str, Optional[FrozenSet[str]]] = {}
+        self.stats = {'candidates': 0, 'found': 0, 'wildcard_filtered': 0, 'duplicates': 0, 'failed': 0}
+
+    def default_words(self) -> Iterable[str]:
+        """قائمة الكلمات من الإعدادات أو القائمة المدمجة"""
+        if Settings.SUBDOMAIN_WORDLIST:
+            return iter_wordlist(Settings.SUBDOMAIN_WORDLIST)
+        return DEFAULT_WORDLIST
+
+    async def detect_wildcard(self, zone: str) -> Optional[FrozenSet[str]]:
+        """عناوين السجل الشامل للمنطقة (يُكتشف مرة واحدة بأسماء عشوائية)
+
+        يُعاد الاكتشاف بأسماء جديدة إذا فشل أحد الأسماء، ويرفع
+        WildcardDetectionError إذا لم يكتمل بعد wildcard_attempts محاولة،
+        لأن التعداد دون مرشح في منطقة ذات سجل شامل يعيد كل كلمة كنطاق موجود.
+        """
+        if zone in self.wildcards:
+            return self.wildcards[zone]
+        for _ in range(self.wildcard_attempts):
+            probes = [f"{secrets.token_hex(10)}.{zone}" for _ in range(self.wildcard_probes)]
+            answers = await asyncio.gather(*(self.resolver.query_a(name) for name in probes), return_exceptions=True)
+            # الاكتشاف مكتمل فقط إذا أجاب الخادم عن كل اسم (عناوين أو NXDOMAIN)
+            if all(isinstance(answer, list) for answer in answers):
+                break
+            self.logger.debug(f"اكتشاف السجل الشامل في {zone} غير مكتمل، إعادة المحاولة")
+        else:
+            raise WildcardDetectionError(f"تعذر اكتشاف السجل الشامل في {zone}")
+
+        wildcard = None
+        # المنطقة ذات سجل شامل فقط إذا أجابت جميع الأسماء العشوائية
+        if all(answer for answer in answers):
+            wildcard = frozenset(address for answer in answers for address in answer)
+            self.logger.info(f"🃏 سجل شامل في {zone}: {sorted(wildcard)}")
+        self.wildcards[zone] = wildcard
+        return wildcard
+
+    async def enumerate(self, zone: str, words: Optional[Iterable[str]] = None) -> AsyncIterator[Tuple[str, List[str]]]:
+        """(الاسم، العناوين) لكل نطاق فرعي موجود فور حله"""
+        zone = normalize_domain(zone)
+        if not zone or '.' not in zone:
+            return
+        wildcard = await self.detect_wildcard(zone)
+        candidates = candidate_names(self.default_words() if words is None else words, zone)
+        # العمال بعدد الحد الحالي للمتكيف (العمال الزائدون ينتظرون الحد فقط)
+        worker_count = self.limiter.limit
+        if hasattr(words, '__len__'):
+            worker_count = max(1, min(worker_count, len(words)))
+
+        # النتائج الموجودة فقط تمر عبر الطابور (حجمه محدود فيضغط العمال عند بطء المستهلك)
+        found: asyncio.Queue = asyncio.Queue(maxsize=1024)
+        seen = set()
+        limiter = self.limiter
+        stats = self.stats
+        resolver = self.resolver
+
+        async def worker():
+            for name in candidates:
+                stats['candidates'] += 1
+                await limiter.acquire()
+                ok = True
+                try:
+                    addresses = await resolver.query_a(name)
+                except (asyncio.TimeoutError, DNSQueryError):
+                    ok = False
+                    addresses = []
+                    stats['failed'] += 1
+                finally:
+                    limiter.release(ok)
+                if not addresses:
+                    continue
+                if wildcard is not None and wildcard.issuperset(addresses):
+                    stats['wildcard_filtered'] += 1
+                    continue
+                if name in seen:
+                    stats['duplicates'] += 1
+                    continue
+                seen.add(name)
+                stats['found'] += 1
+                await found.put((name, addresses))
+
+        async def run_workers():
+            # عند الإلغاء لا يوجد مستهلك ينتظر علامة النهاية (وإلغاء gather يلغي العمال)
+            workers = [asyncio.ensure_future(worker()) for _ in range(worker_count)]
+            try:
+                await asyncio.gather(*workers)
+            except Exception:
+                # فشل عامل غير متوقع يوقف بقية العمال قبل إبلاغ المستهلك
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                await found.put(None)
+                raise
+            await found.put(None)
+
+        runner = asyncio.ensure_future(run_workers())
+        try:
+            while True:
+                item = await found.get()
+                if item is None:
+                    break
+                yield item
+            await runner
+        finally:
+            runner.cancel()
+
+    async def enumerate_zone(self, zone: str, words: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+        """جميع النطاقات الفرعية الموجودة للمنطقة وعناوينها"""
+        return {name: addresses async for name, addresses in self.enumerate(zone, words)}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """إحصائيات التعداد والمحلل والحد المتكيف"""
+        return {
+            **self.stats,
+            **self.resolver.stats,
+            'concurrency': self.limiter.limit,
+            'peak_concurrency': self.limiter.peak,
+            'wildcard_zones': sorted(zone for zone, wildcard in self.wildcards.items() if wildcard)
+        }
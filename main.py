@@ -4,12 +4,16 @@
 Main System Runner
 """
 
+import argparse
 import asyncio
 import logging
+import time
+from datetime import datetime
 from core.advanced_engine import QuantumOSINTEngine
+from core.profiler import ScanProfiler
 from utils.logger import setup_logging
 
-async def main():
+async def main(profile: bool = False):
     """الدالة الرئيسية"""
     print("🚀 نظام OSINT المتقدم - الإصدار الكمي")
     print("=" * 50)
@@ -28,17 +32,35 @@ async def main():
             "example_target"
         ]
         
+        # ملفات النتائج (وتقارير الأداء بجانبها)
+        output_prefix = f"osint_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        
         # تنفيذ المسح
         logger.info("بدء المسح المتقدم...")
-        results = await engine.comprehensive_scan(test_targets)
+        scan_start = time.perf_counter()
+        if profile:
+            with ScanProfiler(output_prefix) as profiler:
+                results = await engine.comprehensive_scan(
+                    test_targets, event_callback=profiler.wrap_events(None)
+                )
+        else:
+            results = await engine.comprehensive_scan(test_targets)
+        elapsed = time.perf_counter() - scan_start
         
         # عرض النتائج
         print("\n🎉 اكتمل المسح بنجاح!")
         print(f"📊 عدد الأهداف: {len(test_targets)}")
-        print(f"⏱️  وقت التنفيذ: {engine.operation_start}")
+        print(f"⏱️  وقت التنفيذ: {elapsed:.2f} ثانية")
+        for phase, timing in results.get('metrics', {}).get('phase', {}).items():
+            print(f"   • {phase}: {timing['total_seconds']:.2f} ثانية")
+        
+        if profile and profiler.report:
+            print(f"🔬 مكدسات المعالج: {profiler.report['collapsed_stacks']}")
+            if profiler.report['allocations']:
+                print(f"🔬 تقرير الذاكرة: {profiler.report['allocations']}")
         
         # حفظ النتائج
-        await save_results(results)
+        await save_results(results, output_prefix)
         
     except Exception as e:
         logger.error(f"فشل التشغيل: {e}")
@@ -46,17 +68,24 @@ async def main():
     
     return 0
 
-async def save_results(results):
-    """حفظ النتائج"""
+async def save_results(results, output_prefix: str):
+    """حفظ النتائج بصيغة NDJSON (سطر لكل هدف ومرحلة)"""
     try:
-        import json
-        from datetime import datetime
+        from core.advanced_engine import AdvancedDataFusionEngine
+        from core.result_cache import to_json
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"osint_results_{timestamp}.json"
+        filename = f"{output_prefix}.ndjson"
         
+        # كل سجل يُكتب فور تسلسله دون بناء نص JSON واحد للنتائج كاملة
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+            for target, phase, result in AdvancedDataFusionEngine.iter_target_records(results):
+                f.write(to_json({'target': target, 'phase': phase, 'result': result}))
+                f.write('\n')
+            # المفاتيح خارج المراحل سجلات ملخص بعد سجلات الأهداف
+            for key in ('errors', 'network_analysis', 'fatal_error', 'metrics'):
+                if results.get(key):
+                    f.write(to_json({key: results[key]}))
+                    f.write('\n')
         
         print(f"💾 تم حفظ النتائج في: {filename}")
         
@@ -64,6 +93,11 @@ async def save_results(results):
         print(f"❌ فشل حفظ النتائج: {e}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="نظام OSINT المتقدم")
+    parser.add_argument("--profile", action="store_true",
+                        help="تحليل أداء المسح (مكدسات collapsed وتقرير تخصيص الذاكرة بجانب النتائج)")
+    args = parser.parse_args()
+    
     # تشغيل النظام
-    exit_code = asyncio.run(main())
+    exit_code = asyncio.run(main(args.profile))
     exit(exit_code)
@@ -5,10 +5,12 @@ Extreme Hidden Data Miner
 """
 
 import asyncio
-import re
 import json
 from typing import Dict, List, Any
 import logging
+from core.scheduler import TaskScheduler
+from core.contact_extractor import contact_extractor
+from core.entity_normalizer import dedupe_contacts
 
 class ExtremeHiddenDataMiner:
     def __init__(self):
@@ -19,6 +21,7 @@ class ExtremeHiddenDataMiner:
             'api_endpoint_discovery': True,
             'hidden_parameter_analysis': True
         }
+        self.scheduler = TaskScheduler()
     
     async def extract_hidden_contacts(self, target: str) -> Dict[str, Any]:
         """استخراج جهات الاتصال المخفية"""
@@ -40,8 +43,7 @@ class ExtremeHiddenDataMiner:
                 self.level_4_network_interception
             ]
             
-            tasks = [level(target) for level in extraction_levels]
-            level_results = await asyncio.gather(*tasks, return_exceptions=True)
+            level_results = await self.scheduler.run_all(extraction_levels, target)
             
             # دمج وتحليل النتائج
             hidden_contacts = self.correlate_hidden_data(level_results)
@@ -58,17 +60,6 @@ class ExtremeHiddenDataMiner:
         surface_data = {}
         
         try:
-            # أنماط البحث عن الهواتف والإيميلات
-            phone_patterns = [
-                r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',  # أمريكي
-                r'\b\d{2}[-.]?\d{3}[-.]?\d{4}\b',  # دول أخرى
-                r'\+\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}\b'  # دولي
-            ]
-            
-            email_patterns = [
-                r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            ]
-            
             # محاكاة البيانات المستخرجة
             surface_data = {
                 'phones': ['+1234567890', '055-123-4567'],
@@ -142,9 +133,9 @@ class ExtremeHiddenDataMiner:
                     if 'emails' in level_data:
                         correlated_data['emails'].extend(level_data['emails'])
             
-            # إزالة التكرارات
-            correlated_data['phones'] = list(set(correlated_data['phones']))
-            correlated_data['emails'] = list(set(correlated_data['emails']))
+            # توحيد الصيغ وإزالة التكرارات (+1 234-567-890 و 1234567890 هاتف واحد)
+            correlated_data['phones'] = dedupe_contacts('phone', correlated_data['phones'])
+            correlated_data['emails'] = dedupe_contacts('email', correlated_data['emails'])
             
             # حساب درجات الثقة
             correlated_data['confidence_scores'] = {
@@ -163,25 +154,13 @@ class ExtremeHiddenDataMiner:
             return 0.0
         
         # خوارزمية متقدمة لحساب الثقة
-        valid_count = sum(1 for item in data_list if self.is_valid_contact(item))
-        return valid_count / len(data_list) if data_list else 0.0
+        valid_count = contact_extractor.count_valid(data_list)
+        return valid_count / len(data_list)
     
     def is_valid_contact(self, contact: str) -> bool:
         """التحقق من صحة جهة الاتصال"""
         if not contact:
             return False
         
-        # تحقق من الهواتف
-        phone_patterns = [
-            r'^\+\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}$',
-            r'^\d{3}[-.]?\d{3}[-.]?\d{4}$'
-        ]
-        
-        # تحقق من الإيميلات
-        email_pattern = r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}$'
-        
-        for pattern in phone_patterns:
-            if re.match(pattern, contact):
-                return True
-        
-        return bool(re.match(email_pattern, contact))
+        # تحقق من الهواتف والإيميلات بأنماط مجمعة مسبقاً
+        return contact_extractor.is_valid(contact)
@@ -4,11 +4,13 @@
 Facebook Extreme Analyzer
 """
 
-import asyncio
-import re
 import json
-from typing import Dict, Any
+from typing import Dict, List, Any
 import logging
+from core.scheduler import TaskScheduler
+from core.contact_extractor import contact_extractor
+from core.entity_normalizer import dedupe_contacts
+from core.relationship_graph import RelationshipGraph
 
 class FacebookExtremeAnalyzer:
     def __init__(self):
@@ -19,6 +21,7 @@ class FacebookExtremeAnalyzer:
             self.activity_timeline_analysis,
             self.group_membership_analysis
         ]
+        self.scheduler = TaskScheduler()
     
     async def analyze_facebook(self, target: str) -> Dict[str, Any]:
         """تحليل فيسبوك متقدم"""
@@ -28,8 +31,7 @@ class FacebookExtremeAnalyzer:
         
         try:
             # تنفيذ طرق التحليل بشكل متوازي
-            tasks = [method(target) for method in self.analysis_methods]
-            method_results = await asyncio.gather(*tasks, return_exceptions=True)
+            method_results = await self.scheduler.run_all(self.analysis_methods, target)
             
             # دمج النتائج
             facebook_data = self.correlate_facebook_data(method_results)
@@ -70,16 +72,31 @@ class FacebookExtremeAnalyzer:
         network_data = {}
         
         try:
-            # محاكاة بيانات الشبكة
+            # محاكاة علاقات الصداقة المجمعة
+            friendships = [
+                (target, 'friend1'), (target, 'friend2'), (target, 'friend3'),
+                ('friend1', 'friend2'), ('friend2', 'connector1'), ('friend3', 'connector1'),
+                ('connector1', 'connector2'), ('connector2', 'friend4'), ('connector2', 'friend5'),
+                ('friend4', 'friend5')
+            ]
+            
+            # مقاييس الشبكة محسوبة من رسم العلاقات
+            graph = RelationshipGraph()
+            for source, friend in friendships:
+                graph.add_edge(source, friend)
+            analysis = graph.analyze(top=5)
+            
             network_data = {
-                'total_friends': 350,
-                'mutual_friends': ['friend1', 'friend2', 'friend3'],
-                'network_density': 0.75,
-                'key_connectors': ['connector1', 'connector2'],
+                'total_friends': analysis['nodes'] - 1,
+                'mutual_friends': [friend for source, friend in friendships if source == target],
+                'network_density': analysis['network_density'],
+                'key_connectors': [
+                    connector['node'] for connector in analysis['key_connectors']
+                    if connector['node'] != target
+                ][:2],
                 'communities': [
-                    {'name': 'Work', 'members': 45},
-                    {'name': 'University', 'members': 120},
-                    {'name': 'Family', 'members': 25}
+                    {'name': community['name'], 'members': community['members']}
+                    for community in analysis['communities']
                 ]
             }
             
@@ -125,15 +142,10 @@ class FacebookExtremeAnalyzer:
             # تحليل البيانات لاكتشاف معلومات الاتصال
             profile_str = json.dumps(data).lower()
             
-            # البحث عن إيميلات
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            emails = re.findall(email_pattern, profile_str)
-            contact_info['potential_emails'] = list(set(emails))
-            
-            # البحث عن هواتف
-            phone_pattern = r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'
-            phones = re.findall(phone_pattern, profile_str)
-            contact_info['potential_phones'] = list(set(phones))
+            # البحث عن إيميلات وهواتف في مرور واحد
+            contacts = contact_extractor.extract_grouped(profile_str)
+            contact_info['potential_emails'] = dedupe_contacts('email', contacts['emails'])
+            contact_info['potential_phones'] = dedupe_contacts('phone', contacts['phones'])
             
         except Exception as e:
             self.logger.warning(f"استخراج معلومات الاتصال فشل: {e}")
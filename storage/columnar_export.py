@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+تصدير النتائج بصيغة عمودية
+Columnar Result Export (Parquet / Arrow)
+
+يفكك نتائج الأهداف المتداخلة إلى جداول مطبوعة (targets, dns_records,
+contacts, entities, relationships) ويكتبها على دفعات، مع قارئ بذاكرة
+مُسقطة (memory-mapped) للاستعلام دون تحميل ملفات JSON كاملة.
+
+    python -m storage.columnar_export inv_01H... ./exports --format parquet
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config.settings import Settings
+from core.entity_normalizer import canonicalize
+from core.model_registry import lazy_import
+
+# أعمدة كل جدول ونوعها
+TABLE_COLUMNS = {
+    'targets': [
+        ('investigation_id', 'string'), ('target', 'string'), ('phase', 'string'),
+        ('has_error', 'bool_'), ('dns_records', 'int32'), ('contacts', 'int32'), ('entities', 'int32')
+    ],
+    'dns_records': [
+        ('investigation_id', 'string'), ('target', 'string'), ('record_type', 'string'), ('value', 'string')
+    ],
+    'contacts': [
+        ('investigation_id', 'string'), ('target', 'string'), ('phase', 'string'),
+        ('kind', 'string'), ('value', 'string'), ('source', 'string')
+    ],
+    'entities': [
+        ('investigation_id', 'string'), ('target', 'string'), ('phase', 'string'), ('label', 'string'),
+        ('text', 'string'), ('score', 'float32'), ('start', 'int32'), ('end', 'int32')
+    ],
+    'relationships': [
+        ('investigation_id', 'string'), ('source', 'string'), ('relation', 'string'),
+        ('destination', 'string'), ('phase', 'string')
+    ]
+}
+
+# مفاتيح جهات الاتصال في نتائج المراحل والإضافات
+CONTACT_KEYS = {
+    'emails': 'email', 'potential_emails': 'email',
+    'phones': 'phone', 'potential_phones': 'phone',
+    'social_media': 'social'
+}
+
+# سجلات DNS التي تشير إلى مضيف أو عنوان آخر
+DNS_RELATIONS = {'A': 'resolves_to', 'AAAA': 'resolves_to', 'CNAME': 'alias_of', 'MX': 'mail_server', 'NS': 'name_server'}
+
+EXTENSIONS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+Row = Tuple[str, Tuple[Any, ...]]
+
+def flatten_result(investigation_id: str, target: str, phase: str, result: Any) -> Iterator[Row]:
+    """تحويل نتيجة هدف واحد إلى صفوف (اسم الجدول، القيم)"""
+    counts = defaultdict(int)
+    has_error = False
+    # جهات الاتصال موحدة وفريدة على مستوى الهدف عبر جميع الوحدات (فيسبوك، المخفية، NLP)
+    seen_contacts = set()
+
+    def walk(node: Any, source: str, depth: int) -> Iterator[Row]:
+        nonlocal has_error
+        if depth > 8 or not isinstance(node, dict):
+            return
+        for key, value in node.items():
+            path = f"{source}.{key}" if source else key
+            if key == 'error':
+                has_error = True
+            elif key == 'advanced_dns_recon' and isinstance(value, dict):
+                for record_type, records in value.items():
+                    # الحل الفاشل يُسجل كخطأ لا كسجلات (مثل {'error': 'timeout'})
+                    if record_type == 'error':
+                        has_error = True
+                        continue
+                    if not isinstance(records, list):
+                        continue
+                    for record in records:
+                        counts['dns_records'] += 1
+                        yield 'dns_records', (investigation_id, target, record_type, str(record))
+                        relation = DNS_RELATIONS.get(record_type)
+                        if relation:
+                            yield 'relationships', (investigation_id, target, relation, str(record).rstrip('.'), phase)
+            elif key in CONTACT_KEYS and isinstance(value, list):
+                kind = CONTACT_KEYS[key]
+                for contact in value:
+                    contact = canonicalize(kind, contact)
+                    if contact is None or (kind, contact) in seen_contacts:
+                        continue
+                    seen_contacts.add((kind, contact))
+                    counts['contacts'] += 1
+                    yield 'contacts', (investigation_id, target, phase, kind, contact, source)
+            elif key == 'entities' and isinstance(value, list):
+                for entity in value:
+                    if isinstance(entity, dict) and 'word' in entity:
+                        counts['entities'] += 1
+                        yield 'entities', (
+                            investigation_id, target, phase,
+                            entity.get('entity_group') or entity.get('entity'), entity['word'],
+                            entity.get('score'), entity.get('start'), entity.get('end')
+                        )
+            elif key == 'subdomain_enumeration' and isinstance(value, (list, dict)):
+                if isinstance(value, dict) and 'error' in value:
+                    has_error = True
+                    continue
+                for subdomain in value:
+                    yield 'relationships', (investigation_id, target, 'has_subdomain', str(subdomain), phase)
+            elif key == 'name_servers' and isinstance(value, list):
+                for name_server in value:
+                    yield 'relationships', (investigation_id, target, 'name_server', str(name_server), phase)
+            elif key == 'relationships' and isinstance(value, list):
+                for relation in value:
+                    if isinstance(relation, dict):
+                        yield 'relationships', (
+                            investigation_id, str(relation.get('source', target)), relation.get('type'),
+                            str(relation.get('target')), phase
+                        )
+            else:
+                yield from walk(value, path, depth + 1)
+
+    yield from walk(result, "", 0)
+    yield 'targets', (
+        investigation_id, target, phase, has_error,
+        counts['dns_records'], counts['contacts'], counts['entities']
+    )
+
+class ColumnarExporter:
+    """كاتب جداول عمودية على دفعات (Parquet أو Arrow IPC)"""
+    def __init__(self, output_dir: str, investigation_id: str = "", fmt: str = "parquet",
+                 batch_rows: int = 65536):
+        if fmt not in EXTENSIONS:
+            raise ValueError(f"صيغة تصدير غير مدعومة: {fmt}")
+        self.logger = logging.getLogger(__name__)
+        self.pa = lazy_import("pyarrow")
+        self.output_dir = output_dir
+        self.investigation_id = investigation_id
+        self.format = fmt
+        self.batch_rows = batch_rows
+        self.schemas = {
+            table: self.pa.schema([(name, getattr(self.pa, type_name)()) for name, type_name in columns])
+            for table, columns in TABLE_COLUMNS.items()
+        }
+        self.buffers: Dict[str, List[Tuple[Any, ...]]] = {table: [] for table in TABLE_COLUMNS}
+        self.writers: Dict[str, Any] = {}
+        self.row_counts: Dict[str, int] = defaultdict(int)
+        os.makedirs(output_dir, exist_ok=True)
+
+    def path(self, table: str) -> str:
+        """مسار ملف الجدول"""
+        return os.path.join(self.output_dir, table + EXTENSIONS[self.format])
+
+    def add(self, target: str, phase: str, result: Any):
+        """إضافة نتيجة هدف واحد"""
+        for table, row in flatten_result(self.investigation_id, target, phase, result):
+            buffer = self.buffers[table]
+            buffer.append(row)
+            if len(buffer) >= self.batch_rows:
+                self.flush(table)
+
+    def flush(self, table: str):
+        """كتابة صفوف الجدول المتراكمة كدفعة واحدة"""
+        rows = self.buffers[table]
+        if not rows:
+            return
+        schema = self.schemas[table]
+        columns = list(zip(*rows))
+        batch = self.pa.RecordBatch.from_arrays(
+            [self.pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+            schema=schema
+        )
+        self.writer(table).write_batch(batch)
+        self.row_counts[table] += len(rows)
+        rows.clear()
+
+    def writer(self, table: str):
+        """كاتب الملف (يُفتح عند أول دفعة)"""
+        writer = self.writers.get(table)
+        if writer is None:
+            if self.format == 'parquet':
+                parquet = lazy_import("pyarrow.parquet")
+                writer = parquet.ParquetWriter(self.path(table), self.schemas[table], compression='zstd')
+            else:
+                writer = self.pa.ipc.new_file(self.path(table), self.schemas[table])
+            self.writers[table] = writer
+        return writer
+
+    def close(self) -> Dict[str, Any]:
+        """كتابة ما تبقى وإغلاق الملفات"""
+        for table in TABLE_COLUMNS:
+            self.flush(table)
+            if table not in self.writers:
+                # جدول فارغ يُكتب بمخططه حتى يجده القارئ
+                self.writer(table)
+        for writer in self.writers.values():
+            writer.close()
+        self.writers = {}
+        return {table: {'path': self.path(table), 'rows': self.row_counts[table]} for table in TABLE_COLUMNS}
+
+def export_records(records: Iterable[Tuple[str, str, Any]], output_dir: str,
+                   investigation_id: str = "", fmt: str = "parquet") -> Dict[str, Any]:
+    """تصدير سجلات (الهدف، المرحلة، النتيجة)، مثل iter_target_records"""
+    exporter = ColumnarExporter(output_dir, investigation_id, fmt)
+    for target, phase, result in records:
+        exporter.add(target, phase, result)
+    return exporter.close()
+
+async def export_investigation(store, investigation_id: str, output_dir: str,
+                               fmt: str = "parquet") -> Dict[str, Any]:
+    """تصدير تحقيق من المخزن دفعة بعد دفعة"""
+    exporter = ColumnarExporter(output_dir, investigation_id, fmt)
+    async for target, phase, result in store.iter_target_results(investigation_id):
+        exporter.add(target, phase, json.loads(result))
+    return exporter.close()
+
+def read_table(output_dir: str, table: str, columns: Optional[List[str]] = None,
+               filters: Optional[List[Tuple[str, str, Any]]] = None):
+    """قراءة جدول مُصدّر بذاكرة مُسقطة (دون نسخ البيانات إلى الذاكرة)
+
+    filters بصيغة pyarrow مثل [('record_type', '=', 'MX')] (Parquet فقط).
+    """
+    pa = lazy_import("pyarrow")
+    parquet_path = os.path.join(output_dir, table + EXTENSIONS['parquet'])
+    if os.path.exists(parquet_path):
+        parquet = lazy_import("pyarrow.parquet")
+        return parquet.read_table(parquet_path, columns=columns, filters=filters, memory_map=True)
+
+    arrow_path = os.path.join(output_dir, table + EXTENSIONS['arrow'])
+    arrow_table = pa.ipc.open_file(pa.memory_map(arrow_path, 'r')).read_all()
+    return arrow_table.select(columns) if columns else arrow_table
+
+async def export_main(args: argparse.Namespace):
+    """تصدير تحقيق من سطر الأوامر"""
+    from storage.investigation_store import InvestigationStore
+    store = InvestigationStore(args.database_url)
+    await store.connect()
+    try:
+        summary = await export_investigation(store, args.investigation_id, args.output_dir, args.format)
+    finally:
+        await store.close()
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="تصدير نتائج تحقيق بصيغة عمودية")
+    parser.add_argument("investigation_id")
+    parser.add_argument("output_dir")
+    parser.add_argument("--format", choices=sorted(EXTENSIONS), default="parquet")
+    parser.add_argument("--database-url", default=Settings.DATABASE_URL)
+    asyncio.run(export_main(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+مخزن التحقيقات وطابور المهام الدائم
+Investigation Store & Durable Job Queue
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import aiosqlite
+
+from config.settings import Settings
+from core.result_cache import to_json
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS investigations (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    targets TEXT NOT NULL,
+    scan_type TEXT NOT NULL,
+    depth TEXT NOT NULL,
+    profile INTEGER NOT NULL DEFAULT 0,
+    progress REAL NOT NULL DEFAULT 0,
+    current_phase TEXT,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    completed_at TEXT,
+    error TEXT,
+    results TEXT
+);
+CREATE TABLE IF NOT EXISTS investigation_targets (
+    target TEXT NOT NULL,
+    investigation_id TEXT NOT NULL,
+    PRIMARY KEY (target, investigation_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS investigation_results (
+    investigation_id TEXT NOT NULL,
+    target TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (investigation_id, target, phase)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_investigations_status ON investigations (status, id);
+CREATE INDEX IF NOT EXISTS idx_investigations_created_at ON investigations (created_at);
+CREATE INDEX IF NOT EXISTS idx_investigations_queue ON investigations (status, created_at, id);
+"""
+
+# أعمدة أضيفت بعد الإصدار الأول (تُضاف إلى قواعد البيانات القائمة عند الاتصال)
+ADDED_COLUMNS = [
+    ('investigations', 'profile', 'INTEGER NOT NULL DEFAULT 0')
+]
+
+# أعمدة ملخص التحقيق في القوائم
+LIST_COLUMNS = "id, status, targets, scan_type, progress, created_at, completed_at"
+
+_CROCKFORD32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+class InvestigationIdGenerator:
+    """معرفات فريدة مرتبة زمنياً (بصيغة ULID)
+
+    48 بت للوقت بالميلي ثانية و80 بت عشوائية؛ داخل نفس الميلي ثانية
+    يُزاد الجزء العشوائي بواحد، لذلك تبقى المعرفات متزايدة دائماً.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.last_ms = 0
+        self.last_random = 0
+
+    def new_id(self) -> str:
+        """معرف تحقيق جديد"""
+        with self.lock:
+            now_ms = int(time.time() * 1000)
+            if now_ms <= self.last_ms:
+                now_ms = self.last_ms
+                self.last_random += 1
+            else:
+                self.last_random = int.from_bytes(os.urandom(10), 'big') >> 1
+            self.last_ms = now_ms
+            value = (now_ms << 80) | self.last_random
+
+        chars = []
+        for _ in range(26):
+            chars.append(_CROCKFORD32[value & 31])
+            value >>= 5
+        return "inv_" + "".join(reversed(chars))
+
+_id_generator = InvestigationIdGenerator()
+
+def new_investigation_id() -> str:
+    """معرف تحقيق فريد مرتب زمنياً"""
+    return _id_generator.new_id()
+
+def sqlite_path(database_url: str) -> str:
+    """مسار ملف SQLite من DATABASE_URL"""
+    for prefix in ("sqlite+aiosqlite:///", "sqlite:///"):
+        if database_url.startswith(prefix):
+            return database_url[len(prefix):]
+    raise ValueError(f"قاعدة بيانات غير مدعومة: {database_url}")
+
+class InvestigationStore:
+    """مخزن التحقيقات في SQLite، ويعمل أيضاً كطابور مهام دائم
+
+    كل اتصال aiosqlite ينفذ استعلاماته في خيط واحد، لذلك الكتابة (الطابور
+    والتقدم والنتائج) في اتصال، والقراءة (الحالة والقوائم والنتائج) موزعة
+    على اتصالات منفصلة تقرأ بالتوازي معها بفضل WAL.
+    """
+    def __init__(self, database_url: Optional[str] = None, read_connections: Optional[int] = None):
+        self.logger = logging.getLogger(__name__)
+        self.path = sqlite_path(database_url or Settings.DATABASE_URL)
+        self.db: Optional[aiosqlite.Connection] = None
+        self.read_connections = Settings.STORE_READ_CONNECTIONS if read_connections is None else read_connections
+        self.readers: List[aiosqlite.Connection] = []
+        self.next_reader = 0
+        self.claim_lock = asyncio.Lock()
+
+    async def connect(self):
+        """فتح الاتصال وإنشاء الجداول واستعادة المهام المقطوعة"""
+        self.db = await aiosqlite.connect(self.path)
+        self.db.row_factory = aiosqlite.Row
+        await self.db.execute("PRAGMA journal_mode=WAL")
+        await self.db.execute("PRAGMA synchronous=NORMAL")
+        await self.db.executescript(SCHEMA)
+        await self.migrate()
+
+        # المهام التي كانت قيد التنفيذ عند توقف الخادم تعود إلى الطابور
+        cursor = await self.db.execute(
+            "UPDATE investigations SET status = 'pending', started_at = NULL WHERE status = 'running'"
+        )
+        if cursor.rowcount:
+            self.logger.info(f"♻️ إعادة {cursor.rowcount} تحقيق مقطوع إلى الطابور")
+        await self.db.commit()
+
+        for _ in range(self.read_connections):
+            reader = await aiosqlite.connect(self.path)
+            reader.row_factory = aiosqlite.Row
+            self.readers.append(reader)
+
+    @property
+    def reader(self) -> aiosqlite.Connection:
+        """اتصال قراءة بالتناوب (اتصال الكتابة إذا لم توجد اتصالات قراءة)"""
+        if not self.readers:
+            return self.db
+        self.next_reader = (self.next_reader + 1) % len(self.readers)
+        return self.readers[self.next_reader]
+
+    async def migrate(self):
+        """إضافة الأعمدة الجديدة إلى الجداول المنشأة بإصدار أقدم"""
+        for table, column, definition in ADDED_COLUMNS:
+            cursor = await self.db.execute(f"PRAGMA table_info({table})")
+            if column not in {row['name'] for row in await cursor.fetchall()}:
+                await self.db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    async def close(self):
+        """إغلاق الاتصالات"""
+        for reader in self.readers:
+            await reader.close()
+        self.readers = []
+        if self.db is not None:
+            await self.db.close()
+            self.db = None
+
+    async def create(self, investigation_id: str, targets: List[str],
+                     scan_type: str, depth: str, profile: bool = False) -> Dict[str, Any]:
+        """إضافة تحقيق جديد إلى الطابور"""
+        created_at = datetime.now().isoformat()
+        await self.db.execute(
+            "INSERT INTO investigations (id, status, targets, scan_type, depth, profile, created_at)"
+            " VALUES (?, 'pending', ?, ?, ?, ?, ?)",
+            (investigation_id, json.dumps(targets, ensure_ascii=False), scan_type, depth, int(profile), created_at)
+        )
+        await self.db.executemany(
+            "INSERT OR IGNORE INTO investigation_targets (target, investigation_id) VALUES (?, ?)",
+            [(target, investigation_id) for target in targets]
+        )
+        await self.db.commit()
+        return {
+            'investigation_id': investigation_id,
+            'status': 'pending',
+            'targets': targets,
+            'created_at': created_at
+        }
+
+    async def claim_next(self) -> Optional[Dict[str, Any]]:
+        """سحب أقدم تحقيق منتظر وتحويله إلى قيد التنفيذ
+
+        الترتيب بوقت الإنشاء لا بالمعرف: المعرفات القديمة (inv_<timestamp>)
+        تأتي بعد معرفات ULID أبجدياً، فالترتيب بالمعرف يؤخرها بلا نهاية.
+        """
+        async with self.claim_lock:
+            cursor = await self.db.execute(
+                "SELECT id, targets, scan_type, depth, profile FROM investigations"
+                " WHERE status = 'pending' ORDER BY created_at, id LIMIT 1"
+            )
+            row = await cursor.fetchone()
+            if row is None:
+                return None
+
+            await self.db.execute(
+                "UPDATE investigations SET status = 'running', started_at = ? WHERE id = ?",
+                (datetime.now().isoformat(), row['id'])
+            )
+            await self.db.commit()
+
+        return {
+            'investigation_id': row['id'],
+            'targets': json.loads(row['targets']),
+            'scan_type': row['scan_type'],
+            'depth': row['depth'],
+            'profile': bool(row['profile'])
+        }
+
+    async def update_progress(self, investigation_id: str, progress: float, phase: Optional[str] = None):
+        """تحديث نسبة التقدم والمرحلة الحالية"""
+        await self.db.execute(
+            "UPDATE investigations SET progress = ?, current_phase = ? WHERE id = ?",
+            (progress, phase, investigation_id)
+        )
+        await self.db.commit()
+
+    async def save_target_results(self, investigation_id: str, records: List[Tuple[str, str, Any]]):
+        """حفظ نتائج الأهداف (الهدف، المرحلة، النتيجة) فور إنتاجها"""
+        if not records:
+            return
+        await self.db.executemany(
+            "INSERT OR REPLACE INTO investigation_results (investigation_id, target, phase, result)"
+            " VALUES (?, ?, ?, ?)",
+            [(investigation_id, target, phase, to_json(result)) for target, phase, result in records]
+        )
+        await self.db.commit()
+
+    async def complete(self, investigation_id: str, summary: Dict[str, Any]):
+        """تسجيل اكتمال التحقيق وحفظ ملخصه (النتائج محفوظة لكل هدف)"""
+        await self.db.execute(
+            "UPDATE investigations SET status = 'completed', progress = 100,"
+            " completed_at = ?, results = ? WHERE id = ?",
+            (datetime.now().isoformat(), to_json(summary), investigation_id)
+        )
+        await self.db.commit()
+
+    async def fail(self, investigation_id: str, error: str):
+        """تسجيل فشل التحقيق"""
+        await self.db.execute(
+            "UPDATE investigations SET status = 'failed', completed_at = ?, error = ? WHERE id = ?",
+            (datetime.now().isoformat(), error, investigation_id)
+        )
+        await self.db.commit()
+
+    async def get(self, investigation_id: str) -> Optional[Dict[str, Any]]:
+        """حالة تحقيق واحد"""
+        cursor = await self.reader.execute(
+            "SELECT id, status, targets, scan_type, depth, progress, current_phase,"
+            " created_at, started_at, completed_at, error, results FROM investigations WHERE id = ?",
+            (investigation_id,)
+        )
+        row = await cursor.fetchone()
+        if row is None:
+            return None
+        return {
+            'investigation_id': row['id'],
+            'status': row['status'],
+            'targets': json.loads(row['targets']),
+            'scan_type': row['scan_type'],
+            'depth': row['depth'],
+            'progress': row['progress'],
+            'current_phase': row['current_phase'],
+            'results_available': row['status'] == 'completed',
+            'created_at': row['created_at'],
+            'started_at': row['started_at'],
+            'completed_at': row['completed_at'],
+            'error': row['error'],
+            'summary': json.loads(row['results']) if row['results'] else None
+        }
+
+    async def result_targets(self, investigation_id: str, limit: int,
+                             after: Optional[str] = None) -> List[str]:
+        """الأهداف التي لها نتائج بالترتيب (لترقيم النتائج حسب الهدف)"""
+        cursor = await self.reader.execute(
+            "SELECT DISTINCT target FROM investigation_results"
+            " WHERE investigation_id = ? AND target > ? ORDER BY target LIMIT ?",
+            (investigation_id, after or "", limit)
+        )
+        return [row['target'] for row in await cursor.fetchall()]
+
+    async def iter_target_results(self,
+                                  investigation_id: str,
+                                  after: Optional[str] = None,
+                                  until: Optional[str] = None,
+                                  batch_size: int = 500) -> AsyncIterator[Tuple[str, str, str]]:
+        """نتائج الأهداف كسلاسل JSON خام (الهدف، المرحلة، النتيجة) دفعة بعد دفعة
+
+        القراءة على دفعات من الفهرس، لذلك لا تُحمّل نتائج التحقيق كاملة في الذاكرة.
+        """
+        query = (
+            "SELECT target, phase, result FROM investigation_results"
+            " WHERE investigation_id = ? AND target > ?"
+        )
+        params: List[Any] = [investigation_id, after or ""]
+        if until is not None:
+            query += " AND target <= ?"
+            params.append(until)
+        query += " ORDER BY target, phase"
+
+        cursor = await self.reader.execute(query, params)
+        try:
+            while True:
+                rows = await cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row['target'], row['phase'], row['result']
+        finally:
+            await cursor.close()
+
+    async def list_investigations(self,
+                                  limit: int = 50,
+                                  cursor: Optional[str] = None,
+                                  status: Optional[str] = None,
+                                  target: Optional[str] = None,
+                                  created_after: Optional[str] = None) -> Dict[str, Any]:
+        """قائمة التحقيقات الأحدث أولاً بترقيم المؤشر (keyset)
+
+        المعرفات مرتبة زمنياً، لذلك المؤشر هو آخر معرف في الصفحة السابقة
+        وكل صفحة استعلام نطاق على فهرس دون OFFSET.
+        """
+        conditions, params = [], []
+        if cursor:
+            # المؤشر على عمود الفهرس المستخدم في الترتيب (نطاق على المفتاح الأساسي للأهداف)
+            conditions.append("t.investigation_id < ?" if target else "i.id < ?")
+            params.append(cursor)
+        if status:
+            conditions.append("i.status = ?")
+            params.append(status)
+        if created_after:
+            conditions.append("i.created_at >= ?")
+            params.append(created_after)
+
+        if target:
+            query = (
+                f"SELECT {', '.join('i.' + c for c in LIST_COLUMNS.split(', '))}"
+                " FROM investigation_targets t JOIN investigations i ON i.id = t.investigation_id"
+                " WHERE t.target = ?"
+            )
+            params.insert(0, target)
+            order = " ORDER BY t.investigation_id DESC"
+        else:
+            query = f"SELECT {LIST_COLUMNS} FROM investigations i WHERE 1 = 1"
+            order = " ORDER BY i.id DESC"
+
+        for condition in conditions:
+            query += " AND " + condition
+        query += order + " LIMIT ?"
+        params.append(limit + 1)
+
+        result = await self.reader.execute(query, params)
+        rows = await result.fetchall()
+
+        items = [
+            {
+                'investigation_id': row['id'],
+                'status': row['status'],
+                'targets': json.loads(row['targets']),
+                'scan_type': row['scan_type'],
+                'progress': row['progress'],
+                'created_at': row['created_at'],
+                'completed_at': row['completed_at']
+            }
+            for row in rows[:limit]
+        ]
+        return {
+            'items': items,
+            'next_cursor': items[-1]['investigation_id'] if len(rows) > limit else None
+        }
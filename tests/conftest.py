@@ -0,0 +1,5 @@
+import os
+import sys
+
+# الوحدات تُستورد من جذر المستودع (دون تثبيت الحزمة)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
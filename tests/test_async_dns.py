@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+اختبارات محلل سجلات A عالي الإنتاجية
+Bulk A-Record Resolver Tests
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("dns")
+
+from benchmarks.stub_dns import StubDNSServer, address_for
+from core.async_dns import BulkResolver
+
+def test_query_a_answers_and_nxdomain():
+    with StubDNSServer(zone="bench.test") as server:
+        resolver = BulkResolver(nameservers=[server.host], port=server.port, timeout=2, retries=0)
+
+        async def scenario():
+            try:
+                return await resolver.query_a("www.bench.test"), await resolver.query_a("nxhost.bench.test")
+            finally:
+                resolver.close()
+
+        found, missing = asyncio.run(scenario())
+    assert found == [address_for("www.bench.test")]
+    assert missing == []
+
+def test_cancelled_queries_release_their_ids():
+    # خادم لا يجيب: الاستعلامات تبقى معلقة حتى تُلغى
+    resolver = BulkResolver(nameservers=["127.0.0.1"], port=9, timeout=30, retries=0)
+
+    async def scenario():
+        tasks = [asyncio.ensure_future(resolver.query_a(f"h{i}.bench.test")) for i in range(50)]
+        await asyncio.sleep(0.05)
+        in_flight = len(resolver.pending)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        remaining = len(resolver.pending)
+        resolver.close()
+        return in_flight, remaining
+
+    in_flight, remaining = asyncio.run(scenario())
+    assert in_flight == 50
+    assert remaining == 0
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+اختبارات نقاط استئناف المسح
+Scan Checkpoint Resume Tests
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+from core.checkpoints import ScanCheckpoints
+from core.result_cache import TwoTierCache
+from core.scheduler import TaskScheduler
+
+TECHNIQUES = ['advanced_dns_recon']
+
+def checkpoints(tmp_path) -> ScanCheckpoints:
+    return ScanCheckpoints(cache=TwoTierCache(path=str(tmp_path / "checkpoints.db"), namespace="scan_checkpoints"))
+
+@pytest.mark.parametrize("result, complete", [
+    ({'advanced_dns_recon': {'A': ["10.0.0.1"]}}, True),
+    ({'error': "timeout"}, False),
+    ({'advanced_dns_recon': {'A': ["10.0.0.1"], 'error': "MX: LifetimeTimeout"}}, False),
+    ({'subdomain_enumeration': {}}, True),
+    ([], True)
+])
+def test_is_complete(result, complete):
+    assert ScanCheckpoints.is_complete(result) is complete
+
+def test_resume_across_instances_skips_failures_and_other_fingerprints(tmp_path):
+    async def scenario():
+        store = checkpoints(tmp_path)
+        await store.asave('advanced_reconnaissance', "a.example", {'advanced_dns_recon': {'A': ["10.0.0.1"]}}, TECHNIQUES)
+        await store.asave('advanced_reconnaissance', "b.example", {'advanced_dns_recon': {'error': "timeout"}}, TECHNIQUES)
+        store.close()
+
+        # محرك جديد على نفس الملف (إعادة تشغيل بعد انقطاع)
+        resumed = checkpoints(tmp_path)
+        try:
+            targets = ["a.example", "b.example", "c.example"]
+            return (
+                await resumed.aload('advanced_reconnaissance', targets, TECHNIQUES),
+                await resumed.aload('advanced_reconnaissance', targets, TECHNIQUES + ['whois_analysis']),
+                await resumed.aload('other_phase', targets, TECHNIQUES)
+            )
+        finally:
+            resumed.close()
+
+    same, changed_techniques, other_phase = asyncio.run(scenario())
+    assert same == {"a.example": {'advanced_dns_recon': {'A': ["10.0.0.1"]}}}
+    assert changed_techniques == {}
+    assert other_phase == {}
+
+def test_reconnaissance_resumes_only_unfinished_targets(tmp_path):
+    advanced_engine = pytest.importorskip("core.advanced_engine")
+    calls = []
+
+    async def advanced_dns_recon(target):
+        calls.append(target)
+        if target == "b.example" and calls.count(target) == 1:
+            return {'error': "timeout"}
+        return {'A': ["10.0.0.1"]}
+
+    def engine():
+        instance = advanced_engine.QuantumOSINTEngine.__new__(advanced_engine.QuantumOSINTEngine)
+        instance.logger = logging.getLogger(__name__)
+        instance.recon_techniques = list(TECHNIQUES)
+        instance.advanced_dns_recon = advanced_dns_recon
+        instance.scheduler = TaskScheduler(max_concurrency=4, timeout=5)
+        instance.checkpoints = checkpoints(tmp_path)
+        instance.standalone_correlator = None
+        return instance
+
+    async def run_phase(instance, targets):
+        try:
+            resumed = await instance.load_checkpoints('advanced_reconnaissance', targets)
+            remaining = [target for target in targets if target not in resumed]
+            return {**resumed, **await instance.phase_advanced_reconnaissance(remaining)}
+        finally:
+            instance.checkpoints.close()
+
+    targets = ["a.example", "b.example", "c.example"]
+    first = asyncio.run(run_phase(engine(), targets))
+    second = asyncio.run(run_phase(engine(), targets))
+
+    assert first["b.example"] == {'advanced_dns_recon': {'error': "timeout"}}
+    assert second == {target: {'advanced_dns_recon': {'A': ["10.0.0.1"]}} for target in targets}
+    # الجولة الثانية تعيد الهدف الفاشل فقط
+    assert sorted(calls) == ["a.example", "b.example", "b.example", "c.example"]
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+اختبارات التصدير العمودي
+Columnar Export Tests
+"""
+
+import pytest
+
+from storage.columnar_export import export_records, flatten_result, read_table
+
+def recon_result(i: int) -> dict:
+    return {
+        'advanced_dns_recon': {'A': [f"10.0.0.{i}"], 'MX': [f"mx{i}.example."]},
+        'whois_analysis': {'registrar': 'Example Registrar'},
+        'subdomain_enumeration': {f"www.t{i}.example": [f"10.0.1.{i}"]},
+        'hidden_contacts': {'emails': [f"Info@T{i}.example", f"info@t{i}.example"]}
+    }
+
+def rows_by_table(result: dict) -> dict:
+    tables = {}
+    for table, row in flatten_result("inv", "t.example", "advanced_reconnaissance", result):
+        tables.setdefault(table, []).append(row)
+    return tables
+
+def test_failed_dns_recon_sets_error_without_records():
+    tables = rows_by_table({'advanced_dns_recon': {'error': 'timeout'}})
+    assert 'dns_records' not in tables
+    assert 'relationships' not in tables
+    assert tables['targets'] == [("inv", "t.example", "advanced_reconnaissance", True, 0, 0, 0)]
+
+def test_partial_dns_recon_keeps_records_and_sets_error():
+    tables = rows_by_table({'advanced_dns_recon': {'A': ["10.0.0.1"], 'error': 'MX: LifetimeTimeout'}})
+    assert tables['dns_records'] == [("inv", "t.example", "A", "10.0.0.1")]
+    assert tables['targets'][0][3] is True
+
+def test_failed_subdomain_enumeration_is_not_a_subdomain():
+    tables = rows_by_table({'subdomain_enumeration': {'error': 'timeout'}})
+    assert 'relationships' not in tables
+    assert tables['targets'][0][3] is True
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_export_round_trip(tmp_path, fmt):
+    pytest.importorskip("pyarrow")
+    records = [(f"t{i}.example", "advanced_reconnaissance", recon_result(i)) for i in range(5)]
+    records.append(("bad.example", "advanced_reconnaissance", {'advanced_dns_recon': {'error': 'timeout'}}))
+    tables = export_records(iter(records), str(tmp_path), "inv", fmt)
+
+    assert tables['dns_records']['rows'] == 10
+    assert tables['contacts']['rows'] == 5
+    assert tables['targets']['rows'] == 6
+
+    targets = read_table(str(tmp_path), "targets").to_pydict()
+    assert dict(zip(targets['target'], targets['has_error']))['bad.example'] is True
+    assert sum(targets['has_error']) == 1
+
+    dns = read_table(str(tmp_path), "dns_records", columns=["target", "value"]).to_pydict()
+    assert "bad.example" not in dns['target']
+    assert sorted(dns['value'])[:2] == ["10.0.0.0", "10.0.0.1"]
+
+def test_parquet_filters(tmp_path):
+    pytest.importorskip("pyarrow")
+    export_records(((f"t{i}.example", "advanced_reconnaissance", recon_result(i)) for i in range(5)),
+                   str(tmp_path), "inv", "parquet")
+    mx = read_table(str(tmp_path), "dns_records", columns=["value"], filters=[("record_type", "=", "MX")])
+    assert sorted(mx.column("value").to_pylist()) == [f"mx{i}.example." for i in range(5)]
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+اختبارات فهرس الربط بين الأهداف
+Cross-Target Correlation Index Tests
+"""
+
+import os
+import subprocess
+import sys
+
+from core.correlation_index import CorrelationIndex, entity_key
+
+def test_shared_entities_link_targets():
+    index = CorrelationIndex()
+    assert index.add_result("a.example", {'hidden_contacts': {'emails': ["Info@Shared.example"]}}) == []
+    links = index.add_result("b.example", {'hidden_contacts': {'emails': ["info@shared.example"]}})
+    assert [(link.source, link.target, link.kind) for link in links] == [("a.example", "b.example", "email")]
+    assert index.related_targets("b.example") == {"a.example": 1}
+
+def test_dns_error_marker_is_not_an_entity():
+    index = CorrelationIndex()
+    index.add_result("a.example", {'advanced_dns_recon': {'error': 'timeout'}})
+    assert index.add_result("b.example", {'advanced_dns_recon': {'error': 'timeout'}}) == []
+
+def test_entity_key_is_stable_across_processes():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "from core.correlation_index import entity_key; print(entity_key('email', 'info@shared.example'))"
+    keys = {
+        subprocess.run(
+            [sys.executable, "-c", code], cwd=root, check=True, capture_output=True, text=True,
+            env={**os.environ, 'PYTHONHASHSEED': seed}
+        ).stdout.strip()
+        for seed in ("1", "2")
+    }
+    assert keys == {str(entity_key('email', 'info@shared.example'))}
+
+def test_subdomain_error_marker_is_not_an_entity():
+    index = CorrelationIndex()
+    index.add_result("a.example", {'subdomain_enumeration': {'error': 'TimeoutError'}})
+    assert index.add_result("b.example", {'subdomain_enumeration': {'error': 'TimeoutError'}}) == []
+    assert index.related_targets("b.example") == {}
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+اختبارات تطبيع الكيانات وإزالة المكرر
+Entity Normalization & Deduplication Tests
+"""
+
+from core.entity_normalizer import (
+    CanonicalKeySet, EntityDeduplicator, canonical_key, normalize_domain, normalize_email, normalize_phone
+)
+
+def test_normalizers():
+    assert normalize_phone("+1 (202) 555-0123") == "+12025550123"
+    assert normalize_phone("0044 20 7946 0000") == "+442079460000"
+    assert normalize_phone("123") is None
+    assert normalize_email("John.Doe+news@Example.COM") == "john.doe@example.com"
+    assert normalize_domain("Bücher.Example.") == "xn--bcher-kva.example"
+
+def test_same_text_of_different_kinds_is_not_a_duplicate():
+    assert canonical_key('social', "example.com") != canonical_key('domain', "example.com")
+    deduplicator = EntityDeduplicator()
+    fresh = deduplicator.dedupe_batch([('domain', "Example.com"), ('social', "example.com"), ('domain', "example.com.")])
+    assert fresh == [('domain', "example.com"), ('social', "example.com")]
+
+def test_dedupe_stream_across_batches():
+    deduplicator = EntityDeduplicator(batch_size=3)
+    entities = [('email', f"User{i % 4}@Example.com") for i in range(20)] + [('phone', "bad")]
+    assert list(deduplicator.dedupe_stream(entities)) == [('email', f"user{i}@example.com") for i in range(4)]
+    assert deduplicator.get_stats()['unique'] == 4
+    assert len(deduplicator.keys) == 4
+
+def test_key_set_compacts_runs():
+    keys = CanonicalKeySet()
+    for start in range(0, 1000, 10):
+        keys.add_batch(range(start, start + 10))
+    assert len(keys) == 1000
+    assert len(keys.runs) <= 10
+    assert 999 in keys and 1000 not in keys
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+اختبارات محرك التحقيقات الخلفي والطابور الدائم
+Investigation Job Engine & Durable Queue Tests
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from storage.investigation_store import InvestigationStore, new_investigation_id
+from web.backend.job_engine import InvestigationJobEngine
+
+class FakeEngine:
+    """محرك مسح يبث نتيجة لكل هدف ثم يعيد النتائج المدمجة"""
+    def __init__(self, fatal_error=None, delay=0.0):
+        self.fatal_error = fatal_error
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+
+    async def comprehensive_scan(self, targets, progress_callback=None, event_callback=None, resume=True):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            phase = {}
+            for target in targets:
+                phase[target] = {'advanced_dns_recon': {'A': ["10.0.0.1"]}}
+                event_callback('target_completed', {
+                    'phase': 'advanced_reconnaissance', 'target': target, 'result': phase[target]
+                })
+                await asyncio.sleep(0)
+            if progress_callback is not None:
+                await progress_callback('advanced_reconnaissance', 1, 1)
+        finally:
+            self.running -= 1
+        results = {'phases': {'advanced_reconnaissance': phase}, 'errors': {}, 'metrics': {}}
+        if self.fatal_error:
+            results['fatal_error'] = self.fatal_error
+        return results
+
+def store_url(tmp_path) -> str:
+    return f"sqlite:///{tmp_path / 'investigations.db'}"
+
+async def wait_for_status(store, investigation_id, statuses=('completed', 'failed'), timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        record = await store.get(investigation_id)
+        if record['status'] in statuses:
+            return record
+        assert asyncio.get_running_loop().time() < deadline, record
+        await asyncio.sleep(0.01)
+
+def test_crashed_scan_is_failed(tmp_path):
+    async def scenario():
+        store = InvestigationStore(store_url(tmp_path), read_connections=1)
+        engine = InvestigationJobEngine(store, engine_factory=lambda: FakeEngine(fatal_error="RuntimeError: boom"),
+                                        workers=2, poll_interval=0.01)
+        await engine.start()
+        try:
+            investigation_id = new_investigation_id()
+            await engine.submit(investigation_id, ["a.example"], "full", "deep")
+            return await wait_for_status(store, investigation_id)
+        finally:
+            await engine.stop()
+
+    record = asyncio.run(scenario())
+    assert record['status'] == 'failed'
+    assert "boom" in record['error']
+
+def test_failed_batch_write_fails_the_investigation(tmp_path):
+    async def scenario():
+        store = InvestigationStore(store_url(tmp_path), read_connections=1)
+        engine = InvestigationJobEngine(store, engine_factory=FakeEngine, workers=1,
+                                        poll_interval=0.01, results_batch_size=1)
+        await engine.start()
+        save = store.save_target_results
+        calls = 0
+
+        async def flaky_save(investigation_id, records):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise OSError("disk full")
+            await save(investigation_id, records)
+
+        store.save_target_results = flaky_save
+        try:
+            investigation_id = new_investigation_id()
+            await engine.submit(investigation_id, ["a.example", "b.example"], "full", "deep")
+            return await wait_for_status(store, investigation_id)
+        finally:
+            await engine.stop()
+
+    record = asyncio.run(scenario())
+    assert record['status'] == 'failed'
+    assert "disk full" in record['error']
+
+def test_jobs_run_concurrently_up_to_worker_count(tmp_path):
+    pytest.importorskip("core.advanced_engine")
+    fake = FakeEngine(delay=0.05)
+
+    async def scenario():
+        store = InvestigationStore(store_url(tmp_path), read_connections=1)
+        engine = InvestigationJobEngine(store, engine_factory=lambda: fake, workers=3, poll_interval=0.01)
+        await engine.start()
+        try:
+            ids = [new_investigation_id() for _ in range(7)]
+            for investigation_id in ids:
+                await engine.submit(investigation_id, [f"{investigation_id.lower()}.example"], "full", "deep")
+            return [await wait_for_status(store, investigation_id) for investigation_id in ids]
+        finally:
+            await engine.stop()
+
+    records = asyncio.run(scenario())
+    assert [record['status'] for record in records] == ['completed'] * 7
+    assert fake.peak == 3
+
+def test_claim_next_orders_by_creation_time(tmp_path):
+    async def scenario():
+        store = InvestigationStore(store_url(tmp_path), read_connections=1)
+        await store.connect()
+        try:
+            # معرف قديم بصيغة inv_<timestamp> يأتي بعد ULID أبجدياً لكنه أُنشئ أولاً
+            await store.create("inv_1700000000", ["old.example"], "full", "deep")
+            await store.create(new_investigation_id(), ["new.example"], "full", "deep")
+            first = await store.claim_next()
+            second = await store.claim_next()
+            return first, second, await store.claim_next()
+        finally:
+            await store.close()
+
+    first, second, third = asyncio.run(scenario())
+    assert first['investigation_id'] == "inv_1700000000"
+    assert second['targets'] == ["new.example"]
+    assert third is None
+
+def test_investigation_ids_are_monotonic():
+    ids = [new_investigation_id() for _ in range(1000)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+def test_keyset_pagination_by_target(tmp_path):
+    async def scenario():
+        store = InvestigationStore(store_url(tmp_path), read_connections=1)
+        await store.connect()
+        try:
+            ids = [new_investigation_id() for _ in range(5)]
+            for investigation_id in ids:
+                await store.create(investigation_id, ["shared.example"], "full", "deep")
+            await store.create(new_investigation_id(), ["other.example"], "full", "deep")
+
+            pages, cursor = [], None
+            while True:
+                page = await store.list_investigations(limit=2, cursor=cursor, target="shared.example")
+                pages.append([item['investigation_id'] for item in page['items']])
+                cursor = page['next_cursor']
+                if cursor is None:
+                    return ids, pages
+        finally:
+            await store.close()
+
+    ids, pages = asyncio.run(scenario())
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [investigation_id for page in pages for investigation_id in page] == sorted(ids, reverse=True)
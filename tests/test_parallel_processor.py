@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+اختبارات المعالج المتوازي
+Parallel Processor Tests
+"""
+
+import asyncio
+import threading
+
+from core.quantum_parallel_processor import QuantumParallelProcessor
+
+def test_plain_functions_share_one_thread_pool():
+    processor = QuantumParallelProcessor(max_workers=4, backend='thread')
+
+    async def scenario():
+        pools = []
+        for _ in range(3):
+            results = [result async for _, result in processor.execute_stream(
+                [threading.current_thread for _ in range(8)]
+            )]
+            pools.append(processor.thread_pool)
+            assert all(thread.name.startswith("parallel") for thread in results)
+        return pools
+
+    pools = asyncio.run(scenario())
+    assert pools[0] is not None and all(pool is pools[0] for pool in pools)
+    processor.shutdown()
+    assert processor.thread_pool is None
+
+def test_parallel_execution_scores_in_batches():
+    processor = QuantumParallelProcessor(max_workers=4, backend='thread', score_batch_size=3)
+
+    def task(i):
+        return lambda: {'emails': [f"user{i}@example.com"], 'confidence': 1.0} if i % 2 else {'records': [i]}
+
+    async def failing():
+        raise RuntimeError("boom")
+
+    summary = asyncio.run(processor.parallel_execution([task(i) for i in range(10)] + [failing]))['summary']
+    processor.shutdown()
+    assert summary['total_results'] == 10
+    assert summary['failed_tasks'] == 1
+    assert summary['with_contacts'] == 5
+    assert summary['critical_findings'] == 5
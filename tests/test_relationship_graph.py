@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+اختبارات رسم العلاقات (CSR وBrandes)
+Relationship Graph (CSR & Brandes) Tests
+"""
+
+import numpy as np
+import pytest
+
+from core.relationship_graph import CSRGraph, RelationshipGraph
+
+def csr_from_edges(node_count, edges, weights=None):
+    sources, targets = zip(*edges)
+    return CSRGraph(
+        node_count,
+        np.array(sources, dtype=np.int32),
+        np.array(targets, dtype=np.int32),
+        np.array(weights or [1.0] * len(edges), dtype=np.float32)
+    )
+
+def two_cliques():
+    """مجموعتان كاملتان من 5 عقد يصلهما جسر 4-5"""
+    edges = [(a, b) for group in (range(5), range(5, 10)) for a in group for b in group if a < b]
+    return edges + [(4, 5)]
+
+def test_csr_merges_duplicates_and_drops_self_loops():
+    csr = csr_from_edges(3, [(0, 1), (1, 0), (1, 1), (1, 2)], [1.0, 2.0, 5.0, 1.0])
+    assert csr.edge_count == 2
+    assert csr.degree.tolist() == [1, 2, 1]
+    assert sorted(csr.indices[csr.indptr[1]:csr.indptr[2]].tolist()) == [0, 2]
+    assert csr.weights[csr.indptr[0]:csr.indptr[1]].tolist() == [3.0]
+    assert csr.density() == pytest.approx(2 / 3)
+
+def test_exact_betweenness_matches_networkx():
+    nx = pytest.importorskip("networkx")
+    edges = two_cliques() + [(9, 10), (10, 11), (11, 9), (0, 12)]
+    csr = csr_from_edges(13, edges)
+    # عينة بحجم كل العقد = Brandes الدقيق
+    ours = csr.approximate_betweenness(samples=13)
+    expected = nx.betweenness_centrality(nx.Graph(edges))
+    assert ours == pytest.approx([expected[node] for node in range(13)])
+
+def test_label_propagation_separates_bridged_cliques():
+    labels = csr_from_edges(10, two_cliques()).label_propagation()
+    assert len(set(labels[:5].tolist())) == 1
+    assert len(set(labels[5:].tolist())) == 1
+    assert labels[0] != labels[9]
+
+def test_csr_and_networkx_backends_agree():
+    pytest.importorskip("networkx")
+    reports = []
+    for networkx_max_edges in (10 ** 6, 0):
+        graph = RelationshipGraph(networkx_max_edges=networkx_max_edges, betweenness_samples=100)
+        for a, b in two_cliques():
+            graph.add_edge(f"n{a}", f"n{b}")
+        reports.append(graph.analyze(top=2))
+    networkx_report, csr_report = reports
+    assert (networkx_report['backend'], csr_report['backend']) == ('networkx', 'csr')
+    assert csr_report['edges'] == networkx_report['edges'] == 21
+    assert csr_report['network_density'] == pytest.approx(networkx_report['network_density'])
+    assert {item['node'] for item in csr_report['key_connectors']} == {"n4", "n5"}
+    assert {item['node'] for item in networkx_report['key_connectors']} == {"n4", "n5"}
+    assert csr_report['community_count'] == networkx_report['community_count'] == 2
+
+def test_empty_graph():
+    assert RelationshipGraph().analyze()['nodes'] == 0
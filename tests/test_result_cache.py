@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+اختبارات الذاكرة المؤقتة ذات المستويين
+Two-Tier Result Cache Tests
+"""
+
+import asyncio
+import threading
+
+from core.result_cache import TwoTierCache
+
+def test_memory_and_disk_tiers_return_equal_copies(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = TwoTierCache(path=path, namespace="t")
+    value = {'scores': (0.5, 1), 'nested': {'a': [1, 2]}}
+    cache.set("k", value)
+    from_memory = cache.get("k")
+    from_memory['nested']['a'].append(3)
+    cache.close()
+
+    reopened = TwoTierCache(path=path, namespace="t")
+    from_disk = reopened.get("k")
+    assert from_disk == cache.get("k") == {'scores': [0.5, 1], 'nested': {'a': [1, 2]}}
+    assert reopened.get_stats()['disk_hits'] == 1
+    reopened.close()
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = TwoTierCache(path=str(tmp_path / "cache.db"), namespace="t", ttl=0)
+    cache.set("k", 1)
+    assert cache.get("k") is None
+    assert cache.get_many(["k"]) == {}
+    cache.close()
+
+def test_async_api_round_trip(tmp_path):
+    async def scenario():
+        cache = TwoTierCache(path=str(tmp_path / "cache.db"), namespace="t", max_memory_entries=1)
+        await cache.aset("a", {'x': 1})
+        await cache.aset("b", {'x': 2})
+        # "a" خرج من الذاكرة ويُقرأ من القرص في خيط المخزن
+        found = await cache.aget_many(["a", "b", "c"])
+        single = await cache.aget("a")
+        cache.close()
+        return found, single
+
+    found, single = asyncio.run(scenario())
+    assert found == {'a': {'x': 1}, 'b': {'x': 2}}
+    assert single == {'x': 1}
+
+def test_memory_reads_do_not_wait_for_disk(tmp_path):
+    cache = TwoTierCache(path=str(tmp_path / "cache.db"), namespace="t")
+    cache.set("k", 1)
+    # عملية قرص طويلة تحمل قفل الاتصال؛ قراءة الذاكرة لا تنتظرها
+    with cache.disk_lock:
+        result = []
+        reader = threading.Thread(target=lambda: result.append(cache.get("k")))
+        reader.start()
+        reader.join(timeout=1)
+        assert result == [1]
+    cache.close()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+اختبارات المجدول ومسار الإلغاء في مرحلة الاستطلاع
+Scheduler & Reconnaissance Cancellation Tests
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+from core.scheduler import TaskScheduler
+
+def test_as_completed_bounds_tasks_and_yields_failures():
+    scheduler = TaskScheduler(max_concurrency=2, timeout=5)
+    running = 0
+    peak = 0
+
+    async def work(item):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        try:
+            await asyncio.sleep(0.001)
+            if item == 3:
+                raise ValueError("bad item")
+            if item == 4:
+                asyncio.current_task().cancel()
+                await asyncio.sleep(1)
+            return item * 10
+        finally:
+            running -= 1
+
+    async def scenario():
+        return {item: result async for item, result in scheduler.as_completed(range(6), work)}
+
+    results = asyncio.run(scenario())
+    assert peak == 2
+    assert isinstance(results.pop(3), ValueError)
+    assert isinstance(results.pop(4), asyncio.CancelledError)
+    assert results == {0: 0, 1: 10, 2: 20, 5: 50}
+
+class FakeCheckpoints:
+    def __init__(self):
+        self.saved = {}
+
+    async def asave(self, phase, target, result, techniques):
+        self.saved[target] = result
+
+def recon_engine(technique):
+    advanced_engine = pytest.importorskip("core.advanced_engine")
+    engine = advanced_engine.QuantumOSINTEngine.__new__(advanced_engine.QuantumOSINTEngine)
+    engine.logger = logging.getLogger(__name__)
+    engine.recon_techniques = ['probe']
+    engine.probe = technique
+    engine.scheduler = TaskScheduler(max_concurrency=4, timeout=5)
+    engine.checkpoints = FakeCheckpoints()
+    engine.standalone_correlator = None
+    return engine
+
+def test_cancelled_technique_is_an_error_marker():
+    async def probe(target):
+        if target == "b.example":
+            raise asyncio.CancelledError()
+        return {'A': ["10.0.0.1"]}
+
+    engine = recon_engine(probe)
+    recon = asyncio.run(engine.phase_advanced_reconnaissance(["a.example", "b.example"]))
+    assert recon["a.example"] == {'probe': {'A': ["10.0.0.1"]}}
+    assert recon["b.example"] == {'probe': {'error': "CancelledError"}}
+    assert engine.checkpoints.saved == recon
+
+def test_cancelled_target_task_is_an_error_marker():
+    engine = recon_engine(None)
+
+    async def cancelled_run_all(funcs, target):
+        # مهمة الهدف نفسها تُلغى (مثل إلغاء خارجي أثناء الانتظار)
+        asyncio.current_task().cancel()
+        await asyncio.sleep(1)
+
+    engine.scheduler.run_all = cancelled_run_all
+    recon = asyncio.run(engine.phase_advanced_reconnaissance(["a.example"]))
+    assert recon["a.example"] == {'error': "CancelledError"}
+    assert engine.checkpoints.saved == recon
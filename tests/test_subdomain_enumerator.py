@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+اختبارات تعداد النطاقات الفرعية
+Subdomain Enumeration Tests
+"""
+
+import asyncio
+
+import pytest
+
+from core.subdomain_enumerator import (
+    AdaptiveLimiter, SubdomainEnumerator, WildcardDetectionError, candidate_names
+)
+
+WILDCARD_ADDRESS = "203.0.113.7"
+
+class FakeResolver:
+    """محلل بإجابات ثابتة: الأسماء الموجودة، سجل شامل اختياري، ومهل لأسماء عشوائية"""
+    def __init__(self, existing=(), wildcard=False, probe_timeouts=0, fail_on=None):
+        self.existing = set(existing)
+        self.wildcard = wildcard
+        self.probe_timeouts = probe_timeouts
+        self.fail_on = fail_on
+        self.active = 0
+        self.peak_tasks = 0
+        self.stats = {}
+
+    async def query_a(self, name):
+        label = name.split('.')[0]
+        if len(label) == 20 and self.probe_timeouts:
+            # أسماء اكتشاف السجل الشامل (secrets.token_hex(10))
+            self.probe_timeouts -= 1
+            raise asyncio.TimeoutError()
+        if label == self.fail_on:
+            raise RuntimeError("boom")
+        self.active += 1
+        self.peak_tasks = max(self.peak_tasks, len(asyncio.all_tasks()))
+        try:
+            await asyncio.sleep(0.001)
+        finally:
+            self.active -= 1
+        if name in self.existing:
+            return ["10.0.0.1"]
+        return [WILDCARD_ADDRESS] if self.wildcard else []
+
+def enumerator(resolver, **kwargs):
+    return SubdomainEnumerator(resolver=resolver, initial_concurrency=8, max_concurrency=64,
+                               wildcard_probes=3, **kwargs)
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+def test_candidate_names_skip_invalid_labels():
+    assert list(candidate_names(["www", "Dev.Api", "bad label", "-x", ""], "example.com")) == [
+        "www.example.com", "dev.api.example.com"
+    ]
+
+def test_enumerate_filters_wildcard_answers():
+    resolver = FakeResolver(existing={"www.example.com"}, wildcard=True)
+    found = run(enumerator(resolver).enumerate_zone("example.com", ["www", "mail", "api"]))
+    assert found == {"www.example.com": ["10.0.0.1"]}
+
+def test_incomplete_wildcard_detection_is_retried():
+    resolver = FakeResolver(existing={"www.example.com"}, wildcard=True, probe_timeouts=1)
+    subdomains = enumerator(resolver)
+    found = run(subdomains.enumerate_zone("example.com", ["www", "mail"]))
+    assert found == {"www.example.com": ["10.0.0.1"]}
+    assert subdomains.wildcards["example.com"] == frozenset({WILDCARD_ADDRESS})
+
+def test_failed_wildcard_detection_raises_instead_of_enumerating_unfiltered():
+    resolver = FakeResolver(wildcard=True, probe_timeouts=100)
+    subdomains = enumerator(resolver)
+    with pytest.raises(WildcardDetectionError):
+        run(subdomains.enumerate_zone("example.com", ["www", "mail"]))
+    # النتيجة غير المكتملة لا تُحفظ
+    assert "example.com" not in subdomains.wildcards
+
+def test_worker_failure_cancels_siblings():
+    resolver = FakeResolver(fail_on="www")
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await enumerator(resolver).enumerate_zone("example.com", ["a", "b", "www"] + [f"w{i}" for i in range(200)])
+        await asyncio.sleep(0.01)
+        return resolver.active
+
+    assert run(scenario()) == 0
+
+def test_workers_bounded_by_limiter_for_generator_wordlists():
+    resolver = FakeResolver()
+    run(enumerator(resolver).enumerate_zone("example.com", (f"w{i}" for i in range(500))))
+    # 8 عمال (الحد الابتدائي) ومهمة المشغّل والمهمة الرئيسية، لا max_concurrency
+    assert resolver.peak_tasks <= 8 + 2
+
+def test_limiter_halves_once_per_window():
+    limiter = AdaptiveLimiter(initial=16, minimum=2, maximum=64)
+    limits = []
+    for _ in range(24):
+        limiter.in_use += 1
+        limiter.release(False)
+        limits.append(limiter.limit)
+    # نصف واحد بعد نافذة كاملة (16 فشلاً)، ثم نصف آخر بعد نافذة الحد الجديد (8)
+    assert limits[14] == 16 and limits[15] == 8 and limits[22] == 8 and limits[23] == 4
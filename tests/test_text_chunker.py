@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+اختبارات مقسم النصوص الطويلة
+Sliding Window Text Chunker Tests
+"""
+
+import re
+
+import pytest
+
+from ai.text_chunker import SlidingWindowChunker, TextChunk, merge_entities, merge_sentiment
+
+def words_text(count: int) -> str:
+    return " ".join(f"w{i}" for i in range(count))
+
+class CharTokenizer:
+    """مقسم رموز بحرف لكل رمز (غير المسافات) بنفس واجهة مقسمات النماذج"""
+    def __call__(self, text, **kwargs):
+        return {'offset_mapping': [(i, i + 1) for i, char in enumerate(text) if not char.isspace()]}
+
+def test_short_text_is_single_window():
+    chunker = SlidingWindowChunker(max_tokens=12, stride=3)
+    text = words_text(10)
+    assert chunker.chunk(text) == [TextChunk(text, 0, len(text))]
+
+def test_window_offsets_match_original_text():
+    chunker = SlidingWindowChunker(max_tokens=12, stride=3)
+    text = words_text(47)
+    chunks = chunker.chunk(text)
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert text[chunk.start:chunk.end] == chunk.text
+        assert len(chunk.text.split()) <= chunker.window
+    assert chunks[0].start == 0
+    assert chunks[-1].end == len(text)
+
+def test_windows_overlap_by_stride_tokens():
+    chunker = SlidingWindowChunker(max_tokens=12, stride=3)
+    text = words_text(47)
+    chunks = chunker.chunk(text)
+
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current.start < previous.end
+        assert text[current.start:previous.end].split() == previous.text.split()[-chunker.stride:]
+
+def test_every_token_is_covered():
+    chunker = SlidingWindowChunker(max_tokens=7, stride=2)
+    text = words_text(100)
+    covered = set()
+    for chunk in chunker.chunk(text):
+        covered.update(chunk.text.split())
+    assert covered == set(text.split())
+
+def test_stride_must_be_smaller_than_window():
+    with pytest.raises(ValueError):
+        SlidingWindowChunker(max_tokens=10, stride=8)
+
+def test_fit_truncates_windows_that_retokenize_longer():
+    chunker = SlidingWindowChunker(max_tokens=6, stride=2)
+    tokenizer = CharTokenizer()
+    chunk = chunker.fit(TextChunk("abc defg", 10, 18), tokenizer)
+
+    assert chunk == TextChunk("abc d", 10, 15)
+    assert len(chunker.token_offsets(chunk.text, tokenizer)) == chunker.window
+
+def test_tokenizer_windows_never_exceed_window():
+    chunker = SlidingWindowChunker(lambda: CharTokenizer(), max_tokens=12, stride=4)
+    text = words_text(60)
+    for chunk in chunker.chunk(text):
+        assert text[chunk.start:chunk.end] == chunk.text
+        assert len(chunker.token_offsets(chunk.text, CharTokenizer())) <= chunker.window
+
+def find_entities(chunk: TextChunk, word: str, score: float):
+    return [
+        {'entity_group': 'PER', 'word': word, 'start': match.start(), 'end': match.end(), 'score': score}
+        for match in re.finditer(re.escape(word), chunk.text)
+    ]
+
+def test_merged_entities_map_back_to_original_text():
+    chunker = SlidingWindowChunker(max_tokens=12, stride=3)
+    # النوافذ تبدأ كل 7 رموز بطول 10: الرمز 43 يقع في تداخل النافذتين 35 و42
+    text = words_text(43) + " Alice " + words_text(40)
+    chunks = chunker.chunk(text)
+    chunk_entities = [find_entities(chunk, "Alice", 0.9) for chunk in chunks]
+
+    assert sum(len(found) for found in chunk_entities) == 2
+    merged = merge_entities(chunks, chunk_entities)
+
+    assert len(merged) == 1
+    assert text[merged[0]['start']:merged[0]['end']] == "Alice"
+
+def test_overlapping_duplicates_keep_highest_score():
+    chunks = [TextChunk("a Bob c", 0, 7), TextChunk("Bob c d", 2, 9)]
+    chunk_entities = [
+        [{'entity_group': 'PER', 'word': 'Bob', 'start': 2, 'end': 5, 'score': 0.6}],
+        [{'entity_group': 'PER', 'word': 'Bob', 'start': 0, 'end': 3, 'score': 0.95}]
+    ]
+    merged = merge_entities(chunks, chunk_entities)
+
+    assert len(merged) == 1
+    assert (merged[0]['start'], merged[0]['end'], merged[0]['score']) == (2, 5, 0.95)
+
+def test_merge_entities_does_not_mutate_inputs():
+    chunks = [TextChunk("x Bob", 10, 15)]
+    entity = {'entity_group': 'PER', 'word': 'Bob', 'start': 2, 'end': 5, 'score': 0.9}
+    merge_entities(chunks, [[entity]])
+    assert entity['start'] == 2
+
+def test_single_window_sentiment_keeps_model_score():
+    result = merge_sentiment([TextChunk("text", 0, 4)], [{'label': 'POSITIVE', 'score': 0.73}])
+    assert result == {'label': 'POSITIVE', 'score': 0.73, 'chunks': 1}
+
+def test_sentiment_vote_is_weighted_by_window_length():
+    chunks = [TextChunk("a" * 100, 0, 100), TextChunk("b" * 10, 100, 110)]
+    results = [{'label': 'NEGATIVE', 'score': 0.6}, {'label': 'POSITIVE', 'score': 0.99}]
+    merged = merge_sentiment(chunks, results)
+
+    assert merged['label'] == 'NEGATIVE'
+    assert merged['score'] == pytest.approx(0.6)
+    assert merged['chunks'] == 2
+
+def test_empty_sentiment():
+    assert merge_sentiment([], []) == {}
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+اختبارات محلل وعميل WHOIS
+WHOIS Parser & Client Tests
+"""
+
+import asyncio
+
+from benchmarks.stub_whois import StubWhoisServer
+from core.async_whois import AsyncWhoisClient, parse_whois
+from core.result_cache import TwoTierCache
+
+RECORD = (
+    "% comment line\r\n"
+    "Domain Name: EXAMPLE.COM\r\n"
+    "Registrar WHOIS Server: whois.registrar.example\r\n"
+    "Creation Date: 1995-08-14T04:00:00Z\r\n"
+    "Name Server: A.IANA-SERVERS.NET.\r\n"
+    "Name Server: a.iana-servers.net\r\n"
+    "Domain Status: clientTransferProhibited https://icann.org/epp#clientTransferProhibited\r\n"
+    "Registrant Email: owner@example.com\r\n"
+    "Admin Email: privacy@proxy.example\r\n"
+    "Registrar Abuse Contact Email: abuse@registrar.example\r\n"
+    ">>> Last update of whois database: 2024-01-01T00:00:00Z <<<\r\n"
+    "Registrant Email: after-footer@example.com\r\n"
+)
+
+def client(server: StubWhoisServer) -> AsyncWhoisClient:
+    return AsyncWhoisClient(root_server=server.host, port=server.port, timeout=5,
+                            cache=TwoTierCache(namespace="whois"),
+                            referral_cache=TwoTierCache(namespace="whois_referrals"))
+
+def test_parse_whois_maps_fields():
+    record = parse_whois(RECORD)
+    assert record['domain_name'] == "EXAMPLE.COM"
+    assert record['whois_server'] == "whois.registrar.example"
+    assert record['name_servers'] == ["a.iana-servers.net"]
+    assert record['status'] == ["clientTransferProhibited"]
+    assert record['registered'] is True
+
+def test_parse_whois_keeps_contact_emails_apart_from_registrant():
+    record = parse_whois(RECORD)
+    assert record['emails'] == ["owner@example.com"]
+    assert record['contact_emails'] == ["privacy@proxy.example"]
+    assert record['abuse_email'] == "abuse@registrar.example"
+
+def test_parse_whois_not_found():
+    assert parse_whois('No match for "NX.EXAMPLE".\r\n') == {'registered': False}
+
+def test_lookup_follows_referral_once_and_caches_records():
+    with StubWhoisServer() as server:
+        whois = client(server)
+
+        async def scenario():
+            first = await whois.lookup_many(["a.example", "b.example", "nx.example"])
+            again = await whois.lookup("A.Example.")
+            return first, again
+
+        first, again = asyncio.run(scenario())
+
+    assert first["a.example"]['registered'] is True
+    assert first["nx.example"] == {'registered': False}
+    assert again == first["a.example"]
+    assert server.referrals == 1
+    assert server.queries == 3
+
+def test_waiters_reissue_lookup_when_owner_is_cancelled():
+    whois = AsyncWhoisClient(cache=TwoTierCache(namespace="whois"),
+                             referral_cache=TwoTierCache(namespace="whois_referrals"))
+    calls = 0
+
+    async def factory():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05 if calls == 1 else 0)
+        return calls
+
+    async def scenario():
+        owner = asyncio.ensure_future(whois.coalesced("a.example", factory))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(whois.coalesced("a.example", factory))
+        await asyncio.sleep(0)
+        owner.cancel()
+        return await waiter
+
+    assert asyncio.run(scenario()) == 2
+    assert whois._in_flight == {}
@@ -4,13 +4,21 @@
 Web Backend Application
 """
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 import jwt
+import json
 from datetime import datetime, timedelta
 import logging
+from config.settings import Settings
+from core.event_bus import EventBus
+from core.metrics import metrics
+from storage.investigation_store import InvestigationStore, new_investigation_id
+from web.backend.job_engine import InvestigationJobEngine
+from web.backend.streaming import encode_stream, negotiate_encoding, ndjson_lines, parse_fields
 
 # إنشاء تطبيق FastAPI
 app = FastAPI(
@@ -28,11 +36,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# محرك التحقيقات الخلفي وطابوره الدائم
+event_bus = EventBus()
+job_engine = InvestigationJobEngine(InvestigationStore(), event_bus=event_bus)
+
+@app.on_event("startup")
+async def start_job_engine():
+    """تشغيل عمال التحقيقات"""
+    await job_engine.start()
+
+@app.on_event("shutdown")
+async def stop_job_engine():
+    """إيقاف عمال التحقيقات"""
+    await job_engine.stop()
+
 # نماذج البيانات
 class InvestigationRequest(BaseModel):
     targets: List[str]
     scan_type: str = "comprehensive"
     depth: str = "deep"
+    profile: bool = False
 
 class InvestigationResponse(BaseModel):
     investigation_id: str
@@ -50,80 +73,169 @@ async def root():
         "status": "يعمل"
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """مقاييس الأداء بصيغة Prometheus النصية"""
+    return PlainTextResponse(
+        metrics.render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
 @app.post("/investigations", response_model=InvestigationResponse)
 async def create_investigation(request: InvestigationRequest):
     """إنشاء تحقيق جديد"""
     try:
-        investigation_id = f"inv_{int(datetime.now().timestamp())}"
-        
-        response = InvestigationResponse(
-            investigation_id=investigation_id,
-            status="pending",
-            targets=request.targets,
-            created_at=datetime.now().isoformat()
-        )
+        investigation_id = new_investigation_id()
         
-        # بدء التحقيق في الخلفية
-        await start_background_investigation(investigation_id, request)
+        # إضافة التحقيق إلى الطابور والعودة فوراً؛ العمال ينفذونه في الخلفية
+        record = await start_background_investigation(investigation_id, request)
         
-        return response
+        return InvestigationResponse(**record)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/investigations")
+async def list_investigations(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    target: Optional[str] = None,
+    created_after: Optional[str] = None
+):
+    """قائمة التحقيقات الأحدث أولاً (ترقيم بالمؤشر)"""
+    return await job_engine.store.list_investigations(
+        limit=limit,
+        cursor=cursor,
+        status=status,
+        target=target,
+        created_after=created_after
+    )
+
 @app.get("/investigations/{investigation_id}")
 async def get_investigation_status(investigation_id: str):
     """الحصول على حالة التحقيق"""
-    try:
-        # محاكاة بيانات التحقيق
-        return {
-            "investigation_id": investigation_id,
-            "status": "completed",
-            "progress": 100,
-            "results_available": True,
-            "started_at": datetime.now().isoformat(),
-            "completed_at": datetime.now().isoformat()
-        }
-    except Exception as e:
+    investigation = await job_engine.store.get(investigation_id)
+    if investigation is None:
         raise HTTPException(status_code=404, detail="التحقيق غير موجود")
+    return investigation
 
 @app.get("/investigations/{investigation_id}/results")
-async def get_investigation_results(investigation_id: str):
-    """الحصول على نتائج التحقيق"""
+async def get_investigation_results(
+    request: Request,
+    investigation_id: str,
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=10000)
+):
+    """بث نتائج التحقيق بصيغة NDJSON (سطر لكل هدف ومرحلة)
+
+    limit عدد الأهداف في الصفحة وcursor آخر هدف في الصفحة السابقة
+    (يُعاد في ترويسة X-Next-Cursor)، وfields لاختيار حقول محددة.
+    """
+    investigation = await job_engine.store.get(investigation_id)
+    if investigation is None:
+        raise HTTPException(status_code=404, detail="التحقيق غير موجود")
+    
+    headers = {"X-Investigation-Status": investigation['status']}
+    until = None
+    if limit is not None:
+        page_targets = await job_engine.store.result_targets(investigation_id, limit + 1, cursor)
+        if len(page_targets) > limit:
+            headers["X-Next-Cursor"] = page_targets[limit - 1]
+        if not page_targets:
+            return Response(status_code=204, headers=headers)
+        until = page_targets[:limit][-1]
+    
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    headers["Vary"] = "Accept-Encoding"
+    
+    records = job_engine.store.iter_target_results(investigation_id, after=cursor, until=until)
+    return StreamingResponse(
+        encode_stream(ndjson_lines(records, parse_fields(fields)), encoding),
+        media_type="application/x-ndjson",
+        headers=headers
+    )
+
+async def investigation_events(investigation_id: str) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """أحداث التحقيق: لقطة الحالة الحالية ثم الأحداث الحية (None = نبضة إبقاء)"""
+    # الاشتراك قبل قراءة الحالة حتى لا يضيع أي حدث بينهما
+    subscription = event_bus.subscribe(investigation_id)
     try:
-        # محاكاة النتائج
-        return {
-            "investigation_id": investigation_id,
-            "summary": {
-                "total_targets": 3,
-                "data_sources": 5,
-                "relationships_found": 12,
-                "hidden_contacts_found": 8
-            },
-            "targets": [
-                {
-                    "name": "target1",
-                    "platforms": ["facebook", "instagram"],
-                    "data_points": 45,
-                    "hidden_contacts": {
-                        "phones": 3,
-                        "emails": 2
-                    }
-                }
-            ],
-            "analysis": {
-                "network_map": "available",
-                "behavioral_patterns": "analyzed",
-                "threat_assessment": "low"
-            }
-        }
-    except Exception as e:
-        raise HTTPException(status_code=404, detail="النتائج غير متوفرة")
+        investigation = await job_engine.store.get(investigation_id)
+        if investigation is None:
+            raise HTTPException(status_code=404, detail="التحقيق غير موجود")
+        
+        yield {'seq': 0, 'event': 'snapshot', 'topic': investigation_id, 'data': investigation}
+        if investigation['status'] in ('completed', 'failed'):
+            return
+        
+        while not subscription.finished:
+            yield await subscription.get(timeout=Settings.EVENT_HEARTBEAT)
+        
+        if subscription.dropped:
+            # المستهلك البطيء يعيد الاتصال ويبدأ من لقطة جديدة
+            yield {'seq': -1, 'event': 'lagged', 'topic': investigation_id, 'data': {}}
+    finally:
+        subscription.close()
+
+@app.get("/investigations/{investigation_id}/events")
+async def stream_investigation_events(investigation_id: str):
+    """بث أحداث التحقيق (Server-Sent Events)"""
+    events = investigation_events(investigation_id)
+    # التحقق من وجود التحقيق قبل بدء الاستجابة
+    first = await events.__anext__()
+    
+    async def sse():
+        event = first
+        try:
+            while True:
+                if event is None:
+                    yield ": keepalive\n\n"
+                else:
+                    data = json.dumps(event['data'], ensure_ascii=False, default=str)
+                    yield f"id: {event['seq']}\nevent: {event['event']}\ndata: {data}\n\n"
+                try:
+                    event = await events.__anext__()
+                except StopAsyncIteration:
+                    break
+        finally:
+            await events.aclose()
+    
+    return StreamingResponse(
+        sse(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.websocket("/investigations/{investigation_id}/ws")
+async def investigation_websocket(websocket: WebSocket, investigation_id: str):
+    """بث أحداث التحقيق عبر WebSocket"""
+    await websocket.accept()
+    try:
+        async for event in investigation_events(investigation_id):
+            await websocket.send_text(json.dumps(
+                event if event is not None else {'event': 'heartbeat'},
+                ensure_ascii=False,
+                default=str
+            ))
+        await websocket.close()
+    except HTTPException as e:
+        await websocket.close(code=4404, reason=str(e.detail))
+    except WebSocketDisconnect:
+        pass
 
-async def start_background_investigation(investigation_id: str, request: InvestigationRequest):
+async def start_background_investigation(investigation_id: str, request: InvestigationRequest) -> Dict[str, Any]:
     """بدء التحقيق في الخلفية"""
-    # سيتم تنفيذ التحقيق في الخلفية
-    pass
+    return await job_engine.submit(
+        investigation_id,
+        request.targets,
+        request.scan_type,
+        request.depth,
+        request.profile
+    )
 
 if __name__ == "__main__":
     import uvicorn
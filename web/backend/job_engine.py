@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+محرك التحقيقات الخلفي
+Background Investigation Job Engine
+"""
+
+import asyncio
+import logging
+import os
+import random
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from config.settings import Settings
+from core.event_bus import EventBus
+from core.profiler import ScanProfiler
+from storage.investigation_store import InvestigationStore
+
+class InvestigationJobEngine:
+    """مجموعة عمال تسحب التحقيقات من الطابور الدائم وتنفذ المسح"""
+    def __init__(self,
+                 store: InvestigationStore,
+                 event_bus: Optional[EventBus] = None,
+                 engine_factory: Optional[Callable[[], Any]] = None,
+                 workers: Optional[int] = None,
+                 poll_interval: float = 1.0,
+                 results_batch_size: int = 500):
+        self.logger = logging.getLogger(__name__)
+        self.store = store
+        self.event_bus = event_bus or EventBus()
+        self.engine_factory = engine_factory
+        self.worker_count = workers or Settings.JOB_WORKERS
+        self.poll_interval = poll_interval
+        self.results_batch_size = results_batch_size
+        self.engine = None
+        self.workers: List[asyncio.Task] = []
+        self.dispatcher: Optional[asyncio.Task] = None
+        self.wakeup: Optional[asyncio.Event] = None
+        # الموزع وحده يسحب من المخزن ويسلم المهام للعمال الخاملين عبر هذا الطابور
+        self.jobs: Optional[asyncio.Queue] = None
+        self.idle: Optional[asyncio.Semaphore] = None
+
+    async def start(self):
+        """فتح المخزن وتشغيل الموزع والعمال"""
+        await self.store.connect()
+        self.wakeup = asyncio.Event()
+        self.jobs = asyncio.Queue()
+        self.idle = asyncio.Semaphore(self.worker_count)
+        self.workers = [
+            asyncio.ensure_future(self.worker_loop(index))
+            for index in range(self.worker_count)
+        ]
+        self.dispatcher = asyncio.ensure_future(self.dispatch_loop())
+        self.logger.info(f"⚙️ تشغيل {self.worker_count} عامل للتحقيقات")
+
+    async def stop(self):
+        """إيقاف العمال (التحقيقات الجارية تعود للطابور عند التشغيل التالي)"""
+        tasks = self.workers + ([self.dispatcher] if self.dispatcher is not None else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.workers = []
+        self.dispatcher = None
+        await self.store.close()
+
+    def get_engine(self):
+        """محرك المسح المشترك بين العمال (يُنشأ عند أول مهمة)"""
+        if self.engine is None:
+            if self.engine_factory is None:
+                from core.advanced_engine import QuantumOSINTEngine
+                self.engine_factory = QuantumOSINTEngine
+            self.engine = self.engine_factory()
+        return self.engine
+
+    async def submit(self, investigation_id: str, targets: List[str],
+                     scan_type: str, depth: str, profile: bool = False) -> Dict[str, Any]:
+        """إضافة تحقيق إلى الطابور وإيقاظ العمال"""
+        record = await self.store.create(investigation_id, targets, scan_type, depth, profile)
+        self.wakeup.set()
+        return record
+
+    async def dispatch_loop(self):
+        """سحب المهام من المخزن فقط عند وجود عامل خامل (مستعلم واحد مهما كان عدد العمال)"""
+        while True:
+            await self.idle.acquire()
+            job = None
+            while job is None:
+                try:
+                    job = await self.store.claim_next()
+                except Exception as e:
+                    self.logger.error(f"❌ فشل سحب مهمة من الطابور: {e}")
+
+                if job is None:
+                    try:
+                        await asyncio.wait_for(self.wakeup.wait(), self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    self.wakeup.clear()
+            self.jobs.put_nowait(job)
+
+    async def worker_loop(self, index: int):
+        """حلقة العامل: انتظار مهمة من الموزع، تنفيذها، ثم التالية"""
+        while True:
+            job = await self.jobs.get()
+            try:
+                await self.run_job(job)
+            except Exception as e:
+                # العامل يبقى حياً حتى لو فشل تسجيل حالة المهمة
+                self.logger.error(f"❌ فشل تنفيذ المهمة {job.get('investigation_id')}: {e}")
+            finally:
+                self.idle.release()
+
+    async def run_job(self, job: Dict[str, Any]):
+        """تنفيذ تحقيق واحد وحفظ حالته ونتائجه"""
+        investigation_id = job['investigation_id']
+        self.logger.info(f"🚀 بدء التحقيق {investigation_id}")
+
+        publish = self.event_bus.sink(investigation_id)
+        publish('investigation_started', {'targets': job['targets']})
+
+        # نتائج الأهداف تُحفظ على دفعات فور وصولها بدلاً من انتظار نهاية المسح
+        pending_records: List[Tuple[str, str, Any]] = []
+        saved: Set[Tuple[str, str]] = set()
+        writes: Set[asyncio.Future] = set()
+        # دفعة فشلت كتابتها أثناء المسح تُفشل التحقيق بدلاً من اكتماله بنتائج ناقصة
+        write_errors: List[BaseException] = []
+
+        def write_done(write: asyncio.Future):
+            writes.discard(write)
+            if not write.cancelled() and write.exception() is not None:
+                write_errors.append(write.exception())
+
+        async def flush():
+            records = pending_records[:]
+            pending_records.clear()
+            await self.store.save_target_results(investigation_id, records)
+
+        def on_event(event: str, data: Dict[str, Any]):
+            publish(event, data)
+            if event == 'target_completed':
+                pending_records.append((data['target'], data['phase'], data['result']))
+                saved.add((data['target'], data['phase']))
+                if len(pending_records) >= self.results_batch_size:
+                    write = asyncio.ensure_future(flush())
+                    writes.add(write)
+                    write.add_done_callback(write_done)
+
+        async def on_progress(phase: str, completed: int, total: int):
+            progress = (completed / total) * 100 if total else 100.0
+            await self.store.update_progress(investigation_id, progress, phase)
+            publish('progress', {'progress': progress, 'phase': phase})
+
+        # التحليل عند الطلب (مع tracemalloc) أو لعينة عشوائية من التحقيقات (إحصاء خفيف)
+        profiler = None
+        if job.get('profile') or random.random() < Settings.PROFILE_SAMPLE_RATE:
+            profiler = ScanProfiler(
+                os.path.join(Settings.PROFILE_DIR, investigation_id),
+                trace_allocations=bool(job.get('profile'))
+            )
+
+        try:
+            if profiler is not None:
+                with profiler:
+                    results = await self.get_engine().comprehensive_scan(
+                        job['targets'],
+                        progress_callback=on_progress,
+                        event_callback=profiler.wrap_events(on_event)
+                    )
+            else:
+                results = await self.get_engine().comprehensive_scan(
+                    job['targets'],
+                    progress_callback=on_progress,
+                    event_callback=on_event
+                )
+            if writes:
+                await asyncio.gather(*writes, return_exceptions=True)
+            if write_errors:
+                raise RuntimeError(f"فشل حفظ نتائج الأهداف: {write_errors[0]}")
+            if results.get('fatal_error'):
+                raise RuntimeError(results['fatal_error'])
+            if results.get('errors') and not results.get('phases'):
+                raise RuntimeError(f"فشلت جميع المراحل: {results['errors']}")
+
+            # بقية نتائج المراحل التي لا تبث نتائج أهدافها
+            from core.advanced_engine import AdvancedDataFusionEngine
+            for target, phase, result in AdvancedDataFusionEngine.iter_target_records(results):
+                if (target, phase) not in saved:
+                    pending_records.append((target, phase, result))
+                    if len(pending_records) >= self.results_batch_size:
+                        await flush()
+            await flush()
+
+            summary = {
+                'phases': list(results.get('phases', {})),
+                'errors': results.get('errors', {}),
+                'targets': len(job['targets']),
+                'network_analysis': results.get('network_analysis'),
+                'metrics': results.get('metrics'),
+                'profile': profiler.report if profiler is not None else None
+            }
+            await self.store.complete(investigation_id, summary)
+            publish('investigation_completed', {'results_available': True})
+            self.logger.info(f"✅ اكتمل التحقيق {investigation_id}")
+        except asyncio.CancelledError:
+            self.event_bus.close_topic(investigation_id)
+            raise
+        except Exception as e:
+            self.logger.error(f"❌ فشل التحقيق {investigation_id}: {e}")
+            await self.store.fail(investigation_id, str(e))
+            publish('investigation_failed', {'error': str(e)})
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+بث النتائج بصيغة NDJSON مع الضغط
+Streaming NDJSON Results with Compression
+"""
+
+import json
+import zlib
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# حجم الدفعة قبل الضغط والإرسال
+FLUSH_BYTES = 64 * 1024
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """اختيار الضغط من ترويسة Accept-Encoding (zstd ثم gzip)"""
+    offered = {}
+    for part in accept_encoding.lower().split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            offered[name] = quality
+
+    for encoding in ('zstd', 'gzip'):
+        if encoding == 'zstd' and zstandard is None:
+            continue
+        if offered.get(encoding, offered.get('*', 0.0)) > 0:
+            return encoding
+    return None
+
+def parse_fields(fields: Optional[str]) -> Optional[List[List[str]]]:
+    """تحويل ?fields=target,result.A إلى مسارات"""
+    if not fields:
+        return None
+    return [field.strip().split('.') for field in fields.split(',') if field.strip()]
+
+def project(record: Dict[str, Any], paths: List[List[str]]) -> Dict[str, Any]:
+    """اختيار الحقول المطلوبة فقط من السجل"""
+    projected: Dict[str, Any] = {}
+    for path in paths:
+        value: Any = record
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            node = projected
+            for key in path[:-1]:
+                node = node.setdefault(key, {})
+            node[path[-1]] = value
+    return projected
+
+async def ndjson_lines(records: AsyncIterator[Tuple[str, str, str]],
+                       paths: Optional[List[List[str]]] = None) -> AsyncIterator[bytes]:
+    """سطر JSON لكل نتيجة هدف
+
+    دون إسقاط تُنسخ نتيجة JSON المخزنة كما هي دون إعادة تحليلها.
+    """
+    async for target, phase, result in records:
+        if paths is None:
+            line = '{"target":%s,"phase":%s,"result":%s}\n' % (
+                json.dumps(target, ensure_ascii=False),
+                json.dumps(phase, ensure_ascii=False),
+                result
+            )
+        else:
+            record = {'target': target, 'phase': phase, 'result': json.loads(result)}
+            line = json.dumps(project(record, paths), ensure_ascii=False, default=str) + '\n'
+        yield line.encode('utf-8')
+
+async def encode_stream(lines: AsyncIterator[bytes], encoding: Optional[str]) -> AsyncIterator[bytes]:
+    """تجميع الأسطر في دفعات وضغطها تدريجياً"""
+    if encoding == 'zstd':
+        compressor = zstandard.ZstdCompressor().compressobj()
+        flush_mode = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+    elif encoding == 'gzip':
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        flush_mode = zlib.Z_SYNC_FLUSH
+    else:
+        compressor = None
+
+    buffer = bytearray()
+    first = True
+    async for line in lines:
+        buffer += line
+        # السطر الأول يُرسل فوراً لتقليل زمن أول بايت
+        if first or len(buffer) >= FLUSH_BYTES:
+            first = False
+            if compressor is None:
+                yield bytes(buffer)
+            else:
+                yield compressor.compress(bytes(buffer)) + compressor.flush(flush_mode)
+            buffer.clear()
+
+    if compressor is None:
+        if buffer:
+            yield bytes(buffer)
+    else:
+        yield compressor.compress(bytes(buffer)) + compressor.flush()